@@ -0,0 +1,125 @@
+"""Decoding of gzip- and zstd-compressed request bodies."""
+
+from __future__ import annotations
+
+import io
+import zlib
+from typing import AsyncIterator, Iterator, Tuple
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+try:  # Optional: pip install 'sentiment-backend[zstd]'
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without the extra
+    zstandard = None
+
+# Decompressed bytes produced per step, so one small chunk cannot expand unchecked.
+CHUNK_BYTES = 1 << 16
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_DECODE_ERRORS: Tuple[type, ...] = (zlib.error, EOFError)
+if zstandard is not None:
+    _DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("gzip", "zstd") if zstandard is not None else ("gzip",)
+
+
+class _GzipDecoder:
+    """Incremental gzip decoding; concatenated members decode back to back."""
+
+    def __init__(self, max_bytes: int) -> None:
+        # Output is bounded per step instead, so nothing needs buffering.
+        self._decoder = zlib.decompressobj(_GZIP_WBITS)
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        while chunk:
+            yield self._decoder.decompress(chunk, CHUNK_BYTES)
+            chunk = self._decoder.unconsumed_tail
+            if self._decoder.eof and self._decoder.unused_data:
+                chunk = self._decoder.unused_data
+                self._decoder = zlib.decompressobj(_GZIP_WBITS)
+
+    def finish(self) -> Iterator[bytes]:
+        yield self._decoder.flush()
+        if not self._decoder.eof:
+            raise EOFError("body ends inside a gzip member")
+
+
+class _ZstdDecoder:
+    """zstd has no bounded incremental decoder, so input is buffered (up to the limit)."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._compressed = bytearray()
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        self._compressed += chunk
+        if len(self._compressed) > self._max_bytes:
+            raise HTTPException(413, "Compressed request body is too large")
+        return iter(())
+
+    def finish(self) -> Iterator[bytes]:
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            io.BytesIO(self._compressed), read_across_frames=True
+        )
+        while True:
+            data = reader.read(CHUNK_BYTES)
+            if not data:
+                return
+            yield data
+
+
+_DECODERS = {"gzip": _GzipDecoder, "x-gzip": _GzipDecoder, "zstd": _ZstdDecoder}
+
+
+class DecodedRequest(Request):
+    """A request whose body is decoded according to its ``Content-Encoding``.
+
+    ``stream()`` yields decompressed data as it arrives, so streaming routes
+    keep their memory bound; ``body()`` refuses to buffer more than
+    ``max_body_bytes`` of decompressed data. Corrupt input answers ``400``
+    and an oversized body ``413``.
+    """
+
+    def __init__(self, request: Request, encoding: str, max_body_bytes: int) -> None:
+        super().__init__(request.scope, request.receive)
+        if encoding not in _DECODERS or (encoding == "zstd" and zstandard is None):
+            raise HTTPException(
+                415,
+                f"Unsupported Content-Encoding {encoding!r}; "
+                f"expected one of {', '.join(supported_encodings())}",
+            )
+        self.encoding = encoding
+        self.max_body_bytes = max_body_bytes
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        if hasattr(self, "_body"):
+            yield self._body
+            yield b""
+            return
+        decoder = _DECODERS[self.encoding](self.max_body_bytes)
+        try:
+            async for chunk in super().stream():
+                for data in decoder.feed(chunk):
+                    if data:
+                        yield data
+            for data in decoder.finish():
+                if data:
+                    yield data
+        except _DECODE_ERRORS as exc:
+            raise HTTPException(400, f"Invalid {self.encoding} request body: {exc}") from exc
+        yield b""
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            parts = []
+            size = 0
+            async for chunk in self.stream():
+                size += len(chunk)
+                if size > self.max_body_bytes:
+                    raise HTTPException(413, "Decompressed request body is too large")
+                parts.append(chunk)
+            self._body = b"".join(parts)
+        return self._body
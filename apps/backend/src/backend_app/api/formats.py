@@ -0,0 +1,129 @@
+"""Content negotiation and serialization for batch scoring responses.
+
+Batch endpoints build their predictions as parallel lists (``field -> values``)
+and serialize those directly, instead of validating one response model per
+text. Three layouts are offered, chosen from the ``Accept`` header:
+
+* ``application/json`` (default): ``{"predictions": [{...}, ...]}``, the
+  layout described by the endpoint's response model;
+* ``application/vnd.sentiment.columns+json``: ``{"label": [...], ...}``, one
+  list per response field, which is smaller and cheaper to parse into arrays;
+* ``application/msgpack``: the columnar layout as MessagePack.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+try:  # Optional: pip install 'sentiment-backend[fast-json]'
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    orjson = None
+
+try:  # Optional: pip install 'sentiment-backend[msgpack]'
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without the extra
+    msgpack = None
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.sentiment.columns+json"
+MSGPACK = "application/msgpack"
+# Offered media types in server preference order, mapped to what is served.
+_OFFERS: Tuple[Tuple[str, str], ...] = (
+    (JSON, JSON),
+    (COLUMNAR_JSON, COLUMNAR_JSON),
+    (MSGPACK, MSGPACK),
+    ("application/x-msgpack", MSGPACK),
+)
+
+
+def available_formats() -> Tuple[str, ...]:
+    if msgpack is None:
+        return (JSON, COLUMNAR_JSON)
+    return (JSON, COLUMNAR_JSON, MSGPACK)
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges = []
+    for part in accept.split(","):
+        media, *params = part.split(";")
+        media = media.strip().lower()
+        if not media:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((media, quality))
+    return ranges
+
+
+def _quality(offer: str, ranges: Sequence[Tuple[str, float]]) -> float:
+    """q-value of the most specific range matching ``offer`` (RFC 9110, 12.5.1)."""
+
+    family = offer.split("/", 1)[0] + "/*"
+    best: Optional[Tuple[int, float]] = None
+    for media, quality in ranges:
+        if media == offer:
+            specificity = 2
+        elif media == family:
+            specificity = 1
+        elif media == "*/*":
+            specificity = 0
+        else:
+            continue
+        if best is None or specificity > best[0]:
+            best = (specificity, quality)
+    return best[1] if best else 0.0
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """The media type to serve for ``accept``, or ``None`` when none is acceptable.
+
+    The highest q-value wins and ties go to the earlier offer, so wildcards and
+    a missing header select plain JSON.
+    """
+
+    if not accept or not accept.strip():
+        return JSON
+    ranges = _parse_accept(accept)
+    served = set(available_formats())
+    chosen, chosen_quality = None, 0.0
+    for offer, media_type in _OFFERS:
+        if media_type not in served:
+            continue
+        quality = _quality(offer, ranges)
+        if quality > chosen_quality:
+            chosen, chosen_quality = media_type, quality
+    return chosen
+
+
+def _dumps(content: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def render(
+    columns: Mapping[str, List], media_type: str, rows_key: str = "predictions"
+) -> Response:
+    """Serialize parallel prediction lists as ``media_type``."""
+
+    if media_type == COLUMNAR_JSON:
+        body = _dumps(columns)
+    elif media_type == MSGPACK:
+        body = msgpack.packb(columns, use_bin_type=True)
+    else:
+        names = list(columns)
+        rows: List[Dict[str, object]] = [
+            dict(zip(names, values)) for values in zip(*columns.values())
+        ]
+        body = _dumps({rows_key: rows})
+    return Response(body, media_type=media_type, headers={"Vary": "Accept"})
@@ -2,43 +2,276 @@
 
 from __future__ import annotations
 
+import hmac
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Literal, Optional, Sequence, Type
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
+from backend_app.api.formats import COLUMNAR_JSON, MSGPACK, available_formats, negotiate, render
+from backend_app.api.routing import DecodingRoute, TimedRoute
 from backend_app.core.config import get_settings
+from backend_app.core.timing import ENDPOINT, STAGE_TIMINGS
 from backend_app.schemas import (
+    InferenceMetrics,
+    ModelStatus,
+    SarcasmBatchRequest,
+    SarcasmBatchResponse,
+    SarcasmColumns,
+    SarcasmRequest,
+    SarcasmResponse,
     SentimentBatchRequest,
     SentimentBatchResponse,
+    SentimentColumns,
     SentimentMetrics,
     SentimentRequest,
     SentimentResponse,
 )
-from backend_app.services.analytics import StatsTracker
+from backend_app.services.analytics import SharedStatsTracker, StatsTracker, parse_window
+from backend_app.services.batching import MicroBatcher
+from backend_app.services.cache import PredictionCache
+from backend_app.services.dedup import DEDUP_STATS
+from backend_app.services.degradation import LoadShedder
+from backend_app.services.executor import BULK, INTERACTIVE, InferenceExecutor, deadline_after
 from backend_app.services.inference import SentimentService
+from backend_app.services.registry import ModelRegistry, ModelSpec
+from backend_app.services.sarcasm import SarcasmService, SarcasmUnavailable
+from backend_app.services.sessions import ScoringSession
+from backend_app.services.streaming import DuplexStreamingResponse, NdjsonScorer
+
+
+def _loaded_backend(name: str) -> str:
+    # Runs on the event loop for every request, so it must never load a model.
+    service = get_model_registry().peek(name)
+    return "unloaded" if service is None else service.backend_label
+
+
+class InferenceRoute(DecodingRoute):
+    """Labels request timings with the backend the sentiment service is using."""
+
+    def backend_label(self) -> str:
+        return _loaded_backend("sentiment")
+
+
+class SarcasmRoute(DecodingRoute):
+    def backend_label(self) -> str:
+        return _loaded_backend("sarcasm")
+
 
 router = APIRouter()
-inference_router = APIRouter(prefix="/api/v1", tags=["inference"])
+inference_router = APIRouter(prefix="/api/v1", tags=["inference"], route_class=InferenceRoute)
+sarcasm_router = APIRouter(prefix="/api/v1", tags=["sarcasm"], route_class=SarcasmRoute)
 
 
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    """Admin routes are disabled unless ``admin_token`` is configured."""
+
+    expected = get_settings().admin_token
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin API is disabled.")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+admin_router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    route_class=TimedRoute,
+    dependencies=[Depends(require_admin)],
+)
+
 @lru_cache(maxsize=1)
-def get_sentiment_service() -> SentimentService:
+def get_prediction_cache() -> PredictionCache | None:
+    settings = get_settings()
+    if settings.prediction_cache_size <= 0:
+        return None
+    return PredictionCache(
+        max_entries=settings.prediction_cache_size,
+        ttl_s=settings.prediction_cache_ttl_s,
+    )
+
+
+def _sentiment_weights_path() -> Path:
+    settings = get_settings()
+    if settings.inference_backend == "numpy":
+        return Path(settings.imdb_numpy_weights_path)
+    return Path(settings.imdb_weights_path)
+
+
+def _build_sentiment_service() -> SentimentService:
     settings = get_settings()
     word_index_path = Path(settings.imdb_word_index_path) if settings.imdb_word_index_path else None
-    weights_path = Path(settings.imdb_weights_path) if Path(settings.imdb_weights_path).exists() else None
+    configured_weights = _sentiment_weights_path()
+    weights_path = configured_weights if configured_weights.exists() else None
+    lexicon_path = Path(settings.fallback_lexicon_path) if settings.fallback_lexicon_path else None
     return SentimentService(
         weights_path=weights_path,
         max_length=settings.imdb_max_length,
         word_index_path=word_index_path,
+        batch_size=settings.inference_batch_size,
+        backend=settings.inference_backend,
+        skip_padding=settings.inference_skip_padding,
+        vocab_path=Path(settings.imdb_vocab_path),
+        cache=get_prediction_cache(),
+        architecture=settings.imdb_architecture,
+        length_buckets=settings.inference_length_buckets,
+        lexicon_path=lexicon_path,
+        warmup_batch_sizes=settings.warmup_batch_sizes,
+    )
+
+
+def _sarcasm_model_path() -> Path:
+    settings = get_settings()
+    if settings.sarcasm_backend == "numpy":
+        return Path(settings.sarcasm_numpy_weights_path)
+    return Path(settings.sarcasm_model_path)
+
+
+def _build_sarcasm_service() -> SarcasmService:
+    settings = get_settings()
+    return SarcasmService(
+        model_path=_sarcasm_model_path(),
+        vocab_path=Path(settings.sarcasm_vocab_path),
+        batch_size=settings.sarcasm_batch_size,
+        backend=settings.sarcasm_backend,
+        length_buckets=settings.inference_length_buckets,
+        warmup_batch_sizes=settings.warmup_batch_sizes,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_model_registry() -> ModelRegistry:
+    settings = get_settings()
+    registry = ModelRegistry(memory_budget_bytes=int(settings.model_memory_budget_mb * 2**20))
+    sentiment_paths = [_sentiment_weights_path(), Path(settings.imdb_vocab_path)]
+    if settings.imdb_word_index_path:
+        sentiment_paths.append(Path(settings.imdb_word_index_path))
+    if settings.fallback_lexicon_path:
+        sentiment_paths.append(Path(settings.fallback_lexicon_path))
+    registry.register(ModelSpec("sentiment", _build_sentiment_service, tuple(sentiment_paths)))
+    registry.register(
+        ModelSpec(
+            "sarcasm",
+            _build_sarcasm_service,
+            (_sarcasm_model_path(), Path(settings.sarcasm_vocab_path)),
+        )
+    )
+    return registry
+
+
+def get_sentiment_service() -> SentimentService:
+    return get_model_registry().get("sentiment")
+
+
+@lru_cache(maxsize=1)
+def get_inference_executor() -> InferenceExecutor:
+    settings = get_settings()
+    return InferenceExecutor(
+        workers=settings.inference_workers,
+        max_queue=settings.inference_max_queue,
+        retry_after_s=settings.overload_retry_after_s,
+        bulk_max_queue=settings.inference_bulk_max_queue,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_load_shedder() -> LoadShedder:
+    settings = get_settings()
+    return LoadShedder(
+        get_inference_executor(),
+        max_queue_wait_ms=settings.degrade_queue_wait_ms,
+        max_in_flight=settings.degrade_max_in_flight,
+        recover_ratio=settings.degrade_recover_ratio,
+        min_degraded_s=settings.degrade_min_s,
+        batcher=get_micro_batcher(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_micro_batcher() -> MicroBatcher:
+    settings = get_settings()
+    registry = get_model_registry()
+    executor = get_inference_executor()
+
+    def run_batch(texts):
+        # Resolved per batch so a hot swap takes effect without a new batcher.
+        return registry.get("sentiment").predict_batch(texts)
+
+    async def predict_batch(texts):
+        # A micro-batch mixes callers, so its stages get a label of their own.
+        ENDPOINT.set("micro_batch")
+        return await executor.run(run_batch, texts)
+
+    return MicroBatcher(
+        predict_batch,
+        max_batch_size=settings.batch_max_size,
+        max_wait_ms=settings.batch_max_wait_ms,
+        max_concurrency=settings.inference_workers,
+        max_pending=settings.batch_max_pending,
+        retry_after_s=settings.overload_retry_after_s,
+    )
+
+
+def get_sarcasm_service() -> SarcasmService:
+    return get_model_registry().get("sarcasm")
+
+
+@lru_cache(maxsize=1)
+def get_sarcasm_batcher() -> MicroBatcher:
+    settings = get_settings()
+    registry = get_model_registry()
+    executor = get_inference_executor()
+
+    def run_batch(texts):
+        return registry.get("sarcasm").predict_batch(texts)
+
+    async def predict_batch(texts):
+        ENDPOINT.set("micro_batch")
+        return await executor.run(run_batch, texts)
+
+    return MicroBatcher(
+        predict_batch,
+        max_batch_size=settings.batch_max_size,
+        max_wait_ms=settings.batch_max_wait_ms,
+        max_concurrency=settings.inference_workers,
+        max_pending=settings.batch_max_pending,
+        retry_after_s=settings.overload_retry_after_s,
     )
 
 
 @lru_cache(maxsize=1)
 def get_stats_tracker() -> StatsTracker:
+    settings = get_settings()
+    if settings.metrics_dir:
+        return SharedStatsTracker(Path(settings.metrics_dir))
     return StatsTracker()
 
 
+@dataclass(frozen=True)
+class Scheduling:
+    """Lane and deadline a caller asked for; ``None`` leaves the route's default."""
+
+    lane: Optional[str] = None
+    deadline: Optional[float] = None
+
+
+def get_scheduling(
+    x_priority: Literal["interactive", "bulk"] | None = Header(
+        None, description="Scheduling lane; large batches default to bulk."
+    ),
+    x_deadline_ms: float | None = Header(
+        None, description="Milliseconds the caller will wait; later work is dropped with 504."
+    ),
+) -> Scheduling:
+    return Scheduling(lane=x_priority, deadline=deadline_after(x_deadline_ms))
+
+
 @router.get("/health/live", tags=["health"])
 async def live() -> dict:
     """Liveness probe."""
@@ -47,38 +280,270 @@ async def live() -> dict:
     return {"status": "ok", "service": settings.app_name, "environment": settings.environment}
 
 
-@router.get("/health/ready", tags=["health"])
-async def ready() -> dict:
-    """Readiness probe placeholder."""
+@router.get("/health/ready", tags=["health"], responses={503: {"description": "Warming up."}})
+async def ready(
+    response: Response, registry: ModelRegistry = Depends(get_model_registry)
+) -> dict:
+    """Readiness probe: ``503`` until every model is loaded and warmed up."""
+
+    models = registry.ready()
+    if not all(models.values()):
+        response.status_code = 503
+        return {"status": "warming_up", "models": models}
+    return {"status": "ready", "models": models}
 
-    return {"status": "ready"}
+
+async def _score_text(
+    text: str,
+    service: SentimentService,
+    batcher: MicroBatcher,
+    shedder: LoadShedder,
+    deadline: Optional[float] = None,
+) -> SentimentResponse:
+    """One text through the micro-batcher, or the fallback while shedding load."""
+
+    if shedder.should_shed():
+        result = (await run_in_threadpool(service.predict_batch, [text], True))[0]
+    else:
+        result = await batcher.submit(text, deadline=deadline)
+    shedder.record([result.degraded])
+    return result
 
 
 @inference_router.post("/sentiment", response_model=SentimentResponse)
 async def analyze_sentiment(
     payload: SentimentRequest,
     service: SentimentService = Depends(get_sentiment_service),
+    batcher: MicroBatcher = Depends(get_micro_batcher),
+    shedder: LoadShedder = Depends(get_load_shedder),
     tracker: StatsTracker = Depends(get_stats_tracker),
+    scheduling: Scheduling = Depends(get_scheduling),
 ) -> SentimentResponse:
-    """Run a lightweight sentiment analysis heuristic."""
+    """Score one text; concurrent requests share a batched forward pass."""
 
-    result = service.predict(payload.text)
+    result = await _score_text(payload.text, service, batcher, shedder, scheduling.deadline)
     tracker.record(result)
     return result
 
 
-@inference_router.post("/sentiment/batch", response_model=SentimentBatchResponse)
+def _batch_responses(columns_model: Type[BaseModel]) -> Dict:
+    """OpenAPI entries for the layouts a batch endpoint can negotiate."""
+
+    columns_schema = {"schema": columns_model.model_json_schema()}
+    return {
+        200: {"content": {COLUMNAR_JSON: columns_schema, MSGPACK: columns_schema}},
+        406: {"description": "None of the Accept media types can be served."},
+    }
+
+
+def _negotiate(accept: Optional[str]) -> str:
+    media_type = negotiate(accept)
+    if media_type is None:
+        raise HTTPException(406, f"Acceptable formats: {', '.join(available_formats())}")
+    return media_type
+
+
+def _render(columns: Dict[str, list], media_type: str, backend: str) -> Response:
+    started = perf_counter()
+    response = render(columns, media_type)
+    STAGE_TIMINGS.observe("respond", backend, perf_counter() - started)
+    return response
+
+
+async def _run_columns(
+    executor: InferenceExecutor,
+    predict_columns: Callable[[Sequence[str]], Dict[str, list]],
+    texts: Sequence[str],
+    scheduling: Scheduling,
+) -> Dict[str, list]:
+    """Interactive batches run as one job; bulk ones as chunks other work can overtake."""
+
+    chunk_size = get_settings().bulk_chunk_size
+    lane = scheduling.lane or (BULK if len(texts) > chunk_size else INTERACTIVE)
+    if lane == INTERACTIVE:
+        return await executor.run(predict_columns, texts, lane=lane, deadline=scheduling.deadline)
+    chunks = await executor.run_chunked(
+        predict_columns, texts, chunk_size, lane=lane, deadline=scheduling.deadline
+    )
+    return {name: [value for chunk in chunks for value in chunk[name]] for name in chunks[0]}
+
+
+@inference_router.post(
+    "/sentiment/batch",
+    response_model=SentimentBatchResponse,
+    responses=_batch_responses(SentimentColumns),
+)
 async def analyze_batch(
     payload: SentimentBatchRequest,
+    accept: str | None = Header(None),
+    service: SentimentService = Depends(get_sentiment_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    tracker: StatsTracker = Depends(get_stats_tracker),
+    shedder: LoadShedder = Depends(get_load_shedder),
+    scheduling: Scheduling = Depends(get_scheduling),
+) -> Response:
+    """Score many texts; ``Accept`` selects the row, columnar or msgpack layout."""
+
+    media_type = _negotiate(accept)
+    if shedder.should_shed():
+        columns = await run_in_threadpool(service.predict_columns, payload.texts, True)
+    else:
+        columns = await _run_columns(executor, service.predict_columns, payload.texts, scheduling)
+    shedder.record(columns["degraded"])
+    tracker.record_columns(columns["label"], columns["confidence"])
+    return _render(columns, media_type, service.backend_label)
+
+
+@sarcasm_router.post("/sarcasm", response_model=SarcasmResponse)
+async def detect_sarcasm(
+    payload: SarcasmRequest,
+    service: SarcasmService = Depends(get_sarcasm_service),
+    batcher: MicroBatcher = Depends(get_sarcasm_batcher),
+    scheduling: Scheduling = Depends(get_scheduling),
+) -> SarcasmResponse:
+    """Score one headline; concurrent requests share a batched forward pass."""
+
+    if not service.available:
+        raise SarcasmUnavailable("No sarcasm model is loaded.")
+    return await batcher.submit(payload.text, deadline=scheduling.deadline)
+
+
+@sarcasm_router.post(
+    "/sarcasm/batch",
+    response_model=SarcasmBatchResponse,
+    responses=_batch_responses(SarcasmColumns),
+)
+async def detect_sarcasm_batch(
+    payload: SarcasmBatchRequest,
+    accept: str | None = Header(None),
+    service: SarcasmService = Depends(get_sarcasm_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    scheduling: Scheduling = Depends(get_scheduling),
+) -> Response:
+    """Score many headlines; ``Accept`` selects the row, columnar or msgpack layout."""
+
+    if not service.available:
+        raise SarcasmUnavailable("No sarcasm model is loaded.")
+    media_type = _negotiate(accept)
+    columns = await _run_columns(executor, service.predict_columns, payload.texts, scheduling)
+    return _render(columns, media_type, service.backend_label)
+
+
+@inference_router.post("/sentiment/stream", response_class=DuplexStreamingResponse)
+async def analyze_stream(
+    request: Request,
+    service: SentimentService = Depends(get_sentiment_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    shedder: LoadShedder = Depends(get_load_shedder),
+    tracker: StatsTracker = Depends(get_stats_tracker),
+    scheduling: Scheduling = Depends(get_scheduling),
+) -> DuplexStreamingResponse:
+    """Score an NDJSON body incrementally and stream NDJSON results back.
+
+    Each input line is ``{"text": ..., "id": ...}`` or a bare JSON string; each
+    output line echoes ``line`` and ``id`` next to the prediction, or an ``error``.
+    Batches run in the bulk lane unless ``X-Priority`` says otherwise.
+    """
+
+    settings = get_settings()
+    lane = scheduling.lane or BULK
+
+    async def score_batch(texts):
+        if shedder.should_shed():
+            results = await run_in_threadpool(service.predict_batch, texts, True)
+        else:
+            results = await executor.run(service.predict_batch, texts, lane=lane)
+        shedder.record([result.degraded for result in results])
+        return results
+
+    scorer = NdjsonScorer(
+        score_batch,
+        batch_size=settings.stream_batch_size,
+        max_in_flight=settings.stream_max_in_flight,
+        max_line_bytes=settings.stream_max_line_bytes,
+        on_result=tracker.record,
+    )
+    return DuplexStreamingResponse(
+        scorer.stream(request.stream()), media_type="application/x-ndjson"
+    )
+
+
+@inference_router.websocket("/sentiment/ws")
+async def sentiment_session(
+    websocket: WebSocket,
     service: SentimentService = Depends(get_sentiment_service),
+    batcher: MicroBatcher = Depends(get_micro_batcher),
+    shedder: LoadShedder = Depends(get_load_shedder),
     tracker: StatsTracker = Depends(get_stats_tracker),
-) -> SentimentBatchResponse:
-    predictions = [service.predict(text) for text in payload.texts]
-    for prediction in predictions:
-        tracker.record(prediction)
-    return SentimentBatchResponse(predictions=predictions)
+) -> None:
+    """Score ``{"id", "text"}`` messages over one connection; results return by ``id``."""
+
+    async def submit(text):
+        return await _score_text(text, service, batcher, shedder)
+
+    await websocket.accept()
+    session = ScoringSession(
+        websocket,
+        submit,
+        max_in_flight=get_settings().websocket_max_in_flight,
+        on_result=tracker.record,
+    )
+    await session.run()
 
 
 @inference_router.get("/metrics/sentiment", response_model=SentimentMetrics)
-async def sentiment_metrics(tracker: StatsTracker = Depends(get_stats_tracker)) -> SentimentMetrics:
-    return tracker.snapshot()
+async def sentiment_metrics(
+    window: str | None = Query(None, description="Rollup window such as 30s, 5m, 1h or 1d."),
+    tracker: StatsTracker = Depends(get_stats_tracker),
+) -> SentimentMetrics:
+    """Lifetime totals by default; totals over ``window`` when one is given."""
+
+    try:
+        return tracker.snapshot(parse_window(window) if window else None)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@inference_router.get("/metrics/inference", response_model=InferenceMetrics)
+async def inference_metrics(
+    batcher: MicroBatcher = Depends(get_micro_batcher),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    cache: PredictionCache | None = Depends(get_prediction_cache),
+    registry: ModelRegistry = Depends(get_model_registry),
+    shedder: LoadShedder = Depends(get_load_shedder),
+) -> InferenceMetrics:
+    return InferenceMetrics(
+        batching=batcher.snapshot(),
+        executor=executor.snapshot(),
+        cache=cache.snapshot() if cache is not None else None,
+        models=registry.snapshot(),
+        dedup=DEDUP_STATS.snapshot(),
+        degradation=shedder.snapshot(),
+    )
+
+
+@inference_router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Stage latency histograms in the Prometheus text format."""
+
+    return PlainTextResponse(
+        STAGE_TIMINGS.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@admin_router.post("/models/{name}/reload", response_model=ModelStatus)
+async def reload_model(
+    name: str,
+    registry: ModelRegistry = Depends(get_model_registry),
+) -> ModelStatus:
+    """Build and warm up a fresh version of ``name``, then move traffic to it."""
+
+    if name not in registry.names():
+        raise HTTPException(status_code=404, detail=f"Unknown model {name!r}.")
+    try:
+        await run_in_threadpool(registry.reload, name)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500, detail=f"Reload failed; previous version still serving: {exc}"
+        ) from exc
+    return next(model for model in registry.snapshot().models if model.name == name)
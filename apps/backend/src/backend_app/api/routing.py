@@ -0,0 +1,87 @@
+"""Route class that records request latency per endpoint."""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Coroutine, Optional
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from backend_app.api.compression import DecodedRequest
+from backend_app.core.config import get_settings
+from backend_app.core.timing import ENDPOINT, STAGE_TIMINGS
+
+# Written by the wrapped endpoint, read by the route handler awaiting it.
+_HANDLER_SECONDS: ContextVar[Optional[float]] = ContextVar("handler_seconds", default=None)
+
+
+class TimedRoute(APIRoute):
+    """Times each request and the endpoint function inside it.
+
+    ``request`` covers body parsing, validation, the endpoint and response
+    serialization; ``handler`` covers the endpoint alone, so the difference is
+    framework overhead. The endpoint label stays set on the request's context
+    so a streaming body produced after the handler returns, and work sent to
+    the inference executor, are attributed to the same endpoint.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def backend_label(self) -> str:
+        return "api"
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        endpoint = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            ENDPOINT.set(endpoint)
+            _HANDLER_SECONDS.set(None)
+            started = perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                backend = self.backend_label()
+                STAGE_TIMINGS.observe("request", backend, perf_counter() - started)
+                handler_seconds = _HANDLER_SECONDS.get()
+                if handler_seconds is not None:
+                    STAGE_TIMINGS.observe("handler", backend, handler_seconds)
+
+        return timed_handler
+
+
+class DecodingRoute(TimedRoute):
+    """A timed route that also accepts ``Content-Encoding: gzip`` or ``zstd`` bodies."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def decoding_handler(request: Request) -> Response:
+            encoding = request.headers.get("content-encoding", "identity").strip().lower()
+            if encoding != "identity":
+                max_bytes = int(get_settings().max_decompressed_body_mb * 2**20)
+                request = DecodedRequest(request, encoding, max_bytes)
+            return await handler(request)
+
+        return decoding_handler
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # functools.wraps keeps __wrapped__, from which FastAPI reads the signature.
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            _HANDLER_SECONDS.set(perf_counter() - started)
+
+    return wrapper
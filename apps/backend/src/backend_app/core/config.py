@@ -13,8 +13,47 @@ class Settings(BaseSettings):
     app_name: str = "sentiment-backend"
     environment: str = "local"
     imdb_weights_path: str = str(PROJECT_ROOT / "artifacts" / "imdb_dense" / "weights.01.keras")
+    imdb_numpy_weights_path: str = str(PROJECT_ROOT / "artifacts" / "imdb_dense" / "weights.npz")
     imdb_max_length: int = 256
     imdb_word_index_path: str | None = None
+    imdb_vocab_path: str = str(PROJECT_ROOT / "artifacts" / "imdb_dense" / "vocab.bin")
+    fallback_lexicon_path: str | None = None
+    sarcasm_model_path: str = str(PROJECT_ROOT / "artifacts" / "sarcasm_dense" / "model.keras")
+    sarcasm_vocab_path: str = str(PROJECT_ROOT / "artifacts" / "sarcasm_dense" / "vocab.bin")
+    sarcasm_numpy_weights_path: str = str(
+        PROJECT_ROOT / "artifacts" / "sarcasm_dense" / "weights.npz"
+    )
+    sarcasm_backend: str = "keras"
+    sarcasm_batch_size: int = 1024
+    inference_backend: str = "keras"
+    imdb_architecture: str = "dense"
+    inference_length_buckets: list[int] = [16, 32, 64, 128, 256]
+    inference_skip_padding: bool = True
+    inference_batch_size: int = 256
+    warmup_batch_sizes: list[int] = [1, 8, 64, 256]
+    prediction_cache_size: int = 10000
+    prediction_cache_ttl_s: float = 300.0
+    batch_max_size: int = 64
+    batch_max_wait_ms: float = 5.0
+    batch_max_pending: int = 1024
+    stream_batch_size: int = 256
+    stream_max_in_flight: int = 2
+    stream_max_line_bytes: int = 1 << 20
+    max_decompressed_body_mb: float = 64.0
+    websocket_max_in_flight: int = 64
+    metrics_dir: str | None = None
+    inference_workers: int = 2
+    inference_max_queue: int = 32
+    inference_bulk_max_queue: int = 8
+    bulk_chunk_size: int = 256
+    overload_retry_after_s: int = 1
+    degrade_queue_wait_ms: float = 0.0
+    degrade_max_in_flight: int = 0
+    degrade_recover_ratio: float = 0.5
+    degrade_min_s: float = 1.0
+    model_memory_budget_mb: float = 0.0
+    model_watch_interval_s: float = 5.0
+    admin_token: str | None = None
 
     model_config = SettingsConfigDict(
         env_prefix="SENTIMENT_BACKEND_",
@@ -0,0 +1,34 @@
+"""Fixed-bucket histograms for hot-path telemetry."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import List, Sequence
+
+from backend_app.schemas import HistogramSnapshot
+
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class Histogram:
+    """Counts observations into fixed upper bounds plus an overflow bucket."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds: List[float] = [float(bound) for bound in bounds]
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            bounds=list(self.bounds),
+            counts=list(self.counts),
+            count=self.count,
+            sum=round(self.sum, 3),
+        )
@@ -0,0 +1,76 @@
+"""Per-stage latency histograms labeled by backend and endpoint."""
+
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Tuple
+
+from backend_app.core.histogram import Histogram
+
+STAGE_BUCKETS_MS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500,
+)
+
+# Set by the timed route class and copied into executor threads, so service
+# stages are attributed to the request that triggered them.
+ENDPOINT: ContextVar[str] = ContextVar("sentiment_endpoint", default="internal")
+
+_Key = Tuple[str, str, str]
+
+
+class StageTimings:
+    """Registry of latency histograms keyed by ``(stage, backend, endpoint)``.
+
+    ``observe`` is a dict lookup plus ``Histogram.observe``; histograms are
+    created on first use. Like the other hot-path histograms, updates are not
+    locked, so concurrent observers may rarely lose a count.
+    """
+
+    def __init__(self, bounds: Iterable[float] = STAGE_BUCKETS_MS) -> None:
+        self.bounds = tuple(bounds)
+        self._histograms: Dict[_Key, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, backend: str, seconds: float) -> None:
+        key = (stage, backend, ENDPOINT.get())
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.bounds))
+        histogram.observe(seconds * 1000)
+
+    def items(self) -> List[Tuple[_Key, Histogram]]:
+        return sorted(self._histograms.items())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self, name: str = "sentiment_stage_latency_seconds") -> str:
+        """Histograms in the Prometheus text exposition format (version 0.0.4)."""
+
+        lines = [
+            f"# HELP {name} Latency of each inference stage.",
+            f"# TYPE {name} histogram",
+        ]
+        bounds = [f"{bound / 1000:g}" for bound in self.bounds] + ["+Inf"]
+        for (stage, backend, endpoint), histogram in self.items():
+            labels = (
+                f'stage="{_escape(stage)}",backend="{_escape(backend)}",'
+                f'endpoint="{_escape(endpoint)}"'
+            )
+            cumulative = 0
+            for bound, count in zip(bounds, list(histogram.counts)):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum / 1000:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGE_TIMINGS = StageTimings()
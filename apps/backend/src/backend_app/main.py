@@ -2,19 +2,85 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import signal
+from typing import AsyncIterator
 
-from backend_app.api.routes import inference_router, router as api_router
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from backend_app.api.routes import (
+    admin_router,
+    get_model_registry,
+    inference_router,
+    router as api_router,
+    sarcasm_router,
+)
 from backend_app.core.config import get_settings
+from backend_app.services.executor import DeadlineExceeded, InferenceOverloaded
+from backend_app.services.sarcasm import SarcasmUnavailable
+
+
+async def _overloaded_handler(request: Request, exc: InferenceOverloaded) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def _deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+async def _sarcasm_unavailable_handler(request: Request, exc: SarcasmUnavailable) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm models up, then reload them on SIGHUP and, when enabled, when their files change.
+
+    Warm-up runs in the background so the liveness probe answers meanwhile;
+    the readiness probe reports when it is done.
+    """
+
+    settings = get_settings()
+    registry = get_model_registry()
+    loop = asyncio.get_running_loop()
+    warming = loop.create_task(asyncio.to_thread(registry.warm_all))
+    handles_hangup = registry.install_signal_handler(loop)
+    watcher = None
+    if settings.model_watch_interval_s > 0:
+        watcher = loop.create_task(registry.watch(settings.model_watch_interval_s))
+    try:
+        yield
+    finally:
+        # A warm-up thread still running is left to finish; only the wait is cancelled.
+        warming.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warming
+        if watcher is not None:
+            watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await watcher
+        if handles_hangup:
+            loop.remove_signal_handler(signal.SIGHUP)
 
 
 def create_app() -> FastAPI:
     """Create the FastAPI application instance."""
 
     settings = get_settings()
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=_lifespan)
     app.include_router(api_router, prefix="/api")
     app.include_router(inference_router)
+    app.include_router(sarcasm_router)
+    app.include_router(admin_router)
+    app.add_exception_handler(InferenceOverloaded, _overloaded_handler)
+    app.add_exception_handler(DeadlineExceeded, _deadline_exceeded_handler)
+    app.add_exception_handler(SarcasmUnavailable, _sarcasm_unavailable_handler)
     return app
 
 
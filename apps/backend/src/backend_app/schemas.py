@@ -3,20 +3,40 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal
+from typing import Any, List, Literal, Mapping, Sequence
 
 from pydantic import BaseModel, Field
 
 
+def round_column(values: Sequence[float], digits: int) -> List[float]:
+    """Round a response column value by value.
+
+    Python's ``round`` is correctly rounded; ``np.round`` can differ in the
+    last digit, so vectorized paths would disagree with per-text results.
+    """
+
+    return [round(value, digits) for value in values]
+
+
+class _Prediction(BaseModel):
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Sequence[Any]]) -> list:
+        """One model per row of parallel ``field -> values`` lists."""
+
+        names = list(columns)
+        return [cls(**dict(zip(names, values))) for values in zip(*columns.values())]
+
+
 class SentimentRequest(BaseModel):
     text: str = Field(..., min_length=3, description="Natural language snippet to score.")
 
 
-class SentimentResponse(BaseModel):
+class SentimentResponse(_Prediction):
     label: Literal["positive", "negative", "neutral"]
     score: float = Field(..., description="Signed score where positive is favorable sentiment.")
     confidence: float = Field(..., ge=0.0, le=1.0)
     tokens_analyzed: int = Field(..., ge=0)
+    degraded: bool = Field(False, description="Scored by the keyword fallback to shed load.")
 
 
 class SentimentBatchRequest(BaseModel):
@@ -27,6 +47,44 @@ class SentimentBatchResponse(BaseModel):
     predictions: list[SentimentResponse]
 
 
+class SentimentColumns(BaseModel):
+    """Columnar batch layout: one list per ``SentimentResponse`` field, in text order."""
+
+    label: list[Literal["positive", "negative", "neutral"]]
+    score: list[float]
+    confidence: list[float]
+    tokens_analyzed: list[int]
+    degraded: list[bool]
+
+
+class SarcasmRequest(BaseModel):
+    text: str = Field(..., min_length=3, description="Headline or short text to score.")
+
+
+class SarcasmResponse(_Prediction):
+    label: Literal["sarcastic", "not_sarcastic"]
+    probability: float = Field(..., ge=0.0, le=1.0, description="Model probability of sarcasm.")
+    confidence: float = Field(..., ge=0.0, le=1.0)
+    tokens_analyzed: int = Field(..., ge=0)
+
+
+class SarcasmBatchRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, description="Collection of headlines to score.")
+
+
+class SarcasmBatchResponse(BaseModel):
+    predictions: list[SarcasmResponse]
+
+
+class SarcasmColumns(BaseModel):
+    """Columnar batch layout: one list per ``SarcasmResponse`` field, in text order."""
+
+    label: list[Literal["sarcastic", "not_sarcastic"]]
+    probability: list[float]
+    confidence: list[float]
+    tokens_analyzed: list[int]
+
+
 class PredictionSummary(BaseModel):
     label: Literal["positive", "negative", "neutral"]
     confidence: float
@@ -34,8 +92,9 @@ class PredictionSummary(BaseModel):
 
 
 class TimelinePoint(BaseModel):
-    timestamp: datetime
-    confidence: float
+    timestamp: datetime = Field(..., description="Start of the rollup bucket.")
+    confidence: float = Field(..., description="Mean confidence within the bucket.")
+    count: int = Field(1, ge=0, description="Predictions recorded in the bucket.")
 
 
 class SentimentMetrics(BaseModel):
@@ -44,3 +103,107 @@ class SentimentMetrics(BaseModel):
     average_confidence: float
     recent_predictions: list[PredictionSummary]
     timeline: list[TimelinePoint]
+    window_s: int | None = Field(None, description="Window the totals cover; None for lifetime.")
+    confidence_histogram: list[int] = Field(
+        default_factory=list, description="Confidence counts in ten equal bins over [0, 1]."
+    )
+
+
+class HistogramSnapshot(BaseModel):
+    bounds: list[float] = Field(..., description="Inclusive upper bound of each bucket.")
+    counts: list[int] = Field(..., description="Per-bucket counts; the last entry is overflow.")
+    count: int
+    sum: float
+
+
+class BatchingMetrics(BaseModel):
+    max_batch_size: int
+    max_wait_ms: float
+    pending: int
+    batch_size: HistogramSnapshot
+    queue_wait_ms: HistogramSnapshot
+    requests: int = 0
+    coalesced: int = Field(0, description="Requests that joined an identical in-flight text.")
+    coalesce_ratio: float = 0.0
+    expired: int = Field(0, description="Texts dropped because their deadline passed first.")
+
+
+class LaneMetrics(BaseModel):
+    lane: Literal["interactive", "bulk"]
+    max_queue: int
+    queue_depth: int
+    submitted: int
+    rejected: int
+    expired: int = Field(..., description="Jobs dropped because their deadline passed first.")
+    completed: int
+    queue_wait_ms: HistogramSnapshot
+
+
+class ExecutorMetrics(BaseModel):
+    workers: int
+    max_queue: int
+    in_flight: int
+    queue_depth: int
+    rejected: int
+    lanes: list[LaneMetrics] = Field(default_factory=list, description="Highest priority first.")
+
+
+class CacheMetrics(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_s: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    hit_ratio: float
+
+
+class DedupMetrics(BaseModel):
+    batches: int
+    rows: int
+    unique_rows: int
+    dedup_ratio: float = Field(..., description="Share of rows served by a repeat in their batch.")
+
+
+class ModelStatus(BaseModel):
+    name: str
+    loaded: bool
+    version: int = Field(..., description="Incremented on every load or swap.")
+    backend: str | None = None
+    memory_mb: float
+    idle_s: float | None = None
+    loads: int
+    swaps: int
+    evictions: int
+    failures: int
+    last_error: str | None = None
+    warmed: bool = Field(
+        False, description="Warmed up at least once; an evicted model is rebuilt warm."
+    )
+
+
+class RegistryMetrics(BaseModel):
+    memory_budget_mb: float = Field(..., description="0 means no budget.")
+    memory_mb: float
+    models: list[ModelStatus]
+
+
+class DegradationMetrics(BaseModel):
+    active: bool = Field(..., description="Whether new requests are currently shed.")
+    max_queue_wait_ms: float
+    max_in_flight: int
+    transitions: int = Field(..., description="Times load shedding has switched on.")
+    responses: int
+    degraded: int
+    degraded_ratio: float
+
+
+class InferenceMetrics(BaseModel):
+    batching: BatchingMetrics
+    executor: ExecutorMetrics
+    cache: CacheMetrics | None = None
+    models: RegistryMetrics | None = None
+    dedup: DedupMetrics | None = None
+    degradation: DegradationMetrics | None = None
@@ -1,49 +1,501 @@
-"""Track recent sentiment predictions for metrics endpoints."""
+"""Track sentiment predictions in fixed-memory time-bucketed rollups."""
 
 from __future__ import annotations
 
-from collections import deque
-from datetime import datetime
-from typing import Deque, Dict, Literal
+import contextlib
+import math
+import mmap
+import os
+import re
+import struct
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: retiring worker files runs unlocked.
+    fcntl = None
 
 from backend_app.schemas import PredictionSummary, SentimentMetrics, SentimentResponse, TimelinePoint
 
 Labels = Literal["positive", "negative", "neutral"]
+LABELS: Tuple[Labels, ...] = ("positive", "negative", "neutral")
+LABEL_INDEX = {label: idx for idx, label in enumerate(LABELS)}
+CONFIDENCE_BINS = 10
+DEFAULT_WINDOW_S = 300
+_WINDOW_PATTERN = re.compile(r"^(\d+)([smhd])$")
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# magic, version, second slots, minute slots, recent points, owning pid
+_HEADER = struct.Struct("<4sIIIIq")
+_MAGIC = b"SSTM"
+_VERSION = 1
+_HEADER_BYTES = 32
+
+# Lifetime totals folded in from removed worker files: label counts, confidence
+# histogram and confidence sum.
+_RETIRED = struct.Struct(f"<{len(LABELS)}q{CONFIDENCE_BINS}qd")
+RETIRED_FILENAME = "retired.bin"
+
+Totals = Tuple[np.ndarray, float, np.ndarray]
+
+Buffer = Union[bytearray, mmap.mmap]
+
+
+def parse_window(value: str) -> int:
+    """Convert ``"30s"``, ``"5m"``, ``"1h"`` or ``"1d"`` into seconds."""
+
+    match = _WINDOW_PATTERN.match(value)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"window must look like 30s, 5m, 1h or 1d, got {value!r}")
+    return int(match.group(1)) * _WINDOW_UNITS[match.group(2)]
+
+
+class _Allocator:
+    """Carves 8-byte aligned NumPy arrays out of one flat buffer."""
+
+    def __init__(self, buffer: Optional[Buffer]) -> None:
+        self.buffer = buffer
+        self.offset = _HEADER_BYTES
+
+    def take(self, dtype: type, shape: Tuple[int, ...]) -> Optional[np.ndarray]:
+        count = int(np.prod(shape))
+        array = None
+        if self.buffer is not None:
+            array = np.frombuffer(self.buffer, dtype=dtype, count=count, offset=self.offset)
+            array = array.reshape(shape)
+        self.offset += (count * np.dtype(dtype).itemsize + 7) & ~7
+        return array
+
+
+class RollupRing:
+    """Ring of ``slots`` buckets, each ``width_s`` seconds wide.
+
+    Every bucket keeps per-label counts, a confidence sum and a confidence
+    histogram. A slot is lazily reset when time wraps around to it, so memory
+    is fixed and recording touches a single row.
+    """
+
+    def __init__(self, slots: int, width_s: int, allocator: _Allocator) -> None:
+        self.slots = slots
+        self.width_s = width_s
+        self.epochs = allocator.take(np.int64, (slots,))
+        self.counts = allocator.take(np.int64, (slots, len(LABELS)))
+        self.confidence_sums = allocator.take(np.float64, (slots,))
+        self.histograms = allocator.take(np.int64, (slots, CONFIDENCE_BINS))
+        if allocator.buffer is None:
+            return
+        # Flat memoryviews over the same buffers: scalar updates through them
+        # cost a fraction of NumPy item assignment on the per-prediction path.
+        self._epochs = memoryview(self.epochs)
+        self._counts = memoryview(self.counts).cast("B").cast("q")
+        self._sums = memoryview(self.confidence_sums)
+        self._histograms = memoryview(self.histograms).cast("B").cast("q")
+
+    def _slot(self, now: float) -> int:
+        epoch = int(now // self.width_s)
+        slot = epoch % self.slots
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self.counts[slot] = 0
+            self.confidence_sums[slot] = 0.0
+            self.histograms[slot] = 0
+        return slot
+
+    def record(self, now: float, label: int, confidence: float, confidence_bin: int) -> None:
+        slot = self._slot(now)
+        self._counts[slot * len(LABELS) + label] += 1
+        self._sums[slot] += confidence
+        self._histograms[slot * CONFIDENCE_BINS + confidence_bin] += 1
+
+    def add(
+        self, now: float, counts: np.ndarray, confidence_sum: float, histogram: np.ndarray
+    ) -> None:
+        """Fold pre-aggregated counts for many predictions made at ``now``."""
+
+        slot = self._slot(now)
+        self.counts[slot] += counts
+        self.confidence_sums[slot] += confidence_sum
+        self.histograms[slot] += histogram
+
+    def window(self, now: float, window_s: int) -> np.ndarray:
+        """Slots holding data from the last ``window_s`` seconds, oldest first."""
+
+        current = int(now // self.width_s)
+        oldest = current - math.ceil(window_s / self.width_s)
+        slots = np.flatnonzero((self.epochs > oldest) & (self.epochs <= current))
+        return slots[np.argsort(self.epochs[slots])]
+
+    @property
+    def span_s(self) -> int:
+        return self.slots * self.width_s
 
 
 class StatsTracker:
-    """Maintains rolling statistics for sentiment predictions."""
+    """Maintains lifetime totals plus per-second and per-minute rollups.
 
-    def __init__(self, max_points: int = 50) -> None:
-        self.total_requests = 0
-        self.label_counts: Dict[Labels, int] = {"positive": 0, "negative": 0, "neutral": 0}
-        self.confidence_sum = 0.0
-        self.records: Deque[PredictionSummary] = deque(maxlen=max_points)
+    ``record`` only updates preallocated arrays; pydantic models are built in
+    ``snapshot``. The per-second ring covers the last hour and serves windows of
+    up to ``fine_window_s``; longer windows, up to a day, read the per-minute
+    ring. The timeline has one point per non-empty bucket in the window.
 
-    def record(self, response: SentimentResponse) -> None:
-        self.total_requests += 1
-        self.label_counts[response.label] += 1
-        self.confidence_sum += response.confidence
-        self.records.append(
-            PredictionSummary(
-                label=response.label,
-                confidence=response.confidence,
-                timestamp=datetime.utcnow(),
-            )
+    All state lives in one flat buffer of ``nbytes()`` bytes, so it can be
+    placed in a memory-mapped file and read by other processes.
+    """
+
+    def __init__(
+        self,
+        max_points: int = 50,
+        second_slots: int = 3600,
+        minute_slots: int = 1440,
+        fine_window_s: int = DEFAULT_WINDOW_S,
+        clock: Callable[[], float] = time.time,
+        buffer: Optional[Buffer] = None,
+    ) -> None:
+        self.clock = clock
+        self.fine_window_s = fine_window_s
+        self.max_points = max_points
+        fresh = buffer is None
+        if fresh:
+            buffer = bytearray(self.nbytes(max_points, second_slots, minute_slots))
+        self.buffer = buffer
+        allocator = _Allocator(buffer)
+        self.seconds = RollupRing(second_slots, 1, allocator)
+        self.minutes = RollupRing(minute_slots, 60, allocator)
+        self.total_counts = allocator.take(np.int64, (len(LABELS),))
+        self.total_histogram = allocator.take(np.int64, (CONFIDENCE_BINS,))
+        self._confidence_sum = allocator.take(np.float64, (1,))
+        # Recent predictions as a ring of (label, confidence, timestamp) rows.
+        self._recent_position = allocator.take(np.int64, (1,))
+        self._recent_labels = allocator.take(np.int64, (max_points,))
+        self._recent_values = allocator.take(np.float64, (max_points, 2))
+        if fresh:
+            self.initialize()
+        self._totals = memoryview(self.total_counts)
+        self._total_bins = memoryview(self.total_histogram)
+        self._sum_view = memoryview(self._confidence_sum)
+        self._position_view = memoryview(self._recent_position)
+        self._labels_view = memoryview(self._recent_labels)
+        self._values_view = memoryview(self._recent_values).cast("B").cast("d")
+
+    @staticmethod
+    def nbytes(max_points: int = 50, second_slots: int = 3600, minute_slots: int = 1440) -> int:
+        """Size of the flat buffer holding a tracker with these dimensions."""
+
+        allocator = _Allocator(None)
+        RollupRing(second_slots, 1, allocator)
+        RollupRing(minute_slots, 60, allocator)
+        allocator.take(np.int64, (len(LABELS),))
+        allocator.take(np.int64, (CONFIDENCE_BINS,))
+        allocator.take(np.float64, (1,))
+        allocator.take(np.int64, (1,))
+        allocator.take(np.int64, (max_points,))
+        allocator.take(np.float64, (max_points, 2))
+        return allocator.offset
+
+    def initialize(self, pid: int = 0) -> None:
+        """Write the header and mark every bucket empty."""
+
+        _HEADER.pack_into(
+            self.buffer,
+            0,
+            _MAGIC,
+            _VERSION,
+            self.seconds.slots,
+            self.minutes.slots,
+            self.max_points,
+            pid,
         )
+        self.seconds.epochs[:] = -1
+        self.minutes.epochs[:] = -1
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer, **kwargs) -> "StatsTracker":
+        """Attach to a buffer written by another tracker, using its dimensions."""
 
-    def snapshot(self) -> SentimentMetrics:
-        average_confidence = (
-            self.confidence_sum / self.total_requests if self.total_requests else 0.0
+        magic, version, second_slots, minute_slots, max_points, _ = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("buffer does not hold StatsTracker rollups")
+        return cls(
+            max_points=max_points,
+            second_slots=second_slots,
+            minute_slots=minute_slots,
+            buffer=buffer,
+            **kwargs,
         )
+
+    @property
+    def owner_pid(self) -> int:
+        return _HEADER.unpack_from(self.buffer)[5]
+
+    @property
+    def total_requests(self) -> int:
+        return int(self.total_counts.sum())
+
+    @property
+    def confidence_sum(self) -> float:
+        return float(self._confidence_sum[0])
+
+    @property
+    def max_window_s(self) -> int:
+        return self.minutes.span_s
+
+    def record(self, response: SentimentResponse) -> None:
+        now = self.clock()
+        label = LABEL_INDEX[response.label]
+        confidence = response.confidence
+        confidence_bin = min(int(confidence * CONFIDENCE_BINS), CONFIDENCE_BINS - 1)
+        self.seconds.record(now, label, confidence, confidence_bin)
+        self.minutes.record(now, label, confidence, confidence_bin)
+        self._totals[label] += 1
+        self._total_bins[confidence_bin] += 1
+        self._sum_view[0] += confidence
+        position = self._position_view[0]
+        slot = position % self.max_points
+        self._labels_view[slot] = label
+        self._values_view[2 * slot] = confidence
+        self._values_view[2 * slot + 1] = now
+        self._position_view[0] = position + 1
+
+    def record_columns(self, labels: Sequence[str], confidences: Sequence[float]) -> None:
+        """Record a batch given as parallel label and confidence lists."""
+
+        if not labels:
+            return
+        now = self.clock()
+        count = len(labels)
+        labels = np.fromiter(map(LABEL_INDEX.__getitem__, labels), dtype=np.int64, count=count)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        bins = np.minimum((confidences * CONFIDENCE_BINS).astype(np.int64), CONFIDENCE_BINS - 1)
+        counts = np.bincount(labels, minlength=len(LABELS))
+        histogram = np.bincount(bins, minlength=CONFIDENCE_BINS)
+        confidence_sum = float(confidences.sum())
+        self.seconds.add(now, counts, confidence_sum, histogram)
+        self.minutes.add(now, counts, confidence_sum, histogram)
+        self.total_counts += counts
+        self.total_histogram += histogram
+        self._confidence_sum += confidence_sum
+        position = int(self._recent_position[0])
+        kept = min(count, self.max_points)
+        slots = (position + count - kept + np.arange(kept)) % self.max_points
+        self._recent_labels[slots] = labels[-kept:]
+        self._recent_values[slots, 0] = confidences[-kept:]
+        self._recent_values[slots, 1] = now
+        self._recent_position[0] = position + count
+
+    def _recent(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Labels and ``(confidence, timestamp)`` rows of recent predictions, oldest first."""
+
+        position = int(self._recent_position[0])
+        count = min(position, self.max_points)
+        order = (position - count + np.arange(count)) % self.max_points
+        return self._recent_labels[order], self._recent_values[order]
+
+    def snapshot(self, window_s: Optional[int] = None) -> SentimentMetrics:
+        """Metrics over ``window_s`` seconds, or lifetime totals when ``None``.
+
+        The timeline always covers ``window_s`` (``fine_window_s`` by default).
+        """
+
+        return self._summarize([self], window_s)
+
+    def _summarize(
+        self,
+        trackers: Sequence["StatsTracker"],
+        window_s: Optional[int],
+        retired: Optional[Totals] = None,
+    ) -> SentimentMetrics:
+        if window_s is not None and not 0 < window_s <= self.max_window_s:
+            raise ValueError(f"window must be between 1s and {self.max_window_s}s")
+        now = self.clock()
+        timeline_window = window_s or self.fine_window_s
+        fine = timeline_window <= self.fine_window_s
+        width_s = 1 if fine else 60
+
+        epochs, counts, sums, histograms = [], [], [], []
+        for tracker in trackers:
+            ring = tracker.seconds if fine else tracker.minutes
+            slots = ring.window(now, timeline_window)
+            epochs.append(ring.epochs[slots])
+            counts.append(ring.counts[slots])
+            sums.append(ring.confidence_sums[slots])
+            histograms.append(ring.histograms[slots])
+        # Several trackers can hold a bucket for the same epoch; merge them.
+        bucket_epochs, owner = np.unique(np.concatenate(epochs), return_inverse=True)
+        bucket_counts = np.zeros(len(bucket_epochs), dtype=np.int64)
+        bucket_sums = np.zeros(len(bucket_epochs), dtype=np.float64)
+        np.add.at(bucket_counts, owner, np.concatenate(counts).sum(axis=1))
+        np.add.at(bucket_sums, owner, np.concatenate(sums))
         timeline = [
-            TimelinePoint(timestamp=record.timestamp, confidence=record.confidence)
-            for record in self.records
+            TimelinePoint(
+                timestamp=_timestamp(epoch * width_s),
+                confidence=round(float(total / count), 3),
+                count=int(count),
+            )
+            for epoch, total, count in zip(bucket_epochs, bucket_sums, bucket_counts)
+            if count
         ]
+
+        if window_s is None:
+            label_counts = sum(tracker.total_counts for tracker in trackers)
+            confidence_sum = sum(tracker.confidence_sum for tracker in trackers)
+            histogram = sum(tracker.total_histogram for tracker in trackers)
+            if retired is not None:
+                label_counts = label_counts + retired[0]
+                confidence_sum += retired[1]
+                histogram = histogram + retired[2]
+        else:
+            label_counts = np.concatenate(counts).sum(axis=0)
+            confidence_sum = float(bucket_sums.sum())
+            histogram = np.concatenate(histograms).sum(axis=0)
+        total = int(label_counts.sum())
         return SentimentMetrics(
-            total_requests=self.total_requests,
-            label_counts=self.label_counts.copy(),
-            average_confidence=round(average_confidence, 3),
-            recent_predictions=list(self.records),
+            total_requests=total,
+            label_counts=dict(zip(LABELS, label_counts.tolist())),
+            average_confidence=round(confidence_sum / total, 3) if total else 0.0,
+            recent_predictions=self._merge_recent(trackers),
             timeline=timeline,
+            window_s=window_s,
+            confidence_histogram=histogram.tolist(),
+        )
+
+    def _merge_recent(self, trackers: Sequence["StatsTracker"]) -> List[PredictionSummary]:
+        recent = [tracker._recent() for tracker in trackers]
+        labels = np.concatenate([entry[0] for entry in recent])
+        values = np.concatenate([entry[1] for entry in recent])
+        order = np.argsort(values[:, 1], kind="stable")[-self.max_points :]
+        return [
+            PredictionSummary(
+                label=LABELS[int(labels[row])],
+                confidence=float(values[row, 0]),
+                timestamp=_timestamp(values[row, 1]),
+            )
+            for row in order
+        ]
+
+
+class SharedStatsTracker(StatsTracker):
+    """Aggregates rollups across worker processes through memory-mapped files.
+
+    Each process records into its own ``worker-<pid>-<id>.bin`` file in
+    ``directory``, so writers never contend and take no locks; ``snapshot``
+    maps every worker file and merges them. A reader may catch a bucket in the
+    middle of an update, which skews that bucket by the predictions in flight.
+    Once the newest bucket in a dead worker's file falls out of the per-minute
+    ring, the next new worker folds its lifetime totals into ``retired.bin``
+    and removes the file, so lifetime totals never go down.
+    """
+
+    def __init__(self, directory: Path, **kwargs) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        template = StatsTracker(**kwargs)
+        template.initialize(pid=os.getpid())
+        self.path = self.directory / f"worker-{os.getpid()}-{uuid.uuid4().hex[:8]}.bin"
+        # Publish a fully initialized file so readers never map a partial one.
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_bytes(bytes(template.buffer))
+        os.replace(tmp_path, self.path)
+        with self.path.open("r+b") as handle:
+            shared = mmap.mmap(handle.fileno(), 0)
+        super().__init__(buffer=shared, **kwargs)
+        self._peers: Dict[str, StatsTracker] = {}
+        self._remove_stale()
+
+    def _open(self, path: Path) -> StatsTracker:
+        with path.open("rb") as handle:
+            view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return StatsTracker.from_buffer(view, clock=self.clock, fine_window_s=self.fine_window_s)
+
+    def _remove_stale(self) -> None:
+        cutoff = self.clock() - self.max_window_s
+        for path in self.directory.glob("worker-*.bin"):
+            if path == self.path:
+                continue
+            try:
+                peer = self._open(path)
+            except (OSError, ValueError):
+                continue
+            newest = int(peer.minutes.epochs.max()) * peer.minutes.width_s
+            if newest < cutoff and not _pid_alive(peer.owner_pid):
+                self._retire(path, peer)
+
+    def _retire(self, path: Path, peer: StatsTracker) -> None:
+        """Fold a dead worker's lifetime totals into ``retired.bin`` and delete its file."""
+
+        claimed = path.with_name(f"{path.stem}.retiring")
+        try:
+            # Renaming is atomic, so only one new worker folds each file in.
+            os.rename(path, claimed)
+        except OSError:
+            return
+        with self._retired_lock():
+            counts, confidence_sum, histogram = self._retired_totals()
+            data = _RETIRED.pack(
+                *(counts + peer.total_counts).tolist(),
+                *(histogram + peer.total_histogram).tolist(),
+                confidence_sum + peer.confidence_sum,
+            )
+            tmp_path = self.directory / f"{RETIRED_FILENAME}.{os.getpid()}.tmp"
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.directory / RETIRED_FILENAME)
+        claimed.unlink(missing_ok=True)
+
+    @contextlib.contextmanager
+    def _retired_lock(self) -> Iterator[None]:
+        with (self.directory / "retired.lock").open("a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            yield
+
+    def _retired_totals(self) -> Totals:
+        try:
+            values = _RETIRED.unpack((self.directory / RETIRED_FILENAME).read_bytes())
+        except (OSError, struct.error):
+            return np.zeros(len(LABELS), np.int64), 0.0, np.zeros(CONFIDENCE_BINS, np.int64)
+        bins_end = len(LABELS) + CONFIDENCE_BINS
+        return (
+            np.array(values[: len(LABELS)], dtype=np.int64),
+            float(values[-1]),
+            np.array(values[len(LABELS) : bins_end], dtype=np.int64),
         )
+
+    def _trackers(self) -> List[StatsTracker]:
+        current = {
+            path.name: path for path in self.directory.glob("worker-*.bin") if path != self.path
+        }
+        for name in list(self._peers):
+            if name not in current:
+                del self._peers[name]
+        for name, path in current.items():
+            if name not in self._peers:
+                try:
+                    self._peers[name] = self._open(path)
+                except (OSError, ValueError):
+                    continue
+        return [self, *self._peers.values()]
+
+    def snapshot(self, window_s: Optional[int] = None) -> SentimentMetrics:
+        """Metrics merged across every worker writing to ``directory``."""
+
+        retired = self._retired_totals() if window_s is None else None
+        return self._summarize(self._trackers(), window_s, retired)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _timestamp(seconds: float) -> datetime:
+    return datetime.fromtimestamp(float(seconds), tz=timezone.utc)
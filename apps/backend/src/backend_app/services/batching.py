@@ -0,0 +1,211 @@
+"""Dynamic micro-batching for concurrent single-text requests."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from backend_app.core.histogram import BATCH_SIZE_BUCKETS, LATENCY_BUCKETS_MS, Histogram
+from backend_app.schemas import BatchingMetrics, SentimentResponse
+from backend_app.services.executor import DeadlineExceeded, InferenceOverloaded
+
+logger = logging.getLogger(__name__)
+
+PredictBatch = Callable[[Sequence[str]], Awaitable[List[SentimentResponse]]]
+_Pending = Tuple[str, "_Flight", float]
+
+
+class _Flight:
+    """One queued or running text and the number of requests waiting on it.
+
+    ``deadline`` is the latest of the waiters' deadlines, ``None`` if any has none.
+    """
+
+    __slots__ = ("future", "waiters", "deadline")
+
+    def __init__(
+        self, future: "asyncio.Future[SentimentResponse]", deadline: Optional[float]
+    ) -> None:
+        self.future = future
+        self.waiters = 0
+        self.deadline = deadline
+
+    def extend(self, deadline: Optional[float]) -> None:
+        if self.deadline is not None:
+            self.deadline = None if deadline is None else max(self.deadline, deadline)
+
+
+class MicroBatcher:
+    """Collects in-flight requests and scores them with one batched forward pass.
+
+    A batch is dispatched once ``max_batch_size`` requests are queued or the
+    oldest request has waited ``max_wait_ms``, whichever comes first. Up to
+    ``max_concurrency`` batches run at once; ``max_pending`` bounds the queue.
+    A request for a text that is already queued or being scored waits for
+    that result instead of being queued again; the text is dropped from its
+    batch only when every request waiting on it is cancelled, or when the
+    deadlines (``time.monotonic()`` instants) of all of them have passed.
+    """
+
+    def __init__(
+        self,
+        predict_batch: PredictBatch,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_concurrency: int = 1,
+        max_pending: int = 1024,
+        retry_after_s: int = 1,
+    ) -> None:
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending = max(1, max_pending)
+        self.retry_after_s = retry_after_s
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self._queue: Optional[asyncio.Queue[_Pending]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._flights: Dict[str, _Flight] = {}
+        # Enqueue times of texts not yet dispatched, oldest first: the queue plus
+        # a collected batch waiting for a free slot.
+        self._undispatched: Deque[float] = deque()
+        self.requests = 0
+        self.coalesced = 0
+        self.expired = 0
+
+    async def submit(self, text: str, deadline: Optional[float] = None) -> SentimentResponse:
+        queue = self._ensure_worker()
+        if deadline is not None and time.monotonic() >= deadline:
+            self.expired += 1
+            raise DeadlineExceeded()
+        flight = self._flights.get(text)
+        if flight is None:
+            if queue.qsize() >= self.max_pending:
+                raise InferenceOverloaded(self.retry_after_s)
+            flight = self._flights[text] = _Flight(self._loop.create_future(), deadline)
+            flight.future.add_done_callback(functools.partial(self._land, text, flight))
+            enqueued = time.perf_counter()
+            queue.put_nowait((text, flight, enqueued))
+            self._undispatched.append(enqueued)
+        else:
+            flight.extend(deadline)
+            self.coalesced += 1
+        self.requests += 1
+        flight.waiters += 1
+        try:
+            # Shielded so one caller going away does not cancel the others' result.
+            return await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if not flight.waiters:
+                flight.future.cancel()
+            raise
+
+    @property
+    def pending(self) -> int:
+        """Queued texts not yet handed to ``predict_batch``."""
+
+        return len(self._undispatched)
+
+    def oldest_wait_s(self) -> float:
+        """How long the oldest text not yet handed to ``predict_batch`` has waited."""
+
+        undispatched = self._undispatched
+        return time.perf_counter() - undispatched[0] if undispatched else 0.0
+
+    def _land(self, text: str, flight: _Flight, _: asyncio.Future) -> None:
+        if self._flights.get(text) is flight:
+            del self._flights[text]
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # The worker is bound to the loop that first needs it; a new loop (tests,
+        # reloads) gets a fresh queue and worker instead of a dead one.
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._flights = {}
+            self._undispatched = deque()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _collect(self, queue: asyncio.Queue) -> List[_Pending]:
+        batch = [await queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        slots = self._slots
+        while True:
+            batch = await self._collect(queue)
+            await slots.acquire()
+            for _ in batch:
+                self._undispatched.popleft()
+            task = self._loop.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _dispatch(self, batch: List[_Pending]) -> None:
+        started = time.perf_counter()
+        now = time.monotonic()
+        pending = []
+        for item in batch:
+            flight = item[1]
+            if flight.future.done():
+                continue
+            if flight.deadline is not None and now >= flight.deadline:
+                self.expired += flight.waiters
+                flight.future.set_exception(DeadlineExceeded())
+                continue
+            pending.append(item)
+        self.batch_sizes.observe(len(pending))
+        for _, _, enqueued in pending:
+            self.queue_wait_ms.observe((started - enqueued) * 1000)
+        if not pending:
+            return
+        try:
+            results = await self.predict_batch([text for text, _, _ in pending])
+        except Exception as exc:
+            if not isinstance(exc, InferenceOverloaded):
+                logger.exception("Batched inference failed for %d requests", len(pending))
+            for _, flight, _ in pending:
+                if not flight.future.done():
+                    flight.future.set_exception(exc)
+            return
+        for (_, flight, _), result in zip(pending, results):
+            if not flight.future.done():
+                flight.future.set_result(result)
+
+    def snapshot(self) -> BatchingMetrics:
+        return BatchingMetrics(
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=self.max_wait * 1000,
+            pending=self.pending,
+            batch_size=self.batch_sizes.snapshot(),
+            queue_wait_ms=self.queue_wait_ms.snapshot(),
+            requests=self.requests,
+            coalesced=self.coalesced,
+            coalesce_ratio=round(self.coalesced / self.requests, 4) if self.requests else 0.0,
+            expired=self.expired,
+        )
@@ -0,0 +1,282 @@
+"""Offline corpus scoring on a process pool with ordered, resumable output shards."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+STATS_NAME = "stats.json"
+SUCCESS_NAME = "_SUCCESS"
+# A JSONL chunk holds raw lines, parsed in the worker; a CSV chunk holds parsed rows.
+_Raw = Union[str, Dict[str, Any]]
+
+_SERVICE: Any = None
+
+
+class CheckpointMismatch(ValueError):
+    """Raised when an output directory holds progress from different inputs or settings."""
+
+
+@dataclass
+class WorkerStats:
+    pid: int
+    chunks: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class BulkReport:
+    rows: int = 0
+    errors: int = 0
+    chunks: int = 0
+    skipped_chunks: int = 0
+    seconds: float = 0.0
+    workers: Dict[int, WorkerStats] = field(default_factory=dict)
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        report = asdict(self)
+        report["rows_per_s"] = round(self.rows_per_s, 1)
+        report["workers"] = [
+            {**asdict(stats), "rows_per_s": round(stats.rows_per_s, 1)}
+            for stats in sorted(self.workers.values(), key=lambda stats: stats.pid)
+        ]
+        return report
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return path.open("r", encoding="utf-8", newline="")
+
+
+def _input_format(path: Path) -> str:
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    return "csv" if suffixes and suffixes[-1] == ".csv" else "jsonl"
+
+
+def iter_raw_records(paths: Sequence[Path]) -> Iterator[_Raw]:
+    """Records of every input in order: JSONL lines (blank ones skipped) or CSV rows."""
+
+    for path in paths:
+        with _open_text(path) as handle:
+            if _input_format(path) == "csv":
+                yield from csv.DictReader(handle)
+                continue
+            for line in handle:
+                if line.strip():
+                    yield line
+
+
+def iter_chunks(records: Iterator[_Raw], chunk_size: int) -> Iterator[List[_Raw]]:
+    chunk: List[_Raw] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_raw(
+    raw: _Raw, text_field: str, id_field: str
+) -> Tuple[Any, Optional[str], Optional[str]]:
+    """``(id, text, error)`` for one record; JSONL lines may also be bare strings."""
+
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError as exc:
+            return None, None, f"invalid JSON: {exc}"
+        if isinstance(raw, str):
+            return None, raw, None
+        if not isinstance(raw, dict):
+            return None, None, "expected a JSON object or string"
+    text = raw.get(text_field)
+    if not isinstance(text, str):
+        return raw.get(id_field), None, f"missing text field {text_field!r}"
+    return raw.get(id_field), text, None
+
+
+def shard_path(output_dir: Path, index: int) -> Path:
+    return output_dir / f"part-{index:06d}.jsonl"
+
+
+def completed_shards(output_dir: Path) -> Set[int]:
+    return {
+        int(path.stem.split("-", 1)[1])
+        for path in output_dir.glob("part-*.jsonl")
+        if path.stem.split("-", 1)[1].isdigit()
+    }
+
+
+def _init_worker(factory: Callable[[], Any]) -> None:
+    global _SERVICE
+    _SERVICE = factory()
+
+
+def score_chunk(
+    index: int,
+    raw_records: List[_Raw],
+    first_row: int,
+    output_dir: str,
+    text_field: str = "text",
+    id_field: str = "id",
+) -> Tuple[int, int, int, float, int]:
+    """Score one chunk and publish its shard; returns ``(index, rows, errors, s, pid)``.
+
+    The shard is written to a temporary name and renamed into place, so a
+    shard that exists is complete and marks the chunk as done.
+    """
+
+    started = time.perf_counter()
+    parsed = [parse_raw(raw, text_field, id_field) for raw in raw_records]
+    predictions = iter(_SERVICE.predict_batch([text for _, text, error in parsed if not error]))
+    lines = []
+    errors = 0
+    for offset, (record_id, _, error) in enumerate(parsed):
+        row = {"row": first_row + offset, "id": record_id}
+        if error:
+            errors += 1
+            row["error"] = error
+        else:
+            row.update(next(predictions).model_dump())
+        lines.append(json.dumps(row, separators=(",", ":")))
+    target = shard_path(Path(output_dir), index)
+    temporary = target.with_name(f".{target.name}.tmp")
+    temporary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(temporary, target)
+    return index, len(raw_records), errors, time.perf_counter() - started, os.getpid()
+
+
+def _manifest(paths: Sequence[Path], chunk_size: int, text_field: str, id_field: str) -> dict:
+    inputs = []
+    for path in paths:
+        stat = path.stat()
+        inputs.append(
+            {"path": str(path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        )
+    return {
+        "inputs": inputs,
+        "chunk_size": chunk_size,
+        "text_field": text_field,
+        "id_field": id_field,
+    }
+
+
+def _prepare_output(output_dir: Path, manifest: dict, restart: bool) -> Set[int]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    if manifest_path.exists() and not restart:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if previous != manifest:
+            raise CheckpointMismatch(
+                f"{output_dir} holds progress for different inputs or settings; "
+                "pass restart=True (--restart) to discard it"
+            )
+        return completed_shards(output_dir)
+    for path in list(output_dir.glob("part-*.jsonl")) + list(output_dir.glob(".part-*.tmp")):
+        path.unlink()
+    for name in (STATS_NAME, SUCCESS_NAME):
+        (output_dir / name).unlink(missing_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return set()
+
+
+def score_corpus(
+    inputs: Sequence[Path],
+    output_dir: Path,
+    factory: Callable[[], Any],
+    chunk_size: int = 10000,
+    workers: int = 1,
+    text_field: str = "text",
+    id_field: str = "id",
+    restart: bool = False,
+    max_in_flight: Optional[int] = None,
+    progress_interval_s: float = 30.0,
+) -> BulkReport:
+    """Score every record of ``inputs`` into ``output_dir/part-NNNNNN.jsonl`` shards.
+
+    Records are cut into ``chunk_size`` chunks in input order and chunk ``i``
+    is written to shard ``i``, so concatenating the shards by name restores
+    the input order. Each of the ``workers`` processes builds its service
+    once with ``factory``, which must be picklable. Rerunning with the same
+    inputs and settings skips the shards already written; the parent only
+    re-splits their lines. Per-worker throughput is rows over the seconds
+    the worker spent parsing, scoring and writing.
+    """
+
+    paths = [Path(path) for path in inputs]
+    chunk_size = max(1, chunk_size)
+    workers = max(1, workers)
+    max_in_flight = max_in_flight or 2 * workers
+    output_dir = Path(output_dir)
+    done = _prepare_output(output_dir, _manifest(paths, chunk_size, text_field, id_field), restart)
+    report = BulkReport(skipped_chunks=len(done))
+    started = time.perf_counter()
+    last_progress = started
+
+    def collect(future: Future) -> None:
+        _index, rows, errors, seconds, pid = future.result()
+        stats = report.workers.setdefault(pid, WorkerStats(pid))
+        stats.chunks += 1
+        stats.rows += rows
+        stats.seconds += seconds
+        report.chunks += 1
+        report.rows += rows
+        report.errors += errors
+
+    # Spawned workers do not inherit a half-initialized TensorFlow runtime from the parent.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, context, _init_worker, (factory,)) as pool:
+        pending: Set[Future] = set()
+        chunks = iter_chunks(iter_raw_records(paths), chunk_size)
+        for index, chunk in enumerate(chunks):
+            if index in done:
+                continue
+            while len(pending) >= max_in_flight:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    collect(future)
+            pending.add(
+                pool.submit(
+                    score_chunk, index, chunk, index * chunk_size, str(output_dir),
+                    text_field, id_field,
+                )
+            )
+            now = time.perf_counter()
+            if now - last_progress >= progress_interval_s:
+                last_progress = now
+                logger.info(
+                    "Scored %d rows in %d chunks (%.0f rows/s).",
+                    report.rows, report.chunks, report.rows / (now - started),
+                )
+        for future in pending:
+            collect(future)
+
+    report.seconds = time.perf_counter() - started
+    (output_dir / STATS_NAME).write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+    (output_dir / SUCCESS_NAME).touch()
+    return report
@@ -0,0 +1,115 @@
+"""Bounded LRU/TTL cache for model scores keyed on encoded model inputs."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend_app.schemas import CacheMetrics
+
+
+class PredictionCache:
+    """Maps an encoded input row to the probability the model produced for it.
+
+    Keys hash the exact ``int32`` row fed to the model, so texts that normalize
+    to the same token ids share an entry. Every key is also salted with the
+    model fingerprint passed to :meth:`bind`; binding a new model or word index
+    drops the old entries and can never return a score from a previous one.
+    A model still finishing requests after a newer one was bound passes the
+    salt it was bound with, so its lookups miss and its writes are dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_s: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_s = ttl_s
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._salt = b""
+
+    def bind(self, fingerprint: str) -> bytes:
+        """Scope the cache to one model; a different fingerprint clears it."""
+
+        salt = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=32).digest()
+        with self._lock:
+            if salt != self._salt:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._salt = salt
+        return salt
+
+    def keys_for(self, encoded: np.ndarray, salt: Optional[bytes] = None) -> List[bytes]:
+        salt = self._salt if salt is None else salt
+        return [
+            hashlib.blake2b(row.tobytes(), digest_size=16, key=salt).digest() for row in encoded
+        ]
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[float]]:
+        now = self.clock()
+        found: List[Optional[float]] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    found.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                found.append(entry[1])
+        return found
+
+    def put_many(
+        self, keys: Sequence[bytes], values: Sequence[float], salt: Optional[bytes] = None
+    ) -> None:
+        expires_at = self.clock() + self.ttl_s
+        with self._lock:
+            if salt is not None and salt != self._salt:
+                return
+            for key, value in zip(keys, values):
+                self._entries[key] = (expires_at, float(value))
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> CacheMetrics:
+        lookups = self.hits + self.misses
+        return CacheMetrics(
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl_s=self.ttl_s,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            invalidations=self.invalidations,
+            hit_ratio=round(self.hits / lookups, 4) if lookups else 0.0,
+        )
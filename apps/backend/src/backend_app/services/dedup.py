@@ -0,0 +1,60 @@
+"""Scoring each distinct encoded row of a batch once."""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from backend_app.schemas import DedupMetrics
+
+
+def unique_rows(encoded: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``(first, inverse)`` such that ``encoded[first][inverse]`` equals ``encoded``.
+
+    ``first`` holds the index of each distinct row's first occurrence in input
+    order, so a batch without repeats comes back unchanged.
+    """
+
+    positions: Dict[bytes, int] = {}
+    inverse = np.fromiter(
+        (positions.setdefault(row.tobytes(), len(positions)) for row in encoded),
+        dtype=np.intp,
+        count=len(encoded),
+    )
+    # Positions are handed out in order of first occurrence.
+    _, first = np.unique(inverse, return_index=True)
+    return first, inverse
+
+
+class DedupStats:
+    """Rows received versus rows actually scored, across every batch.
+
+    Like the stage histograms, updates are not locked, so concurrent
+    observers may rarely lose a count.
+    """
+
+    def __init__(self) -> None:
+        self.batches = 0
+        self.rows = 0
+        self.unique_rows = 0
+
+    def observe(self, rows: int, unique: int) -> None:
+        self.batches += 1
+        self.rows += rows
+        self.unique_rows += unique
+
+    def reset(self) -> None:
+        self.batches = self.rows = self.unique_rows = 0
+
+    def snapshot(self) -> DedupMetrics:
+        rows, unique = self.rows, self.unique_rows
+        return DedupMetrics(
+            batches=self.batches,
+            rows=rows,
+            unique_rows=unique,
+            dedup_ratio=round(1 - unique / rows, 4) if rows else 0.0,
+        )
+
+
+DEDUP_STATS = DedupStats()
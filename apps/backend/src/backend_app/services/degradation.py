@@ -0,0 +1,110 @@
+"""Shedding sentiment load to the keyword fallback while inference is overloaded."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Optional, Sequence
+
+from backend_app.schemas import DegradationMetrics
+from backend_app.services.batching import MicroBatcher
+from backend_app.services.executor import InferenceExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class LoadShedder:
+    """Decides when new sentiment requests skip the model for the keyword fallback.
+
+    Shedding starts when the oldest queued interactive job, or the oldest text
+    queued in ``batcher``, has waited longer than ``max_queue_wait_ms``, or
+    more than ``max_in_flight`` inference jobs and batcher texts are queued or
+    running. The batcher only keeps ``max_concurrency`` jobs in the executor,
+    so under single-text overload the backlog builds up in its queue.
+
+    Shedding stops once both signals are back under ``recover_ratio`` of their
+    limits and shedding has lasted ``min_degraded_s``; without that hold the
+    queue would drain as soon as shedding started and the mode would flip on
+    every request. A limit of ``0`` disables its signal.
+
+    Like the stage histograms, counters are not locked.
+    """
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        max_queue_wait_ms: float = 0.0,
+        max_in_flight: int = 0,
+        recover_ratio: float = 0.5,
+        min_degraded_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        batcher: Optional[MicroBatcher] = None,
+    ) -> None:
+        self.executor = executor
+        self.batcher = batcher
+        self.max_queue_wait_ms = max(0.0, max_queue_wait_ms)
+        self.max_in_flight = max(0, max_in_flight)
+        self.recover_ratio = min(1.0, max(0.0, recover_ratio))
+        self.min_degraded_s = max(0.0, min_degraded_s)
+        self.clock = clock
+        self.active = False
+        self.since = 0.0
+        self.transitions = 0
+        self.responses = 0
+        self.degraded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_queue_wait_ms > 0 or self.max_in_flight > 0
+
+    def _overloaded(self, wait_ms: float, in_flight: int, scale: float) -> bool:
+        if self.max_queue_wait_ms and wait_ms > self.max_queue_wait_ms * scale:
+            return True
+        return bool(self.max_in_flight) and in_flight > self.max_in_flight * scale
+
+    def should_shed(self) -> bool:
+        """Whether the next request should be answered by the fallback."""
+
+        if not self.enabled:
+            return False
+        wait_s = self.executor.oldest_wait_s()
+        in_flight = self.executor.pending
+        if self.batcher is not None:
+            wait_s = max(wait_s, self.batcher.oldest_wait_s())
+            in_flight += self.batcher.pending
+        wait_ms = wait_s * 1000
+        now = self.clock()
+        if not self.active:
+            if self._overloaded(wait_ms, in_flight, 1.0):
+                self.active = True
+                self.since = now
+                self.transitions += 1
+                logger.warning(
+                    "Shedding sentiment load to the fallback (queue wait %.0f ms, %d in flight).",
+                    wait_ms,
+                    in_flight,
+                )
+        elif now - self.since >= self.min_degraded_s and not self._overloaded(
+            wait_ms, in_flight, self.recover_ratio
+        ):
+            self.active = False
+            logger.info("Load back under the recovery threshold; serving the model again.")
+        return self.active
+
+    def record(self, degraded: Sequence[bool]) -> None:
+        """Count served predictions and which of them were degraded."""
+
+        self.responses += len(degraded)
+        self.degraded += sum(degraded)
+
+    def snapshot(self) -> DegradationMetrics:
+        responses = self.responses
+        return DegradationMetrics(
+            active=self.active,
+            max_queue_wait_ms=self.max_queue_wait_ms,
+            max_in_flight=self.max_in_flight,
+            transitions=self.transitions,
+            responses=responses,
+            degraded=self.degraded,
+            degraded_ratio=round(self.degraded / responses, 4) if responses else 0.0,
+        )
@@ -0,0 +1,115 @@
+"""Vectorized tokenization and encoding into fixed-width id matrices."""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z']+")
+KERAS_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased ``[A-Za-z']+`` runs of ``text``."""
+
+    # Lower-casing ASCII text cannot create or split a match, so it is done
+    # once up front. Other text can fold into ASCII letters (the Kelvin sign
+    # lowers to "k"), so it is matched first and only the matches are lowered;
+    # they never contain spaces, so one join/lower/split does that.
+    if text.isascii():
+        return TOKEN_PATTERN.findall(text.lower())
+    return " ".join(TOKEN_PATTERN.findall(text)).lower().split()
+
+
+def keras_text_tokenizer(
+    filters: str = KERAS_FILTERS, lower: bool = True, split: str = " "
+) -> Callable[[str], List[str]]:
+    """Tokenizer matching ``keras.preprocessing.text.text_to_word_sequence``."""
+
+    table = str.maketrans({char: split for char in filters})
+
+    def tokenize_keras(text: str) -> List[str]:
+        if lower:
+            text = text.lower()
+        return [token for token in text.translate(table).split(split) if token]
+
+    return tokenize_keras
+
+
+class BatchEncoder:
+    """Writes token ids for many texts straight into one ``(N, max_length)`` int32 buffer.
+
+    Mirrors Keras ``pad_sequences(value=0)``: ``trunc_type`` picks which end of
+    a long text is kept and ``pad_type`` which side receives zeros. Ids at or
+    above ``vocab_size`` become ``unknown_token``. An empty text encodes as a
+    single ``unknown_token``, or as all padding with ``empty_as_unknown=False``
+    (what Keras ``texts_to_sequences`` produces).
+    """
+
+    def __init__(
+        self,
+        word_index: Mapping[str, int],
+        unknown_token: int,
+        vocab_size: int,
+        max_length: int,
+        pad_type: str = "post",
+        trunc_type: str = "post",
+        tokenizer: Callable[[str], List[str]] = tokenize,
+        empty_as_unknown: bool = True,
+    ) -> None:
+        for name, value in (("pad_type", pad_type), ("trunc_type", trunc_type)):
+            if value not in ("pre", "post"):
+                raise ValueError(f"{name} must be 'pre' or 'post', got {value!r}")
+        self.word_index = word_index
+        self.unknown_token = int(unknown_token)
+        self.vocab_size = vocab_size
+        self.max_length = max_length
+        self.pad_type = pad_type
+        self.trunc_type = trunc_type
+        self.tokenizer = tokenizer
+        self.empty_as_unknown = empty_as_unknown
+
+    def _lookup(self, tokens: List[str]) -> np.ndarray:
+        # Each distinct token is resolved once per batch; the per-token pass is a
+        # C-level map over a dict.
+        get = self.word_index.get
+        unknown = self.unknown_token
+        ids_by_token = {token: get(token, unknown) for token in set(tokens)}
+        ids = np.fromiter(
+            map(ids_by_token.__getitem__, tokens), dtype=np.int64, count=len(tokens)
+        )
+        ids[ids >= self.vocab_size] = unknown
+        return ids
+
+    def encode_tokens(self, tokenized: Sequence[List[str]]) -> np.ndarray:
+        max_length = self.max_length
+        if self.trunc_type == "post":
+            kept = [tokens[:max_length] for tokens in tokenized]
+        else:
+            kept = [tokens[-max_length:] for tokens in tokenized]
+        encoded = np.zeros((len(kept), max_length), dtype=np.int32)
+        lengths = np.fromiter(map(len, kept), dtype=np.int64, count=len(kept))
+        total = int(lengths.sum())
+        if total and len(kept) == 1:
+            # A lone text (the unbatched single-request path) skips the scatter.
+            start = 0 if self.pad_type == "post" else max_length - total
+            encoded[0, start : start + total] = self._lookup(kept[0])
+        elif total:
+            ids = self._lookup([token for tokens in kept for token in tokens])
+            rows = np.repeat(np.arange(len(kept)), lengths)
+            columns = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            if self.pad_type == "pre":
+                columns += (max_length - lengths)[rows]
+            encoded[rows, columns] = ids
+        empty = np.flatnonzero(lengths == 0) if self.empty_as_unknown else ()
+        if len(empty):
+            encoded[empty, 0 if self.pad_type == "post" else max_length - 1] = self.unknown_token
+        return encoded
+
+    def encode(self, texts: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """Return the encoded matrix and the number of tokens found in each text."""
+
+        tokenized = [self.tokenizer(text) for text in texts]
+        return self.encode_tokens(tokenized), [len(tokens) for tokens in tokenized]
@@ -0,0 +1,273 @@
+"""Bounded executor that keeps blocking inference off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from backend_app.core.histogram import LATENCY_BUCKETS_MS, Histogram
+from backend_app.schemas import ExecutorMetrics, LaneMetrics
+
+T = TypeVar("T")
+
+# Scheduling lanes, highest priority first.
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+
+class InferenceOverloaded(RuntimeError):
+    """Raised when the inference queue is full; surfaced as HTTP 503."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Inference capacity exhausted; retry later.")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised for work whose deadline passed before it ran; surfaced as HTTP 504."""
+
+    def __init__(self) -> None:
+        super().__init__("Request deadline passed before inference started.")
+
+
+def deadline_after(budget_ms: Optional[float]) -> Optional[float]:
+    """The ``time.monotonic()`` instant ``budget_ms`` from now, or ``None``."""
+
+    return None if budget_ms is None else time.monotonic() + budget_ms / 1000
+
+
+class _Job:
+    __slots__ = ("future", "fn", "args", "context", "lane", "deadline", "enqueued")
+
+    def __init__(
+        self, fn: Callable[..., Any], args: Tuple, lane: str, deadline: Optional[float]
+    ) -> None:
+        self.future: Future = Future()
+        self.fn = fn
+        self.args = args
+        # Carry context variables (e.g. the endpoint label for stage timings)
+        # into the worker thread, as asyncio.to_thread does.
+        self.context = contextvars.copy_context()
+        self.lane = lane
+        self.deadline = deadline
+        self.enqueued = time.monotonic()
+
+
+class _Lane:
+    """Queued jobs of one priority and their counters."""
+
+    def __init__(self, name: str, max_queue: int) -> None:
+        self.name = name
+        self.max_queue = max(0, max_queue)
+        self.queue: Deque[_Job] = deque()
+        self.submitted = 0
+        self.rejected = 0
+        self.expired = 0
+        self.completed = 0
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+
+    def snapshot(self) -> LaneMetrics:
+        return LaneMetrics(
+            lane=self.name,
+            max_queue=self.max_queue,
+            queue_depth=len(self.queue),
+            submitted=self.submitted,
+            rejected=self.rejected,
+            expired=self.expired,
+            completed=self.completed,
+            queue_wait_ms=self.queue_wait_ms.snapshot(),
+        )
+
+
+class InferenceExecutor:
+    """Runs CPU-heavy inference on a dedicated thread pool with per-lane queues.
+
+    TensorFlow and NumPy release the GIL inside their kernels, so a small thread
+    pool keeps the event loop (and the health probes it serves) responsive
+    without paying for model copies in extra processes.
+
+    Work is queued in one of ``LANES``; a free thread always takes the oldest
+    ``interactive`` job before any ``bulk`` one. Large jobs are submitted as
+    chunks with ``run_chunked``, so interactive work waits for at most one
+    chunk. A job whose ``deadline`` (a ``time.monotonic()`` instant) has passed
+    when a thread reaches it fails with ``DeadlineExceeded`` without running,
+    as does a queued job whose caller has stopped waiting.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 32,
+        retry_after_s: int = 1,
+        bulk_max_queue: Optional[int] = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after_s = retry_after_s
+        self.lanes: Dict[str, _Lane] = {
+            INTERACTIVE: _Lane(INTERACTIVE, self.max_queue),
+            BULK: _Lane(BULK, self.max_queue if bulk_max_queue is None else bulk_max_queue),
+        }
+        # Jobs admitted and not yet finished, queued or running.
+        self.pending = 0
+        self.running = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(lane.queue) for lane in self.lanes.values())
+
+    @property
+    def rejected(self) -> int:
+        return sum(lane.rejected for lane in self.lanes.values())
+
+    def oldest_wait_s(self, lane: str = INTERACTIVE) -> float:
+        """How long the oldest job still queued in ``lane`` has waited."""
+
+        queue = self._lane(lane).queue
+        with self._lock:
+            enqueued = queue[0].enqueued if queue else None
+        return 0.0 if enqueued is None else time.monotonic() - enqueued
+
+    def _lane(self, name: str) -> _Lane:
+        lane = self.lanes.get(name)
+        if lane is None:
+            raise ValueError(f"Unknown lane {name!r}; expected one of {LANES}")
+        return lane
+
+    def _submit(self, job: _Job, bounded: bool = True) -> None:
+        lane = self._lane(job.lane)
+        with self._lock:
+            if job.deadline is not None and job.enqueued >= job.deadline:
+                lane.expired += 1
+                raise DeadlineExceeded()
+            if bounded and self.running >= self.workers and len(lane.queue) >= lane.max_queue:
+                lane.rejected += 1
+                raise InferenceOverloaded(self.retry_after_s)
+            lane.submitted += 1
+            lane.queue.append(job)
+            self.pending += 1
+            start_worker = self.running < self.workers
+            if start_worker:
+                self.running += 1
+        if start_worker:
+            try:
+                self._pool.submit(self._drain)
+            except RuntimeError:  # shut down
+                with self._lock:
+                    self.running -= 1
+                    self.pending -= 1
+                    lane.queue.remove(job)
+                raise
+
+    def _next(self, now: float) -> Tuple[Optional[_Job], List[_Job]]:
+        """Pop the next runnable job, plus any expired ones passed over (lock held)."""
+
+        expired = []
+        for lane in self.lanes.values():
+            while lane.queue:
+                job = lane.queue.popleft()
+                if job.deadline is not None and now >= job.deadline:
+                    lane.expired += 1
+                    self.pending -= 1
+                    expired.append(job)
+                elif not job.future.set_running_or_notify_cancel():
+                    # The caller stopped waiting; skip the work entirely.
+                    self.pending -= 1
+                else:
+                    lane.queue_wait_ms.observe((now - job.enqueued) * 1000)
+                    return job, expired
+        return None, expired
+
+    def _drain(self) -> None:
+        """Worker loop: run queued jobs in priority order until none are left."""
+
+        while True:
+            with self._lock:
+                job, expired = self._next(time.monotonic())
+                if job is None:
+                    self.running -= 1
+            for stale in expired:
+                if stale.future.set_running_or_notify_cancel():
+                    stale.future.set_exception(DeadlineExceeded())
+            if job is None:
+                return
+            try:
+                result = job.context.run(job.fn, *job.args)
+            except BaseException as exc:
+                self._finish(job)
+                job.future.set_exception(exc)
+            else:
+                # Counted as finished before the caller can observe the result.
+                self._finish(job)
+                job.future.set_result(result)
+
+    def _finish(self, job: _Job) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.lanes[job.lane].completed += 1
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        lane: str = INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> T:
+        """Run ``fn(*args)`` on the pool, rejecting work when its lane's queue is full."""
+
+        job = _Job(fn, args, lane, deadline)
+        self._submit(job)
+        # Cancelling the awaiting task cancels the job if it has not started;
+        # running work holds its slot until it completes.
+        return await asyncio.wrap_future(job.future)
+
+    async def run_chunked(
+        self,
+        fn: Callable[[Sequence[Any]], T],
+        items: Sequence[Any],
+        chunk_size: int,
+        lane: str = BULK,
+        deadline: Optional[float] = None,
+    ) -> List[T]:
+        """``fn`` over consecutive ``chunk_size`` slices of ``items``, one job at a time.
+
+        Only the first chunk is subject to the queue limit, so admitted work is
+        not refused halfway; each later chunk queues behind any interactive
+        work that arrived meanwhile.
+        """
+
+        chunk_size = max(1, chunk_size)
+        results = []
+        for start in range(0, len(items), chunk_size):
+            job = _Job(fn, (items[start : start + chunk_size],), lane, deadline)
+            self._submit(job, bounded=not results)
+            results.append(await asyncio.wrap_future(job.future))
+        return results
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            queued = [job for lane in self.lanes.values() for job in lane.queue]
+            for lane in self.lanes.values():
+                lane.queue.clear()
+            self.pending -= len(queued)
+        for job in queued:
+            job.future.cancel()
+
+    def snapshot(self) -> ExecutorMetrics:
+        return ExecutorMetrics(
+            workers=self.workers,
+            max_queue=self.max_queue,
+            in_flight=self.pending,
+            queue_depth=self.queue_depth,
+            rejected=self.rejected,
+            lanes=[lane.snapshot() for lane in self.lanes.values()],
+        )
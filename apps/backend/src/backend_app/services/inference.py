@@ -1,48 +1,126 @@
-"""TensorFlow-backed sentiment service using the sentiment_package models."""
+"""Sentiment service running the sentiment_package IMDB models on Keras or NumPy."""
 
 from __future__ import annotations
 
-import re
 from pathlib import Path
-from typing import List, Tuple
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 
-from backend_app.schemas import SentimentResponse
+from backend_app.core.timing import STAGE_TIMINGS, StageTimings
+from backend_app.schemas import SentimentResponse, round_column
+from backend_app.services.cache import PredictionCache
+from backend_app.services.dedup import DEDUP_STATS, DedupStats, unique_rows
+from backend_app.services.encoding import BatchEncoder, tokenize
+from backend_app.services.lexicon import DEFAULT_LEXICON, LexiconScorer
+from sentiment_package.bucketing import DEFAULT_BUCKETS, BucketedPredictor, conv_receptive_field
+from sentiment_package.compiled import DEFAULT_WARMUP_BATCH_SIZES, CompiledForward
 from sentiment_package.imdb import data as imdb_data
-from sentiment_package.imdb import models as imdb_models
+from sentiment_package.imdb.numpy_model import DenseNumpyModel
+from sentiment_package.vocab import CompiledVocabulary
 import logging
 
-TOKEN_PATTERN = re.compile(r"[A-Za-z']+")
+# TensorFlow is imported lazily (see _load_model): the heuristic fallback and
+# the NumPy backend never need it, and importing it costs seconds of startup and
+# hundreds of MB per worker.
+BACKENDS = ("keras", "numpy")
+ARCHITECTURES = ("dense", "conv")
 logger = logging.getLogger(__name__)
 
 
 class SentimentService:
-    """Loads the IMDB dense classifier and exposes an inference-friendly interface."""
+    """Loads an IMDB classifier and exposes an inference-friendly interface.
+
+    ``backend="keras"`` loads a Keras checkpoint into ``build_dense_model`` (or
+    ``build_conv_model`` with ``architecture="conv"``);
+    ``backend="numpy"`` loads an ``.npz`` written by ``export_dense_weights`` and
+    runs the same network without TensorFlow; with ``skip_padding`` it folds the
+    padded positions into a precomputed bias so only real tokens are multiplied.
+    The conv model is scored at the narrowest of ``length_buckets`` that keeps
+    each row's result exact (see ``sentiment_package.bucketing``); pass an
+    empty sequence to always run it at ``max_length``. Keras models are called
+    through a traced ``CompiledForward`` rather than ``predict_on_batch``, and
+    ``warm_up`` runs them once per ``warmup_batch_sizes`` entry.
+
+    Without weights the service falls back to a keyword heuristic scored
+    against ``lexicon_path`` (see ``load_lexicon``) or the built-in keywords;
+    callers shedding load can ask for the same heuristic with ``degraded=True``.
+
+    Texts that encode to the same row are scored once per batch and counted in
+    ``dedup_stats``. An optional :class:`PredictionCache` is bound to a
+    fingerprint of the loaded weights and word index, so swapping either
+    invalidates cached scores. Stage latencies are recorded in ``timings``
+    under ``backend_label``.
+    """
 
     def __init__(
         self,
         weights_path: Path | None,
         max_length: int = 256,
         word_index_path: Path | None = None,
+        batch_size: int = 256,
+        backend: str = "keras",
+        skip_padding: bool = True,
+        vocab_path: Path | None = None,
+        cache: PredictionCache | None = None,
+        timings: StageTimings | None = None,
+        architecture: str = "dense",
+        length_buckets: Optional[Sequence[int]] = DEFAULT_BUCKETS,
+        lexicon_path: Path | None = None,
+        dedup_stats: DedupStats | None = None,
+        warmup_batch_sizes: Sequence[int] = DEFAULT_WARMUP_BATCH_SIZES,
     ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend!r}; expected one of {BACKENDS}")
+        if architecture not in ARCHITECTURES:
+            raise ValueError(
+                f"Unknown architecture {architecture!r}; expected one of {ARCHITECTURES}"
+            )
+        if architecture == "conv" and backend != "keras":
+            raise ValueError("The conv architecture is only served by the keras backend")
+        self.architecture = architecture
+        self.length_buckets = tuple(length_buckets or ())
         self.dataset_cfg = imdb_data.ImdbDatasetConfig(max_length=max_length)
-        self.model_cfg = imdb_models.DenseModelConfig(
-            vocab_size=self.dataset_cfg.vocab_size,
-            max_length=self.dataset_cfg.max_length,
-        )
+        self.model_cfg = None
+        self.batch_size = max(1, batch_size)
+        self.warmup_batch_sizes = tuple(warmup_batch_sizes)
+        self.backend = backend
+        self.skip_padding = skip_padding
+        self.timings = timings if timings is not None else STAGE_TIMINGS
+        self.dedup_stats = dedup_stats if dedup_stats is not None else DEDUP_STATS
         self.model = None
+        self._forward = None
+        self._compiled = None
+        self._widths = (max_length,)
         self.word_index = None
         self.unknown_token = None
+        self.encoder = None
+        self.cache = None
+        self._cache_salt = None
+        self.fingerprint = None
+        self._word_index_source = None
         self.use_model = False
+        # Also serves load shedding (``predict_columns(degraded=True)``) when a model is loaded.
+        self._init_fallback(lexicon_path)
 
         if weights_path and Path(weights_path).exists():
-            self.model = imdb_models.build_dense_model(self.model_cfg)
-            self._load_weights(weights_path)
+            self._load_model(Path(weights_path))
             try:
-                self._load_word_index(word_index_path)
+                self._load_word_index(word_index_path, vocab_path)
                 self.unknown_token = self.word_index.get("UNK", 2)
+                self.encoder = BatchEncoder(
+                    self.word_index,
+                    unknown_token=self.unknown_token,
+                    vocab_size=self.dataset_cfg.vocab_size,
+                    max_length=self.dataset_cfg.max_length,
+                    pad_type=self.dataset_cfg.pad_type,
+                    trunc_type=self.dataset_cfg.trunc_type,
+                )
+                self.fingerprint = self._fingerprint(Path(weights_path))
+                if cache is not None:
+                    self._cache_salt = cache.bind(self.fingerprint)
+                    self.cache = cache
                 self.use_model = True
             except Exception as exc:  # pragma: no cover
                 logger.warning(
@@ -50,13 +128,81 @@ class SentimentService:
                     exc,
                 )
                 self.use_model = False
-                self._init_fallback_sets()
         else:
             logger.warning(
                 "Sentiment weights missing at %s; using keyword heuristic fallback.",
                 weights_path,
             )
-            self._init_fallback_sets()
+
+    @property
+    def backend_label(self) -> str:
+        """``keras``/``numpy`` when the model is serving, otherwise ``fallback``."""
+
+        return self.backend if self.use_model else "fallback"
+
+    def activate(self) -> None:
+        """Bind the shared cache back to this model, e.g. after a failed swap."""
+
+        if self.cache is not None:
+            self._cache_salt = self.cache.bind(self.fingerprint)
+
+    def _load_model(self, weights_path: Path) -> None:
+        if self.backend == "numpy":
+            padding = self.dataset_cfg.pad_type if self.skip_padding else None
+            self.model = DenseNumpyModel.from_npz(weights_path, padding=padding)
+            if self.model.max_length != self.dataset_cfg.max_length:
+                raise ValueError(
+                    f"NumPy weights at {weights_path} were exported for max_length="
+                    f"{self.model.max_length}, service is configured for "
+                    f"{self.dataset_cfg.max_length}"
+                )
+            self._forward = self.model.predict
+            return
+        from sentiment_package.imdb import models as imdb_models
+
+        if self.architecture == "conv":
+            self.model_cfg = imdb_models.ConvModelConfig(
+                vocab_size=self.dataset_cfg.vocab_size,
+                max_length=self.dataset_cfg.max_length,
+            )
+            self.model = imdb_models.build_conv_model(self.model_cfg)
+        else:
+            self.model_cfg = imdb_models.DenseModelConfig(
+                vocab_size=self.dataset_cfg.vocab_size,
+                max_length=self.dataset_cfg.max_length,
+            )
+            self.model = imdb_models.build_dense_model(self.model_cfg)
+        self._load_weights(weights_path)
+        receptive_field = conv_receptive_field(self.model)
+        if receptive_field is None or not self.length_buckets:
+            self._compiled = CompiledForward(self.model, width=self.dataset_cfg.max_length)
+            self._forward = self._compiled.predict
+            return
+        self._compiled = CompiledForward(self.model)
+        predictor = BucketedPredictor(
+            self._compiled.predict,
+            max_length=self.dataset_cfg.max_length,
+            receptive_field=receptive_field,
+            padding=self.dataset_cfg.pad_type,
+            buckets=self.length_buckets,
+        )
+        self._forward = predictor.predict
+        self._widths = tuple(predictor.buckets.tolist())
+
+    def warm_up(self) -> None:
+        """Run the model at each of ``warmup_batch_sizes`` (and bucket width) once.
+
+        Sizes above ``batch_size`` are capped, since no model call is larger.
+        """
+
+        if not self.use_model:
+            return
+        sizes = sorted({min(max(1, size), self.batch_size) for size in self.warmup_batch_sizes})
+        if self._compiled is not None:
+            self._compiled.warm_up(sizes, self._widths)
+            return
+        for size in sizes:
+            self._forward(np.zeros((size, self.dataset_cfg.max_length), dtype=np.int32))
 
     def _load_weights(self, weights_path: Path) -> None:
         if self.model is None:
@@ -68,103 +214,179 @@ class SentimentService:
         self.model.build((None, self.dataset_cfg.max_length))
         self.model.load_weights(str(weights_path))
 
-    def _load_word_index(self, custom_path: Path | None) -> None:
-        if custom_path and custom_path.exists():
+    def _load_word_index(
+        self, custom_path: Path | None, vocab_path: Path | None = None
+    ) -> None:
+        # A compiled vocabulary is memory-mapped and shared across workers through
+        # the page cache; JSON and the Keras download are fallbacks for dev setups.
+        if vocab_path and vocab_path.exists():
+            self.word_index = CompiledVocabulary(vocab_path)
+            self._word_index_source = vocab_path
+        elif custom_path and custom_path.exists():
             import json
 
             with custom_path.open("r", encoding="utf-8") as handle:
                 self.word_index = json.load(handle)
+            self._word_index_source = custom_path
         else:
             _, self.word_index = imdb_data.build_word_mappings()
 
-    def _init_fallback_sets(self) -> None:
-        self.positive = {
-            "great",
-            "good",
-            "love",
-            "excellent",
-            "happy",
-            "amazing",
-            "win",
-            "positive",
-            "excited",
-        }
-        self.negative = {
-            "bad",
-            "terrible",
-            "hate",
-            "awful",
-            "sad",
-            "angry",
-            "lose",
-            "negative",
-            "annoyed",
-        }
+    def _fingerprint(self, weights_path: Path) -> str:
+        """Identify the loaded weights, word index and encoding settings."""
+
+        def describe(path: Path | None) -> str:
+            if path is None:
+                return "keras-imdb-word-index"
+            stat = path.stat()
+            return f"{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+        return "|".join(
+            [
+                self.backend,
+                describe(weights_path),
+                describe(self._word_index_source),
+                f"{self.dataset_cfg.vocab_size}:{self.dataset_cfg.max_length}",
+                self.architecture,
+            ]
+        )
+
+    def _init_fallback(self, lexicon_path: Path | None) -> None:
+        self.lexicon = LexiconScorer(DEFAULT_LEXICON)
+        if lexicon_path is None:
+            return
+        try:
+            self.lexicon = LexiconScorer.from_path(lexicon_path)
+        except (OSError, ValueError) as exc:
+            logger.warning(
+                "Unable to load fallback lexicon %s; using the built-in keywords. Reason: %s",
+                lexicon_path,
+                exc,
+            )
 
     def _tokenize(self, text: str) -> List[str]:
-        return [match.group(0).lower() for match in TOKEN_PATTERN.finditer(text)]
-
-    def _encode(self, text: str) -> Tuple[np.ndarray, int]:
-        tokens = self._tokenize(text)
-        indices = []
-        for token in tokens:
-            idx = self.word_index.get(token, self.unknown_token)
-            if idx >= self.model_cfg.vocab_size:
-                idx = self.unknown_token
-            indices.append(idx)
-        if not indices:
-            indices = [self.unknown_token]
-        padded = pad_sequences(
-            [indices],
-            maxlen=self.dataset_cfg.max_length,
-            padding=self.dataset_cfg.pad_type,
-            truncating=self.dataset_cfg.trunc_type,
-            value=0,
+        return tokenize(text)
+
+    def _encode_batch(self, texts: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """Encode every text into a single ``(N, max_length)`` matrix."""
+
+        started = perf_counter()
+        tokenized = [self.encoder.tokenizer(text) for text in texts]
+        tokenized_at = perf_counter()
+        encoded = self.encoder.encode_tokens(tokenized)
+        self.timings.observe("tokenize", self.backend, tokenized_at - started)
+        self.timings.observe("encode", self.backend, perf_counter() - tokenized_at)
+        return encoded, [len(tokens) for tokens in tokenized]
+
+    def _run_model(self, encoded: np.ndarray) -> np.ndarray:
+        """Score an encoded matrix in chunks of ``batch_size`` rows."""
+
+        started = perf_counter()
+        chunks = [
+            np.asarray(self._forward(encoded[start : start + self.batch_size]))
+            for start in range(0, len(encoded), self.batch_size)
+        ]
+        probabilities = np.concatenate(chunks).reshape(-1).astype(np.float64)
+        self.timings.observe("model", self.backend, perf_counter() - started)
+        return probabilities
+
+    def _score(self, encoded: np.ndarray) -> np.ndarray:
+        """Model probabilities for each row; repeated rows are scored once."""
+
+        started = perf_counter()
+        first, inverse = unique_rows(encoded)
+        self.dedup_stats.observe(len(encoded), len(first))
+        self.timings.observe("dedup", self.backend, perf_counter() - started)
+        if len(first) == len(encoded):
+            return self._score_unique(encoded)
+        return self._score_unique(encoded[first])[inverse]
+
+    def _score_unique(self, encoded: np.ndarray) -> np.ndarray:
+        """Model probabilities for each row, served from the cache where possible."""
+
+        if self.cache is None:
+            return self._run_model(encoded)
+        started = perf_counter()
+        keys = self.cache.keys_for(encoded, self._cache_salt)
+        cached = self.cache.get_many(keys)
+        self.timings.observe("cache", self.backend, perf_counter() - started)
+        missing = [row for row, value in enumerate(cached) if value is None]
+        if not missing:
+            return np.asarray(cached, dtype=np.float64)
+        fresh = self._run_model(encoded[missing])
+        self.cache.put_many([keys[row] for row in missing], fresh, salt=self._cache_salt)
+        probabilities = np.asarray(
+            [np.nan if value is None else value for value in cached], dtype=np.float64
+        )
+        probabilities[missing] = fresh
+        return probabilities
+
+    def _to_columns(
+        self, probabilities: np.ndarray, token_counts: Sequence[int]
+    ) -> Dict[str, list]:
+        signed_scores = (probabilities - 0.5) * 2  # scale to [-1, 1]
+        labels = np.where(
+            signed_scores >= 0.1,
+            "positive",
+            np.where(signed_scores <= -0.1, "negative", "neutral"),
         )
-        return padded, len(tokens)
+        confidences = np.minimum(1.0, np.abs(signed_scores))
+        return {
+            "label": labels.tolist(),
+            "score": round_column(signed_scores.tolist(), 3),
+            "confidence": round_column(confidences.tolist(), 3),
+            "tokens_analyzed": list(token_counts),
+        }
 
-    def _predict_model(self, text: str) -> SentimentResponse:
+    def _predict_model_columns(self, texts: Sequence[str]) -> Dict[str, list]:
         if not self.use_model or self.model is None or self.word_index is None:
             raise RuntimeError("Model inference requested but model is not initialized.")
-        encoded, token_count = self._encode(text)
-        probability = float(self.model.predict(encoded, verbose=0)[0][0])
-        signed_score = (probability - 0.5) * 2  # scale to [-1, 1]
-        label = "neutral"
-        if signed_score >= 0.1:
-            label = "positive"
-        elif signed_score <= -0.1:
-            label = "negative"
-        confidence = min(1.0, abs(signed_score))
-        return SentimentResponse(
-            label=label,
-            score=float(round(signed_score, 3)),
-            confidence=float(round(confidence, 3)),
-            tokens_analyzed=token_count,
-        )
+        encoded, token_counts = self._encode_batch(texts)
+        probabilities = self._score(encoded)
+        started = perf_counter()
+        columns = self._to_columns(probabilities, token_counts)
+        self.timings.observe("postprocess", self.backend, perf_counter() - started)
+        return columns
 
-    def _predict_fallback(self, text: str) -> SentimentResponse:
-        tokens = self._tokenize(text)
-        pos = sum(1 for token in tokens if token in self.positive)
-        neg = sum(1 for token in tokens if token in self.negative)
-        score = 0.0
-        if pos or neg:
-            score = (pos - neg) / max(1, pos + neg)
-        label = "neutral"
-        if score > 0.15:
-            label = "positive"
-        elif score < -0.15:
-            label = "negative"
-        confidence = min(1.0, abs(score))
-        if len(tokens) < 4:
-            confidence *= 0.6
-        return SentimentResponse(
-            label=label,
-            score=float(round(score, 3)),
-            confidence=float(round(confidence, 3)),
-            tokens_analyzed=len(tokens),
-        )
+    def _predict_fallback_columns(self, texts: Sequence[str]) -> Dict[str, list]:
+        started = perf_counter()
+        tokenized = [self._tokenize(text) for text in texts]
+        tokenized_at = perf_counter()
+        columns = self.lexicon.columns(tokenized)
+        self.timings.observe("tokenize", "fallback", tokenized_at - started)
+        self.timings.observe("score", "fallback", perf_counter() - tokenized_at)
+        return columns
 
     def predict(self, text: str) -> SentimentResponse:
-        if self.use_model and self.word_index is not None:
-            return self._predict_model(text)
-        return self._predict_fallback(text)
+        return self.predict_batch([text])[0]
+
+    def predict_columns(self, texts: Sequence[str], degraded: bool = False) -> Dict[str, list]:
+        """Predictions as parallel lists keyed by ``SentimentResponse`` field.
+
+        Serving a batch from these lists skips building and validating one
+        response model per text. ``degraded=True`` scores with the keyword
+        fallback even when a model is loaded, and flags the predictions.
+        """
+
+        if not texts:
+            return {name: [] for name in SentimentResponse.model_fields}
+        model_ready = self.use_model and self.word_index is not None
+        if model_ready and not degraded:
+            columns = self._predict_model_columns(texts)
+        else:
+            columns = self._predict_fallback_columns(texts)
+        columns["degraded"] = [model_ready and degraded] * len(texts)
+        return columns
+
+    def predict_batch(
+        self, texts: Sequence[str], degraded: bool = False
+    ) -> List[SentimentResponse]:
+        """Score many texts with a single encode pass and chunked model calls."""
+
+        if not texts:
+            return []
+        columns = self.predict_columns(texts, degraded)
+        started = perf_counter()
+        responses = SentimentResponse.from_columns(columns)
+        backend = "fallback" if columns["degraded"][0] else self.backend_label
+        self.timings.observe("respond", backend, perf_counter() - started)
+        return responses
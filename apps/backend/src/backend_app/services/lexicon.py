@@ -0,0 +1,137 @@
+"""Weighted lexicon scoring for the keyword fallback.
+
+A lexicon maps words to signed weights. It is compiled into a term index
+(``word -> column``) and a weight vector, and a batch is scored as the product
+of its sparse document-term matrix with that vector: each token occurrence is
+one ``(document, term)`` entry, and ``np.bincount`` sums the entries' weights
+per document. The only per-token Python work is one dict lookup, so the cost
+does not grow with the size of the lexicon.
+
+A text's score is its net weight over its total absolute weight,
+``sum(w) / max(1, sum(|w|))``. With the default ``+1``/``-1`` lexicon this is
+``(pos - neg) / max(1, pos + neg)``, the original keyword heuristic.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import chain, repeat
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from backend_app.schemas import SentimentResponse, round_column
+
+POSITIVE_WORDS = (
+    "great", "good", "love", "excellent", "happy", "amazing", "win", "positive", "excited",
+)
+NEGATIVE_WORDS = (
+    "bad", "terrible", "hate", "awful", "sad", "angry", "lose", "negative", "annoyed",
+)
+# The built-in keywords; no large lexicon ships with the repository, so
+# operators supply one through ``FALLBACK_LEXICON_PATH``.
+DEFAULT_LEXICON: Dict[str, float] = {
+    **{word: 1.0 for word in POSITIVE_WORDS},
+    **{word: -1.0 for word in NEGATIVE_WORDS},
+}
+LABEL_THRESHOLD = 0.15
+# Texts this short are scored with reduced confidence.
+SHORT_TEXT_TOKENS = 4
+SHORT_TEXT_DISCOUNT = 0.6
+
+
+def load_lexicon(path: Path | str) -> Dict[str, float]:
+    """Read a ``.json`` object or a text file of ``word<whitespace>weight`` lines.
+
+    Text files may contain blank lines and ``#`` comments, and columns after
+    the weight are ignored, so VADER-style lexicons load unchanged. Words are
+    lowercased to match the tokenizer; a repeated word keeps its last weight.
+    """
+
+    path = Path(path)
+    if path.suffix == ".json":
+        entries = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(entries, dict):
+            raise ValueError(f"{path} must hold a JSON object of word weights")
+        return {str(word).lower(): float(weight) for word, weight in entries.items()}
+    lexicon: Dict[str, float] = {}
+    with path.open(encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            try:
+                lexicon[fields[0].lower()] = float(fields[1])
+            except (IndexError, ValueError) as exc:
+                raise ValueError(f"{path}:{number}: expected 'word weight', got {line!r}") from exc
+    return lexicon
+
+
+class LexiconScorer:
+    """Scores tokenized texts against a compiled weighted lexicon."""
+
+    def __init__(self, lexicon: Mapping[str, float]) -> None:
+        # Column 0 holds weight 0 for words outside the lexicon.
+        self.index: Dict[str, int] = {}
+        weights = [0.0]
+        for word, weight in lexicon.items():
+            self.index[word] = len(weights)
+            weights.append(float(weight))
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.magnitudes = np.abs(self.weights)
+
+    @classmethod
+    def from_path(cls, path: Path | str) -> "LexiconScorer":
+        return cls(load_lexicon(path))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def totals(self, tokenized: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Net and absolute lexicon weight of each text."""
+
+        count = len(tokenized)
+        lengths = np.fromiter(map(len, tokenized), dtype=np.intp, count=count)
+        # One C-level dict lookup per token; unknown tokens map to column 0.
+        tokens = chain.from_iterable(tokenized)
+        columns = np.fromiter(
+            map(self.index.get, tokens, repeat(0)), dtype=np.intp, count=int(lengths.sum())
+        )
+        # Only lexicon hits are non-zero entries of the document-term matrix.
+        hits = np.flatnonzero(columns)
+        documents = np.repeat(np.arange(count), lengths)[hits]
+        columns = columns[hits]
+        net = np.bincount(documents, self.weights[columns], minlength=count)
+        mass = np.bincount(documents, self.magnitudes[columns], minlength=count)
+        return net, mass
+
+    def scores(self, tokenized: Sequence[Sequence[str]]) -> np.ndarray:
+        net, mass = self.totals(tokenized)
+        return net / np.maximum(1.0, mass)
+
+    def columns(self, tokenized: Sequence[Sequence[str]]) -> Dict[str, list]:
+        """Fallback predictions as parallel lists keyed by ``SentimentResponse`` field.
+
+        Identical to scoring each text on its own.
+        """
+
+        scores = self.scores(tokenized)
+        token_counts = [len(tokens) for tokens in tokenized]
+        labels = np.where(
+            scores > LABEL_THRESHOLD,
+            "positive",
+            np.where(scores < -LABEL_THRESHOLD, "negative", "neutral"),
+        )
+        confidences = np.minimum(1.0, np.abs(scores))
+        confidences[np.asarray(token_counts) < SHORT_TEXT_TOKENS] *= SHORT_TEXT_DISCOUNT
+        return {
+            "label": labels.tolist(),
+            "score": round_column(scores.tolist(), 3),
+            "confidence": round_column(confidences.tolist(), 3),
+            "tokens_analyzed": token_counts,
+        }
+
+    def responses(self, tokenized: Sequence[Sequence[str]]) -> List[SentimentResponse]:
+        return SentimentResponse.from_columns(self.columns(tokenized))
@@ -0,0 +1,435 @@
+"""Named model registry with lazy loading, a memory budget and hot swaps."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend_app.core.timing import ENDPOINT
+from backend_app.schemas import ModelStatus, RegistryMetrics
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXTS = (
+    "a warm up request before the model takes traffic",
+    "great acting but a terrible plot",
+    "ok",
+)
+
+# Wait before retrying a model whose load failed; doubles per consecutive failure.
+RETRY_MIN_S = 5.0
+RETRY_MAX_S = 300.0
+
+_Signature = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """How to build one named model and which files identify its version."""
+
+    name: str
+    factory: Callable[[], Any]
+    paths: Tuple[Path, ...] = ()
+    warmup_texts: Tuple[str, ...] = WARMUP_TEXTS
+
+
+@dataclass
+class _Entry:
+    spec: ModelSpec
+    service: Any = None
+    signature: Optional[_Signature] = None
+    pending_signature: Optional[_Signature] = None
+    nbytes: int = 0
+    version: int = 0
+    loads: int = 0
+    swaps: int = 0
+    evictions: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+    last_used: float = 0.0
+    warmed: bool = False
+    deferred: bool = False
+    failed_loads: int = 0
+    retry_at: float = 0.0
+    load_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def file_signature(paths: Tuple[Path, ...]) -> _Signature:
+    """``(path, mtime_ns, size)`` per file; missing files count as ``(path, -1, -1)``."""
+
+    signature = []
+    for path in paths:
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            signature.append((str(path), -1, -1))
+        else:
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def service_nbytes(service: Any) -> int:
+    """Approximate resident weight bytes of a service's ``model``.
+
+    Keras models are sized from their variables, other models (the NumPy
+    backend) from their array attributes. Memory-mapped vocabularies live in
+    the shared page cache and are not counted.
+    """
+
+    model = getattr(service, "model", None)
+    if model is None:
+        return 0
+    weights = getattr(model, "weights", None)
+    if weights is not None and not isinstance(weights, dict):
+        return sum(
+            int(np.prod(weight.shape)) * np.dtype(str(weight.dtype)).itemsize
+            for weight in weights
+        )
+    return sum(value.nbytes for value in vars(model).values() if isinstance(value, np.ndarray))
+
+
+class ModelRegistry:
+    """Holds several named models, each built on first use.
+
+    ``get`` returns the current service for a name; callers keep that
+    reference for the whole request, so a swap or eviction never interrupts
+    work already in flight. When the loaded models exceed
+    ``memory_budget_bytes`` (``0`` disables the budget), the least recently
+    used ones are dropped and rebuilt on their next use.
+
+    Every version is warmed up (the service's own ``warm_up``, then
+    ``warmup_texts``) before it is installed, so traffic only reaches warm
+    models. ``reload`` builds a new version that way before replacing the
+    reference; if building or warming fails the old version keeps serving.
+    ``warm_all`` loads the models at startup, leaving the rest to load on
+    first use once the budget is full. ``ready`` reports which models can
+    serve warm: warmed at least once (an evicted model is rebuilt warm on its
+    next use) or deferred by ``warm_all``, and without a failed load. Loads
+    run in the caller's thread; call them off the event loop.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.memory_budget_bytes = max(0, memory_budget_bytes)
+        self.clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._loaded: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._signal_tasks: set = set()
+
+    def register(self, spec: ModelSpec) -> None:
+        with self._lock:
+            if spec.name in self._entries:
+                raise ValueError(f"Model {spec.name!r} is already registered")
+            self._entries[spec.name] = _Entry(spec)
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def _entry(self, name: str) -> _Entry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Unknown model {name!r}") from None
+
+    def get(self, name: str) -> Any:
+        """The current service for ``name``, building it if it is not loaded."""
+
+        entry = self._entry(name)
+        service = entry.service
+        if service is None:
+            with entry.load_lock:
+                service = entry.service
+                if service is None:
+                    signature = file_signature(entry.spec.paths)
+                    try:
+                        service = entry.spec.factory()
+                        self._warm_up(service, entry.spec.warmup_texts)
+                    except Exception as exc:
+                        self._record_failure(entry, exc)
+                        entry.failed_loads += 1
+                        backoff = RETRY_MIN_S * 2 ** (entry.failed_loads - 1)
+                        entry.retry_at = self.clock() + min(RETRY_MAX_S, backoff)
+                        raise
+                    self._install(entry, service, signature)
+        entry.last_used = self.clock()
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+        return service
+
+    def peek(self, name: str) -> Any:
+        """The current service for ``name``, or ``None``; never builds or waits."""
+
+        return self._entry(name).service
+
+    def reload(self, name: str) -> Any:
+        """Build, warm up and swap in a fresh version of ``name``.
+
+        Raises whatever building or warming raised, after leaving the
+        previous version in place.
+        """
+
+        entry = self._entry(name)
+        with entry.load_lock:
+            signature = file_signature(entry.spec.paths)
+            try:
+                service = entry.spec.factory()
+                self._warm_up(service, entry.spec.warmup_texts)
+            except Exception as exc:
+                self._record_failure(entry, exc)
+                current = entry.service
+                if current is not None and hasattr(current, "activate"):
+                    current.activate()
+                raise
+            replaced = entry.service is not None
+            self._install(entry, service, signature)
+            if replaced:
+                entry.swaps += 1
+        logger.info("Model %r swapped to version %d.", name, entry.version)
+        return service
+
+    def warm_all(self) -> List[str]:
+        """Load and warm registered models in order; failures are logged and skipped.
+
+        A model whose files would not fit in what is left of the memory budget
+        is deferred to its first use, as is every model after a load evicted
+        another, rather than loading models only to evict each other. The first
+        model is always loaded.
+        """
+
+        warmed = []
+        full = False
+        for name in self.names():
+            entry = self._entries[name]
+            if full or not self._fits(entry):
+                entry.deferred = True
+                logger.info("Memory budget is full; model %r will load on first use.", name)
+                continue
+            evictions = sum(other.evictions for other in self._entries.values())
+            try:
+                self.get(name)
+            except Exception:
+                logger.exception("Warming up model %r failed; it is not ready.", name)
+            else:
+                warmed.append(name)
+            full = evictions != sum(other.evictions for other in self._entries.values())
+        return warmed
+
+    def ready(self) -> Dict[str, bool]:
+        """Whether each model can serve warm: warmed once or deferred, with no failed load."""
+
+        return {
+            name: (entry.warmed or entry.deferred) and not entry.failed_loads
+            for name, entry in self._entries.items()
+        }
+
+    def _fits(self, entry: _Entry) -> bool:
+        # Weight files approximate the memory a model will take once built.
+        if not self.memory_budget_bytes or entry.service is not None:
+            return True
+        with self._lock:
+            if not self._loaded:
+                return True
+            loaded = sum(self._entries[name].nbytes for name in self._loaded)
+        needed = sum(max(0, size) for _, _, size in file_signature(entry.spec.paths))
+        return loaded + needed <= self.memory_budget_bytes
+
+    def retry_failed(self, force: bool = False) -> List[str]:
+        """Load models whose last load failed, once their backoff has passed.
+
+        A model that failed at startup is never loaded, so the file checks and
+        ``reload_loaded`` would otherwise not revisit it. ``force`` ignores the
+        backoff.
+        """
+
+        recovered = []
+        now = self.clock()
+        for name, entry in list(self._entries.items()):
+            if entry.service is not None or not entry.failed_loads:
+                continue
+            if not force and now < entry.retry_at:
+                continue
+            attempts = entry.failed_loads
+            try:
+                self.get(name)
+            except Exception as exc:
+                logger.warning("Retrying model %r failed: %s", name, exc)
+            else:
+                logger.info("Model %r loaded after %d failed attempts.", name, attempts)
+                recovered.append(name)
+        return recovered
+
+    def reload_loaded(self) -> List[str]:
+        """Reload every loaded model and retry failed ones; failures are logged and skipped."""
+
+        reloaded = []
+        for name in list(self._loaded):
+            try:
+                self.reload(name)
+            except Exception:
+                logger.exception("Reloading model %r failed; keeping the current version.", name)
+            else:
+                reloaded.append(name)
+        return reloaded + self.retry_failed(force=True)
+
+    def check_for_changes(self) -> List[str]:
+        """Reload loaded models whose files changed and then held still for one check.
+
+        Waiting for two identical observations avoids loading a checkpoint
+        that is still being written.
+        """
+
+        reloaded = []
+        for name in list(self._loaded):
+            entry = self._entries[name]
+            current = file_signature(entry.spec.paths)
+            if current == entry.signature:
+                entry.pending_signature = None
+                continue
+            if current != entry.pending_signature:
+                entry.pending_signature = current
+                continue
+            entry.pending_signature = None
+            try:
+                self.reload(name)
+            except Exception:
+                # Remember the broken files so they are not retried every check.
+                entry.signature = current
+                logger.exception("Reloading model %r failed; keeping the current version.", name)
+            else:
+                reloaded.append(name)
+        return reloaded
+
+    async def watch(self, interval_s: float) -> None:
+        """Poll model files and retry failed loads every ``interval_s`` seconds until cancelled."""
+
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await asyncio.to_thread(self.check_for_changes)
+                await asyncio.to_thread(self.retry_failed)
+            except Exception:  # pragma: no cover - both log per model
+                logger.exception("Model file check failed.")
+
+    def install_signal_handler(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Reload loaded models on ``SIGHUP``; returns ``False`` where unsupported."""
+
+        if not hasattr(signal, "SIGHUP"):
+            return False
+
+        def on_hangup() -> None:
+            task = loop.create_task(asyncio.to_thread(self.reload_loaded))
+            self._signal_tasks.add(task)
+            task.add_done_callback(self._signal_tasks.discard)
+
+        try:
+            loop.add_signal_handler(signal.SIGHUP, on_hangup)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Not the main thread (e.g. the test client) or no signal support.
+            return False
+        return True
+
+    def evict(self, name: str) -> bool:
+        entry = self._entry(name)
+        with self._lock:
+            if self._loaded.pop(name, None) is None and entry.service is None:
+                return False
+            entry.service = None
+            entry.nbytes = 0
+            entry.evictions += 1
+        logger.info("Model %r evicted.", name)
+        return True
+
+    @staticmethod
+    def _record_failure(entry: _Entry, exc: Exception) -> None:
+        entry.failures += 1
+        entry.last_error = f"{type(exc).__name__}: {exc}"
+
+    def _warm_up(self, service: Any, texts: Tuple[str, ...]) -> None:
+        if not getattr(service, "available", True):
+            return
+        token = ENDPOINT.set("warm_up")
+        try:
+            if hasattr(service, "warm_up"):
+                service.warm_up()
+            if texts:
+                service.predict_batch(list(texts))
+                service.predict_batch(list(texts[:1]))
+        finally:
+            ENDPOINT.reset(token)
+
+    def _install(self, entry: _Entry, service: Any, signature: _Signature) -> None:
+        nbytes = service_nbytes(service)
+        with self._lock:
+            entry.service = service
+            entry.warmed = True
+            entry.signature = signature
+            entry.nbytes = nbytes
+            entry.version += 1
+            entry.loads += 1
+            entry.failed_loads = 0
+            entry.last_error = None
+            entry.last_used = self.clock()
+            self._loaded[entry.spec.name] = None
+            self._loaded.move_to_end(entry.spec.name)
+            evicted = self._over_budget(keep=entry.spec.name)
+        for name in evicted:
+            logger.info("Model %r evicted to stay within the memory budget.", name)
+
+    def _over_budget(self, keep: str) -> List[str]:
+        # Called with the lock held.
+        if not self.memory_budget_bytes:
+            return []
+        evicted = []
+        total = sum(self._entries[name].nbytes for name in self._loaded)
+        for name in list(self._loaded):
+            if total <= self.memory_budget_bytes:
+                break
+            if name == keep:
+                continue
+            entry = self._entries[name]
+            total -= entry.nbytes
+            del self._loaded[name]
+            entry.service = None
+            entry.nbytes = 0
+            entry.evictions += 1
+            evicted.append(name)
+        return evicted
+
+    def snapshot(self) -> RegistryMetrics:
+        now = self.clock()
+        models = [
+            ModelStatus(
+                name=name,
+                loaded=entry.service is not None,
+                version=entry.version,
+                backend=getattr(entry.service, "backend_label", None),
+                memory_mb=round(entry.nbytes / 2**20, 3),
+                idle_s=round(now - entry.last_used, 3) if entry.service is not None else None,
+                loads=entry.loads,
+                swaps=entry.swaps,
+                evictions=entry.evictions,
+                failures=entry.failures,
+                last_error=entry.last_error,
+                warmed=entry.warmed,
+            )
+            for name, entry in self._entries.items()
+        ]
+        return RegistryMetrics(
+            memory_budget_mb=round(self.memory_budget_bytes / 2**20, 3),
+            memory_mb=round(sum(entry.nbytes for entry in self._entries.values()) / 2**20, 3),
+            models=models,
+        )
@@ -0,0 +1,183 @@
+"""Sarcasm service serving a trained sentiment_package.sarcasm Keras model."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend_app.core.timing import STAGE_TIMINGS, StageTimings
+from backend_app.schemas import SarcasmResponse, round_column
+from backend_app.services.encoding import KERAS_FILTERS, BatchEncoder, keras_text_tokenizer
+from sentiment_package.bucketing import DEFAULT_BUCKETS, BucketedPredictor, conv_receptive_field
+from sentiment_package.compiled import DEFAULT_WARMUP_BATCH_SIZES, CompiledForward
+from sentiment_package.imdb.numpy_model import DenseNumpyModel
+from sentiment_package.vocab import CompiledVocabulary
+
+BACKENDS = ("keras", "numpy")
+logger = logging.getLogger(__name__)
+
+
+class SarcasmUnavailable(RuntimeError):
+    """Raised when sarcasm scoring is requested but no model is loaded."""
+
+
+class SarcasmService:
+    """Scores headlines with a saved sarcasm model and its compiled tokenizer.
+
+    ``vocab_path`` is written by ``sarcasm.data.save_tokenizer`` during training;
+    its metadata carries the Keras tokenizer filters, OOV id and padding, so
+    serving reproduces ``texts_to_sequences`` plus ``pad_sequences`` exactly.
+    Unlike the sentiment service there is no heuristic fallback: without both
+    artifacts ``available`` is ``False`` and scoring raises ``SarcasmUnavailable``.
+
+    ``backend="numpy"`` serves the dense model from an ``.npz`` written by
+    ``export_dense_weights`` (float32, float16 or int8) without TensorFlow.
+    Keras conv models are scored per ``length_buckets`` width, as in the
+    sentiment service, through a traced ``CompiledForward``.
+    """
+
+    def __init__(
+        self,
+        model_path: Path | None,
+        vocab_path: Path | None,
+        batch_size: int = 1024,
+        threshold: float = 0.5,
+        timings: StageTimings | None = None,
+        backend: str = "keras",
+        length_buckets: Optional[Sequence[int]] = DEFAULT_BUCKETS,
+        warmup_batch_sizes: Sequence[int] = DEFAULT_WARMUP_BATCH_SIZES,
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown sarcasm backend {backend!r}; expected one of {BACKENDS}")
+        self.backend = backend
+        self.length_buckets = tuple(length_buckets or ())
+        self.batch_size = max(1, batch_size)
+        self.warmup_batch_sizes = tuple(warmup_batch_sizes)
+        self.threshold = threshold
+        self.timings = timings if timings is not None else STAGE_TIMINGS
+        self.model = None
+        self._forward = None
+        self._compiled = None
+        self._widths = ()
+        self.encoder = None
+        self.max_length = None
+        self.available = False
+        if not (model_path and Path(model_path).exists()):
+            logger.warning("Sarcasm model missing at %s; sarcasm routes disabled.", model_path)
+            return
+        if not (vocab_path and Path(vocab_path).exists()):
+            logger.warning("Sarcasm vocabulary missing at %s; sarcasm routes disabled.", vocab_path)
+            return
+        self._load_encoder(Path(vocab_path))
+        self._load_model(Path(model_path))
+        self.available = True
+
+    def _load_encoder(self, vocab_path: Path) -> None:
+        vocabulary = CompiledVocabulary(vocab_path)
+        metadata = vocabulary.metadata
+        if metadata.get("unknown_token") is None:
+            raise ValueError(f"{vocab_path} was saved from a tokenizer without an oov_token")
+        self.max_length = int(metadata["max_length"])
+        self.encoder = BatchEncoder(
+            vocabulary,
+            unknown_token=metadata["unknown_token"],
+            vocab_size=metadata.get("vocab_size") or len(vocabulary) + 1,
+            max_length=self.max_length,
+            pad_type=metadata.get("padding", "post"),
+            trunc_type=metadata.get("truncating", "post"),
+            tokenizer=keras_text_tokenizer(
+                filters=metadata.get("filters", KERAS_FILTERS),
+                lower=metadata.get("lower", True),
+                split=metadata.get("split", " "),
+            ),
+            empty_as_unknown=False,
+        )
+
+    @property
+    def backend_label(self) -> str:
+        return "sarcasm" if self.backend == "keras" else f"sarcasm-{self.backend}"
+
+    def _load_model(self, model_path: Path) -> None:
+        if self.backend == "numpy":
+            padding = self.encoder.pad_type
+            self.model = DenseNumpyModel.from_npz(model_path, padding=padding)
+            if self.model.max_length != self.max_length:
+                raise ValueError(
+                    f"NumPy weights at {model_path} were exported for max_length="
+                    f"{self.model.max_length}, vocabulary pads to {self.max_length}"
+                )
+            self._forward = self.model.predict
+            return
+        # Imported here so the service module stays importable without TensorFlow.
+        from tensorflow import keras
+
+        self.model = keras.models.load_model(model_path, compile=False)
+        self._widths = (self.max_length,)
+        receptive_field = conv_receptive_field(self.model)
+        if receptive_field is None or not self.length_buckets:
+            self._compiled = CompiledForward(self.model, width=self.max_length)
+            self._forward = self._compiled.predict
+            return
+        self._compiled = CompiledForward(self.model)
+        predictor = BucketedPredictor(
+            self._compiled.predict,
+            max_length=self.max_length,
+            receptive_field=receptive_field,
+            padding=self.encoder.pad_type,
+            buckets=self.length_buckets,
+        )
+        self._forward = predictor.predict
+        self._widths = tuple(predictor.buckets.tolist())
+
+    def warm_up(self) -> None:
+        """Run the model at each of ``warmup_batch_sizes`` (and bucket width) once."""
+
+        if not self.available:
+            return
+        sizes = sorted({min(max(1, size), self.batch_size) for size in self.warmup_batch_sizes})
+        if self._compiled is not None:
+            self._compiled.warm_up(sizes, self._widths)
+            return
+        for size in sizes:
+            self._forward(np.zeros((size, self.max_length), dtype=np.int32))
+
+    def _run_model(self, encoded: np.ndarray) -> np.ndarray:
+        started = perf_counter()
+        chunks = [
+            np.asarray(self._forward(encoded[start : start + self.batch_size]))
+            for start in range(0, len(encoded), self.batch_size)
+        ]
+        probabilities = np.concatenate(chunks).reshape(-1).astype(np.float64)
+        self.timings.observe("model", self.backend_label, perf_counter() - started)
+        return probabilities
+
+    def predict_columns(self, texts: Sequence[str]) -> Dict[str, list]:
+        """Predictions as parallel lists keyed by ``SarcasmResponse`` field."""
+
+        if not self.available:
+            raise SarcasmUnavailable("No sarcasm model is loaded.")
+        if not texts:
+            return {name: [] for name in SarcasmResponse.model_fields}
+        started = perf_counter()
+        encoded, token_counts = self.encoder.encode(texts)
+        self.timings.observe("encode", self.backend_label, perf_counter() - started)
+        probabilities = self._run_model(encoded)
+        sarcastic = probabilities >= self.threshold
+        return {
+            "label": np.where(sarcastic, "sarcastic", "not_sarcastic").tolist(),
+            "probability": round_column(probabilities.tolist(), 4),
+            "confidence": round_column((np.abs(probabilities - 0.5) * 2).tolist(), 3),
+            "tokens_analyzed": list(token_counts),
+        }
+
+    def predict_batch(self, texts: Sequence[str]) -> List[SarcasmResponse]:
+        """Score many headlines with one encode pass and chunked model calls."""
+
+        return SarcasmResponse.from_columns(self.predict_columns(texts))
+
+    def predict(self, text: str) -> SarcasmResponse:
+        return self.predict_batch([text])[0]
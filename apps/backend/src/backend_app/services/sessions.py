@@ -0,0 +1,113 @@
+"""Persistent WebSocket scoring sessions with a per-connection pipelining window."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Optional, Set
+
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from backend_app.schemas import SentimentResponse
+from backend_app.services.executor import InferenceOverloaded
+
+logger = logging.getLogger(__name__)
+
+Submit = Callable[[str], Awaitable[SentimentResponse]]
+MIN_TEXT_LENGTH = 3
+
+
+class ScoringSession:
+    """Scores ``{"id": ..., "text": ...}`` messages from one WebSocket connection.
+
+    Results are sent as ``{"id": ..., <prediction>}`` in completion order, so a
+    slow text never holds back later ones; the client matches them by ``id``.
+    At most ``max_in_flight`` texts are scored at once. When the window is full
+    the session stops reading, which leaves further messages in the socket
+    buffers and pushes back on the client through TCP flow control.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        submit: Submit,
+        max_in_flight: int = 64,
+        on_result: Optional[Callable[[SentimentResponse], None]] = None,
+    ) -> None:
+        self.websocket = websocket
+        self.submit = submit
+        self.max_in_flight = max(1, max_in_flight)
+        self.on_result = on_result
+        self._window = asyncio.Semaphore(self.max_in_flight)
+        self._send_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def _send(self, payload: dict) -> None:
+        # Results finish concurrently; frames must still be written one at a time.
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(payload, separators=(",", ":")))
+
+    @staticmethod
+    def _parse(message: str) -> tuple[Any, Optional[str], Optional[str]]:
+        try:
+            record = json.loads(message)
+        except ValueError as exc:
+            return None, None, f"invalid JSON: {exc}"
+        if not isinstance(record, dict):
+            return None, None, "expected a JSON object"
+        text = record.get("text")
+        if not isinstance(text, str) or len(text) < MIN_TEXT_LENGTH:
+            error = f"text must be a string of at least {MIN_TEXT_LENGTH} characters"
+            return record.get("id"), None, error
+        return record.get("id"), text, None
+
+    async def _score(self, message_id: Any, text: str) -> None:
+        try:
+            try:
+                result = await self.submit(text)
+            except InferenceOverloaded as exc:
+                payload = {"id": message_id, "error": "overloaded", "retry_after": exc.retry_after}
+            except Exception:
+                logger.exception("WebSocket scoring failed for message %r", message_id)
+                payload = {"id": message_id, "error": "inference failed"}
+            else:
+                if self.on_result is not None:
+                    self.on_result(result)
+                payload = {"id": message_id, **result.model_dump()}
+            await self._send(payload)
+        except (WebSocketDisconnect, RuntimeError):
+            # The client went away; nothing is left to deliver the result to.
+            pass
+        finally:
+            self._window.release()
+
+    async def run(self) -> None:
+        """Serve the connection until the client disconnects."""
+
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                await self._window.acquire()
+                try:
+                    message = await self.websocket.receive_text()
+                except BaseException:
+                    self._window.release()
+                    raise
+                message_id, text, error = self._parse(message)
+                if error is not None:
+                    self._window.release()
+                    await self._send({"id": message_id, "error": error})
+                    continue
+                task = loop.create_task(self._score(message_id, text))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,178 @@
+"""Incremental NDJSON scoring for request bodies too large to hold in memory."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    List,
+    Optional,
+    Tuple,
+)
+
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from backend_app.schemas import SentimentRequest, SentimentResponse
+from backend_app.services.executor import InferenceOverloaded
+
+ScoreBatch = Callable[[List[str]], Awaitable[List[SentimentResponse]]]
+# (line number, caller-supplied id, text or None when the line was rejected, error)
+_Item = Tuple[int, Any, Optional[str], Optional[str]]
+
+
+class LineTooLong(ValueError):
+    """Raised when a single NDJSON record exceeds the configured byte limit."""
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], max_line_bytes: int) -> AsyncIterator[bytes]:
+    """Split a byte stream on ``\\n`` without buffering more than one line."""
+
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            yield bytes(buffer[start:end])
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise LineTooLong(f"NDJSON line exceeds {max_line_bytes} bytes")
+    if buffer:
+        yield bytes(buffer)
+
+
+def parse_record(line_number: int, line: bytes) -> _Item:
+    """Accept ``{"text": ..., "id": ...}`` objects or bare JSON strings."""
+
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        return line_number, None, None, f"invalid JSON: {exc}"
+    if isinstance(record, str):
+        record = {"text": record}
+    if not isinstance(record, dict):
+        return line_number, None, None, "expected a JSON object or string"
+    record_id = record.get("id")
+    try:
+        text = SentimentRequest.model_validate(record).text
+    except ValidationError as exc:
+        return line_number, record_id, None, exc.errors()[0]["msg"]
+    return line_number, record_id, text, None
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """``StreamingResponse`` whose body iterator may still be reading the request.
+
+    Before ASGI 2.4 Starlette polls ``receive()`` for a disconnect while the body
+    streams, which would swallow request chunks the iterator has not read yet.
+    Here the iterator is the only reader; a disconnect surfaces as
+    ``ClientDisconnect`` from ``request.stream()`` or an ``OSError`` on send.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await super().__call__(scope, receive, send)
+            return
+        try:
+            await self.stream_response(send)
+        except OSError as exc:
+            raise ClientDisconnect() from exc
+        if self.background is not None:
+            await self.background()
+
+
+def _encode(payload: dict) -> bytes:
+    return (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class NdjsonScorer:
+    """Scores NDJSON records in fixed-size micro-batches and yields NDJSON results.
+
+    Each output line carries the input ``line`` number and the caller's ``id``,
+    in input order. Malformed records produce an ``error`` line instead of
+    failing the stream. At most ``max_in_flight`` batches are being scored
+    while the next one is read, so memory is bounded by
+    ``(max_in_flight + 1) * batch_size`` records regardless of body size.
+    Batches refused by an overloaded executor are retried after a short pause:
+    response headers are already sent, so a stream can only slow down, not 503.
+    """
+
+    def __init__(
+        self,
+        score_batch: ScoreBatch,
+        batch_size: int = 256,
+        max_in_flight: int = 2,
+        max_line_bytes: int = 1 << 20,
+        overload_backoff_s: float = 0.05,
+        on_result: Optional[Callable[[SentimentResponse], None]] = None,
+    ) -> None:
+        self.score_batch = score_batch
+        self.batch_size = max(1, batch_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_line_bytes = max_line_bytes
+        self.overload_backoff_s = overload_backoff_s
+        self.on_result = on_result
+
+    async def _score(self, items: List[_Item]) -> List[bytes]:
+        texts = [text for _, _, text, _ in items if text is not None]
+        scored: List[SentimentResponse] = []
+        while texts:
+            try:
+                scored = await self.score_batch(texts)
+                break
+            except InferenceOverloaded:
+                await asyncio.sleep(self.overload_backoff_s)
+        results = iter(scored)
+        lines = []
+        for line_number, record_id, text, error in items:
+            if text is None:
+                lines.append(_encode({"line": line_number, "id": record_id, "error": error}))
+                continue
+            result = next(results)
+            if self.on_result is not None:
+                self.on_result(result)
+            lines.append(_encode({"line": line_number, "id": record_id, **result.model_dump()}))
+        return lines
+
+    async def stream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        in_flight: Deque[asyncio.Task] = deque()
+        batch: List[_Item] = []
+        line_number = 0
+        try:
+            try:
+                async for line in iter_lines(chunks, self.max_line_bytes):
+                    line_number += 1
+                    if not line.strip():
+                        continue
+                    batch.append(parse_record(line_number, line))
+                    if len(batch) < self.batch_size:
+                        continue
+                    in_flight.append(asyncio.ensure_future(self._score(batch)))
+                    batch = []
+                    while len(in_flight) > self.max_in_flight:
+                        for output in await in_flight.popleft():
+                            yield output
+            except LineTooLong as exc:
+                batch.append((line_number + 1, None, None, str(exc)))
+            if batch:
+                in_flight.append(asyncio.ensure_future(self._score(batch)))
+            while in_flight:
+                for output in await in_flight.popleft():
+                    yield output
+        finally:
+            # A client that disconnects mid-stream must not leave batches running.
+            for task in in_flight:
+                task.cancel()
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from backend_app.services.inference import SentimentService
+
+WORDS = ["great", "good", "love", "bad", "terrible", "movie", "plot", "acting", "the", "was"]
+MAX_LENGTH = 32
+
+
+@pytest.fixture(scope="session")
+def imdb_artifacts(tmp_path_factory) -> tuple[Path, Path]:
+    """Write a randomly initialised dense checkpoint and a small word index."""
+
+    pytest.importorskip("tensorflow")
+    from sentiment_package.imdb import models as imdb_models
+
+    root = tmp_path_factory.mktemp("imdb")
+    config = imdb_models.DenseModelConfig(vocab_size=10000, max_length=MAX_LENGTH)
+    model = imdb_models.build_dense_model(config)
+    model.build((None, MAX_LENGTH))
+    weights_path = root / "weights.keras"
+    model.save(weights_path)
+
+    word_index = {"PAD": 0, "START": 1, "UNK": 2}
+    word_index.update({word: idx + 3 for idx, word in enumerate(WORDS)})
+    word_index["rare"] = 20000
+    word_index_path = root / "word_index.json"
+    word_index_path.write_text(json.dumps(word_index), encoding="utf-8")
+    return weights_path, word_index_path
+
+
+@pytest.fixture(scope="session")
+def imdb_numpy_weights(imdb_artifacts) -> Path:
+    """Export the session checkpoint to the NumPy ``.npz`` format."""
+
+    from sentiment_package.imdb import models as imdb_models
+    from sentiment_package.imdb import numpy_model
+
+    weights_path, _ = imdb_artifacts
+    model = imdb_models.build_dense_model(
+        imdb_models.DenseModelConfig(vocab_size=10000, max_length=MAX_LENGTH)
+    )
+    model.build((None, MAX_LENGTH))
+    model.load_weights(str(weights_path))
+    return numpy_model.export_dense_weights(
+        model, weights_path.with_name("weights.npz"), max_length=MAX_LENGTH
+    )
+
+
+@pytest.fixture()
+def make_service(imdb_artifacts, imdb_numpy_weights) -> Callable[..., SentimentService]:
+    """Build model-backed services from the session artifacts."""
+
+    weights_path, word_index_path = imdb_artifacts
+
+    def factory(**overrides) -> SentimentService:
+        options = {"max_length": MAX_LENGTH, "word_index_path": word_index_path}
+        options.update(overrides)
+        path = imdb_numpy_weights if options.get("backend") == "numpy" else weights_path
+        return SentimentService(path, **options)
+
+    return factory
@@ -0,0 +1,137 @@
+import multiprocessing
+
+import pytest
+
+from backend_app.schemas import SentimentResponse
+from backend_app.services.analytics import SharedStatsTracker, StatsTracker, parse_window
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _response(label: str, confidence: float) -> SentimentResponse:
+    return SentimentResponse(label=label, score=0.0, confidence=confidence, tokens_analyzed=3)
+
+
+def test_parse_window() -> None:
+    assert parse_window("30s") == 30
+    assert parse_window("5m") == 300
+    assert parse_window("1h") == 3600
+    with pytest.raises(ValueError):
+        parse_window("0m")
+    with pytest.raises(ValueError):
+        parse_window("five minutes")
+
+
+def test_windows_only_count_recent_buckets() -> None:
+    clock = FakeClock()
+    tracker = StatsTracker(clock=clock)
+    tracker.record(_response("negative", 0.2))
+    clock.now += 600
+    tracker.record(_response("positive", 0.8))
+    tracker.record(_response("positive", 0.6))
+
+    recent = tracker.snapshot(300)
+    assert recent.total_requests == 2
+    assert recent.label_counts == {"positive": 2, "negative": 0, "neutral": 0}
+    assert recent.average_confidence == 0.7
+    assert recent.timeline[-1].count == 2
+
+    hour = tracker.snapshot(3600)
+    assert hour.total_requests == 3
+    assert [point.count for point in hour.timeline] == [1, 2]
+    assert sum(hour.confidence_histogram) == 3
+
+    lifetime = tracker.snapshot()
+    assert lifetime.total_requests == 3 and lifetime.window_s is None
+    assert [entry.label for entry in lifetime.recent_predictions] == [
+        "negative",
+        "positive",
+        "positive",
+    ]
+
+
+def test_ring_slots_are_reused_after_wrapping() -> None:
+    clock = FakeClock()
+    tracker = StatsTracker(second_slots=60, minute_slots=10, fine_window_s=60, clock=clock)
+    tracker.record(_response("neutral", 0.5))
+    clock.now += 60
+    tracker.record(_response("positive", 0.9))
+
+    assert tracker.snapshot(60).total_requests == 1
+    assert tracker.seconds.counts.sum() == 1
+    clock.now += 600
+    assert tracker.snapshot(600).total_requests == 0
+    with pytest.raises(ValueError):
+        tracker.snapshot(601)
+
+
+def test_record_columns_matches_individual_records() -> None:
+    clock = FakeClock()
+    single = StatsTracker(max_points=3, clock=clock)
+    batched = StatsTracker(max_points=3, clock=clock)
+    samples = [("positive", 0.9), ("negative", 0.4), ("neutral", 1.0), ("positive", 0.05)]
+    for label, confidence in samples:
+        single.record(_response(label, confidence))
+    batched.record_columns(*map(list, zip(*samples)))
+
+    assert batched.snapshot(60) == single.snapshot(60)
+    assert batched.snapshot() == single.snapshot()
+
+
+def _record_in_child(directory, labels) -> None:
+    tracker = SharedStatsTracker(directory)
+    for label in labels:
+        tracker.record(_response(label, 0.5))
+
+
+def test_shared_tracker_aggregates_across_processes(tmp_path) -> None:
+    context = multiprocessing.get_context("fork")
+    children = [
+        context.Process(target=_record_in_child, args=(tmp_path, labels))
+        for labels in (["positive", "positive"], ["negative"])
+    ]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join(10)
+        assert child.exitcode == 0
+
+    reader = SharedStatsTracker(tmp_path)
+    reader.record(_response("neutral", 0.9))
+
+    lifetime = reader.snapshot()
+    assert lifetime.label_counts == {"positive": 2, "negative": 1, "neutral": 1}
+    assert len(lifetime.recent_predictions) == 4
+    windowed = reader.snapshot(60)
+    assert windowed.total_requests == 4
+    assert sum(point.count for point in windowed.timeline) == 4
+    assert len(list(tmp_path.glob("worker-*.bin"))) == 3
+
+
+def test_shared_tracker_removes_files_of_dead_idle_workers(tmp_path) -> None:
+    clock = FakeClock()
+    stale = SharedStatsTracker(tmp_path, clock=clock)
+    stale.record(_response("positive", 0.5))
+    # Pretend the file belongs to an exited worker whose last bucket is old.
+    stale.initialize(pid=2**22 + 12345)
+    stale.minutes.epochs[0] = int(clock.now // 60) - 2000
+
+    clock.now += 2 * 86400
+    fresh = SharedStatsTracker(tmp_path, clock=clock)
+    fresh.record(_response("negative", 0.7))
+    # A second new worker finds nothing left to retire.
+    SharedStatsTracker(tmp_path, clock=clock)
+
+    assert not stale.path.exists()
+    # Lifetime totals keep the removed worker's predictions.
+    lifetime = fresh.snapshot()
+    assert lifetime.label_counts == {"positive": 1, "negative": 1, "neutral": 0}
+    assert lifetime.average_confidence == 0.6
+    assert sum(lifetime.confidence_histogram) == 2
+    assert fresh.snapshot(60).total_requests == 1
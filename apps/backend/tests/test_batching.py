@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from backend_app.schemas import SentimentResponse
+from backend_app.services.batching import MicroBatcher
+from backend_app.services.executor import DeadlineExceeded, InferenceOverloaded
+
+
+def _fake_predict(calls: list[list[str]]):
+    async def predict_batch(texts):
+        calls.append(list(texts))
+        return [
+            SentimentResponse(label="neutral", score=0.0, confidence=0.0, tokens_analyzed=len(text))
+            for text in texts
+        ]
+
+    return predict_batch
+
+
+async def _submit_all(batcher: MicroBatcher, texts: list[str]) -> list[SentimentResponse]:
+    return await asyncio.gather(*(batcher.submit(text) for text in texts))
+
+
+def test_concurrent_requests_share_batches() -> None:
+    calls: list[list[str]] = []
+    batcher = MicroBatcher(_fake_predict(calls), max_batch_size=4, max_wait_ms=50)
+    texts = [f"text {idx}" for idx in range(10)]
+
+    results = asyncio.run(_submit_all(batcher, texts))
+
+    assert [len(batch) for batch in calls] == [4, 4, 2]
+    assert [result.tokens_analyzed for result in results] == [len(text) for text in texts]
+    snapshot = batcher.snapshot()
+    assert snapshot.batch_size.count == 3
+    assert snapshot.queue_wait_ms.count == 10
+
+
+def test_batch_failure_propagates_to_every_caller() -> None:
+    async def failing(texts):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(failing, max_batch_size=8, max_wait_ms=1)
+
+    with pytest.raises(ValueError):
+        asyncio.run(_submit_all(batcher, ["a", "b"]))
+
+
+def test_submit_rejects_when_queue_is_full() -> None:
+    release = asyncio.Event()
+
+    async def slow(texts):
+        await release.wait()
+        return [SentimentResponse(label="neutral", score=0.0, confidence=0.0, tokens_analyzed=0)]
+
+    async def scenario() -> None:
+        batcher = MicroBatcher(slow, max_batch_size=1, max_wait_ms=0, max_pending=1)
+        first = asyncio.ensure_future(batcher.submit("a"))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(batcher.submit("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(InferenceOverloaded):
+            await batcher.submit("c")
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+
+
+def test_identical_in_flight_texts_share_one_result() -> None:
+    calls: list[list[str]] = []
+    batcher = MicroBatcher(_fake_predict(calls), max_batch_size=8, max_wait_ms=20)
+
+    results = asyncio.run(_submit_all(batcher, ["viral", "other", "viral", "viral"]))
+
+    assert calls == [["viral", "other"]]
+    assert results[0] is results[2] is results[3]
+    snapshot = batcher.snapshot()
+    assert (snapshot.requests, snapshot.coalesced, snapshot.coalesce_ratio) == (4, 2, 0.5)
+    assert not batcher._flights
+
+
+def test_cancelled_caller_does_not_cancel_coalesced_ones() -> None:
+    calls: list[list[str]] = []
+    batcher = MicroBatcher(_fake_predict(calls), max_batch_size=8, max_wait_ms=20)
+
+    async def scenario() -> None:
+        first = asyncio.ensure_future(batcher.submit("viral"))
+        second = asyncio.ensure_future(batcher.submit("viral"))
+        alone = asyncio.ensure_future(batcher.submit("abandoned"))
+        await asyncio.sleep(0)
+        first.cancel()
+        alone.cancel()
+        assert (await second).tokens_analyzed == len("viral")
+        assert first.cancelled() and alone.cancelled()
+
+    asyncio.run(scenario())
+
+    # Nobody is waiting for "abandoned" any more, so it is not scored.
+    assert calls == [["viral"]]
+
+
+def test_texts_past_their_deadline_are_dropped_from_the_batch() -> None:
+    calls: list[list[str]] = []
+    batcher = MicroBatcher(_fake_predict(calls), max_batch_size=8, max_wait_ms=30)
+
+    async def scenario():
+        deadline = time.monotonic() + 0.005
+        return await asyncio.gather(
+            batcher.submit("hurried", deadline=deadline),
+            batcher.submit("patient", deadline=deadline + 5),
+            # Joining the flight of a patient caller extends its deadline.
+            batcher.submit("patient", deadline=deadline),
+            return_exceptions=True,
+        )
+
+    hurried, patient, joined = asyncio.run(scenario())
+
+    assert isinstance(hurried, DeadlineExceeded)
+    assert patient == joined
+    assert calls == [["patient"]]
+    assert batcher.snapshot().expired == 1
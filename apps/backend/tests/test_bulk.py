@@ -0,0 +1,79 @@
+import functools
+import gzip
+import json
+
+import pytest
+
+from backend_app.services.bulk import CheckpointMismatch, score_corpus
+from backend_app.services.inference import SentimentService
+
+TEXTS = [
+    "I love this great movie",
+    "terrible acting and a bad plot",
+    "it was fine",
+    "amazing, happy, excited",
+    "I hate it",
+    "nothing to say here",
+    "good good good",
+]
+
+
+def _write_inputs(tmp_path):
+    jsonl = tmp_path / "reviews.jsonl"
+    lines = [json.dumps({"id": f"r{index}", "text": text}) for index, text in enumerate(TEXTS[:4])]
+    jsonl.write_text("\n".join(lines[:2] + ["", "{not json"] + lines[2:]) + "\n")
+    csv_path = tmp_path / "more.csv.gz"
+    with gzip.open(csv_path, "wt", newline="") as handle:
+        handle.write("id,text\n")
+        for index, text in enumerate(TEXTS[4:], start=4):
+            handle.write(f'r{index},"{text}"\n')
+    return [jsonl, csv_path]
+
+
+def _read_shards(output_dir):
+    rows = []
+    for shard in sorted(output_dir.glob("part-*.jsonl")):
+        rows.extend(json.loads(line) for line in shard.read_text().splitlines())
+    return rows
+
+
+def _fallback_service():
+    return functools.partial(SentimentService, None)
+
+
+def test_shards_keep_input_order_and_resume(tmp_path):
+    inputs = _write_inputs(tmp_path)
+    output = tmp_path / "scored"
+    report = score_corpus(inputs, output, _fallback_service(), chunk_size=3, workers=2)
+
+    rows = _read_shards(output)
+    assert [row["row"] for row in rows] == list(range(8))
+    assert [row["id"] for row in rows] == ["r0", "r1", None, "r2", "r3", "r4", "r5", "r6"]
+    assert "invalid JSON" in rows[2]["error"]
+    expected = SentimentService(None).predict_batch(TEXTS)
+    scored = [row for row in rows if "error" not in row]
+    assert [row["label"] for row in scored] == [prediction.label for prediction in expected]
+    assert (report.rows, report.errors, report.chunks, report.skipped_chunks) == (8, 1, 3, 0)
+    assert sum(stats.rows for stats in report.workers.values()) == 8
+    assert json.loads((output / "stats.json").read_text())["rows"] == 8
+
+    # A killed run leaves some shards behind; only the missing ones are scored again.
+    (output / "part-000001.jsonl").unlink()
+    resumed = score_corpus(inputs, output, _fallback_service(), chunk_size=3, workers=2)
+    assert (resumed.chunks, resumed.skipped_chunks) == (1, 2)
+    assert _read_shards(output) == rows
+
+
+def test_changed_settings_require_restart(tmp_path):
+    inputs = _write_inputs(tmp_path)
+    output = tmp_path / "scored"
+    score_corpus(inputs, output, _fallback_service(), chunk_size=3)
+
+    with pytest.raises(CheckpointMismatch):
+        score_corpus(inputs, output, _fallback_service(), chunk_size=4)
+    report = score_corpus(inputs, output, _fallback_service(), chunk_size=4, restart=True)
+    assert report.chunks == 2
+    assert sorted(path.name for path in output.glob("part-*")) == [
+        "part-000000.jsonl",
+        "part-000001.jsonl",
+    ]
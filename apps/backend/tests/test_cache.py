@@ -0,0 +1,67 @@
+import numpy as np
+
+from backend_app.services.cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rows(*values: int) -> np.ndarray:
+    return np.array([[value, 0, 0] for value in values], dtype=np.int32)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = PredictionCache(max_entries=2)
+    cache.bind("model-a")
+    first, second, third = cache.keys_for(_rows(1, 2, 3))
+    cache.put_many([first, second], [0.1, 0.2])
+    assert cache.get_many([first]) == [0.1]
+    cache.put_many([third], [0.3])
+
+    assert cache.get_many([first, second, third]) == [0.1, None, 0.3]
+    assert cache.evictions == 1
+
+
+def test_cache_expires_entries_after_ttl() -> None:
+    clock = FakeClock()
+    cache = PredictionCache(ttl_s=10.0, clock=clock)
+    cache.bind("model-a")
+    keys = cache.keys_for(_rows(1))
+    cache.put_many(keys, [0.7])
+
+    clock.now = 9.0
+    assert cache.get_many(keys) == [0.7]
+    clock.now = 10.5
+    assert cache.get_many(keys) == [None]
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_cache_keys_are_scoped_to_the_model_fingerprint() -> None:
+    cache = PredictionCache()
+    cache.bind("model-a")
+    keys_a = cache.keys_for(_rows(1))
+    cache.put_many(keys_a, [0.9])
+
+    cache.bind("model-b")
+    keys_b = cache.keys_for(_rows(1))
+    assert keys_a != keys_b
+    assert len(cache) == 0
+    assert cache.get_many(keys_b) == [None]
+    assert cache.invalidations == 1
+
+
+def test_writes_from_a_replaced_model_are_dropped() -> None:
+    cache = PredictionCache()
+    old_salt = cache.bind("model-a")
+    cache.bind("model-b")
+
+    stale_keys = cache.keys_for(_rows(1), old_salt)
+    cache.put_many(stale_keys, [0.9], salt=old_salt)
+    assert len(cache) == 0
+    assert cache.get_many(cache.keys_for(_rows(1))) == [None]
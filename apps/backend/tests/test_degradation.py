@@ -0,0 +1,126 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from backend_app.api.routes import get_load_shedder, get_sentiment_service
+from backend_app.main import app
+from backend_app.services.batching import MicroBatcher
+from backend_app.services.degradation import LoadShedder
+from backend_app.services.executor import InferenceExecutor
+from backend_app.services.inference import SentimentService
+
+TEXTS = ["a great and amazing film", "terrible plot", "the movie"]
+
+
+class _Load:
+    """Stands in for the executor's load signals."""
+
+    def __init__(self) -> None:
+        self.wait_s = 0.0
+        self.pending = 0
+
+    def oldest_wait_s(self) -> float:
+        return self.wait_s
+
+
+def test_shedding_switches_with_hysteresis() -> None:
+    load = _Load()
+    now = [0.0]
+    shedder = LoadShedder(
+        load, max_queue_wait_ms=200, max_in_flight=10, min_degraded_s=1.0, clock=lambda: now[0]
+    )
+
+    assert not shedder.should_shed()
+    load.wait_s = 0.25
+    assert shedder.should_shed()
+    # Under the limit but above the recovery threshold, or too soon: keep shedding.
+    load.wait_s = 0.15
+    now[0] = 2.0
+    assert shedder.should_shed()
+    load.wait_s = 0.0
+    now[0] = 2.5
+    load.pending = 6
+    assert shedder.should_shed()
+    load.pending = 5
+    assert not shedder.should_shed()
+    load.pending = 11
+    assert shedder.should_shed()
+
+    assert shedder.transitions == 2
+    assert not LoadShedder(load).should_shed()
+
+
+def test_micro_batcher_backlog_triggers_shedding() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=4)
+    release = threading.Event()
+
+    def run_batch(texts):
+        release.wait(5)
+        return list(texts)
+
+    async def predict_batch(texts):
+        return await executor.run(run_batch, texts)
+
+    batcher = MicroBatcher(predict_batch, max_batch_size=4, max_wait_ms=1, max_concurrency=1)
+    by_wait = LoadShedder(executor, max_queue_wait_ms=20, batcher=batcher)
+    by_count = LoadShedder(executor, max_in_flight=10, batcher=batcher)
+    executor_only = LoadShedder(executor, max_queue_wait_ms=20, max_in_flight=10)
+
+    async def overload():
+        tasks = [asyncio.create_task(batcher.submit(f"text {i}")) for i in range(40)]
+        await asyncio.sleep(0.05)
+        # One batch runs; the rest of the backlog sits in the batcher, not the executor.
+        seen = (executor.pending, batcher.pending)
+        decisions = [shedder.should_shed() for shedder in (by_wait, by_count, executor_only)]
+        release.set()
+        return seen, decisions, await asyncio.gather(*tasks)
+
+    try:
+        seen, decisions, results = asyncio.run(overload())
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert seen[0] == 1 and seen[1] >= 32
+    assert decisions == [True, True, False]
+    assert results == [f"text {i}" for i in range(40)]
+    assert batcher.pending == 0 and batcher.oldest_wait_s() == 0.0
+
+
+def test_degraded_predictions_use_the_fallback(make_service) -> None:
+    service = make_service()
+    fallback = SentimentService(weights_path=None)
+
+    degraded = service.predict_columns(TEXTS, degraded=True)
+    normal = service.predict_columns(TEXTS)
+
+    assert degraded["degraded"] == [True] * 3
+    assert normal["degraded"] == [False] * 3
+    assert {**degraded, "degraded": [False] * 3} == fallback.predict_columns(TEXTS)
+    # Without a model the fallback is the normal answer, not a degraded one.
+    assert fallback.predict_columns(TEXTS, degraded=True)["degraded"] == [False] * 3
+    assert [item.degraded for item in service.predict_batch(TEXTS, degraded=True)] == [True] * 3
+
+
+def test_routes_flag_degraded_responses(make_service) -> None:
+    service = make_service()
+    load = _Load()
+    load.pending = 100
+    shedder = LoadShedder(load, max_in_flight=10)
+    app.dependency_overrides[get_sentiment_service] = lambda: service
+    app.dependency_overrides[get_load_shedder] = lambda: shedder
+    try:
+        client = TestClient(app)
+        single = client.post("/api/v1/sentiment", json={"text": TEXTS[0]})
+        batch = client.post("/api/v1/sentiment/batch", json={"texts": TEXTS})
+        metrics = client.get("/api/v1/metrics/inference").json()["degradation"]
+    finally:
+        app.dependency_overrides.clear()
+
+    assert single.json()["degraded"] is True
+    assert single.json()["label"] == "positive"
+    assert [item["degraded"] for item in batch.json()["predictions"]] == [True] * 3
+    assert metrics["active"] is True
+    assert metrics["responses"] == metrics["degraded"] == 4
+    assert metrics["degraded_ratio"] == 1.0
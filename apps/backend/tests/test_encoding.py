@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from backend_app.services.encoding import BatchEncoder, tokenize
+
+WORD_INDEX = {"UNK": 2, "good": 4, "movie": 5, "bad": 6, "rare": 50}
+TEXTS = [
+    "Good movie",
+    "",
+    "!!!",
+    "bad " * 12,
+    "good rare unseen don't",
+    "movie good bad good movie",
+]
+
+
+def _reference(texts, pad_type, trunc_type, max_length):
+    """The previous per-token loop followed by Keras pad_sequences."""
+
+    sequence = pytest.importorskip("tensorflow.keras.preprocessing.sequence")
+    rows = []
+    for text in texts:
+        ids = [WORD_INDEX.get(token, 2) for token in tokenize(text)]
+        rows.append([2 if idx >= 10 else idx for idx in ids] or [2])
+    return sequence.pad_sequences(
+        rows, maxlen=max_length, padding=pad_type, truncating=trunc_type, value=0
+    )
+
+
+def test_tokenize_lowercases_letter_runs() -> None:
+    assert tokenize("Don't STOP, believin'!") == ["don't", "stop", "believin'"]
+    assert tokenize("") == []
+    # Non-ASCII letters are not matched, even when they lower-case to ASCII.
+    assert tokenize("\u212aelvin Caf\u00e9 \u0130stanbul") == ["elvin", "caf", "stanbul"]
+
+
+@pytest.mark.parametrize("pad_type", ["pre", "post"])
+@pytest.mark.parametrize("trunc_type", ["pre", "post"])
+def test_encoder_matches_pad_sequences(pad_type, trunc_type) -> None:
+    encoder = BatchEncoder(
+        WORD_INDEX,
+        unknown_token=2,
+        vocab_size=10,
+        max_length=8,
+        pad_type=pad_type,
+        trunc_type=trunc_type,
+    )
+
+    encoded, token_counts = encoder.encode(TEXTS)
+
+    assert encoded.dtype == np.int32
+    np.testing.assert_array_equal(encoded, _reference(TEXTS, pad_type, trunc_type, 8))
+    assert token_counts == [2, 0, 0, 12, 4, 5]
+    single_rows = np.vstack([encoder.encode([text])[0] for text in TEXTS])
+    np.testing.assert_array_equal(single_rows, encoded)
+
+
+def test_encoder_rejects_unknown_padding_mode() -> None:
+    with pytest.raises(ValueError):
+        BatchEncoder(WORD_INDEX, unknown_token=2, vocab_size=10, max_length=8, pad_type="middle")
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend_app.api.routes import get_inference_executor
+from backend_app.main import app
+from backend_app.services.executor import (
+    BULK,
+    DeadlineExceeded,
+    InferenceExecutor,
+    InferenceOverloaded,
+)
+
+
+def test_executor_runs_work_off_the_event_loop() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=0)
+
+    async def scenario() -> str:
+        return await executor.run(lambda: threading.current_thread().name)
+
+    assert asyncio.run(scenario()).startswith("inference")
+    assert executor.pending == 0
+
+
+def test_executor_rejects_beyond_queue_depth() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=1, retry_after_s=3)
+    gate = threading.Event()
+
+    async def scenario() -> None:
+        running = asyncio.ensure_future(executor.run(gate.wait))
+        queued = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0)
+        assert executor.queue_depth == 1
+        with pytest.raises(InferenceOverloaded) as excinfo:
+            await executor.run(gate.wait)
+        assert excinfo.value.retry_after == 3
+        gate.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(scenario())
+    assert executor.rejected == 1
+
+
+def test_interactive_lane_runs_before_queued_bulk_work() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=4)
+    gate = threading.Event()
+    order = []
+
+    def score(chunk):
+        order.extend(chunk)
+        if chunk == ["b1"]:
+            gate.wait()
+
+    async def scenario() -> None:
+        bulk = asyncio.ensure_future(executor.run_chunked(score, ["b1", "b2", "b3"], 1))
+        await asyncio.sleep(0.01)
+        queued_bulk = asyncio.ensure_future(executor.run(order.append, "q", lane=BULK))
+        interactive = asyncio.ensure_future(executor.run(order.append, "i"))
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(bulk, queued_bulk, interactive)
+
+    asyncio.run(scenario())
+    # Interactive work overtakes bulk work queued before it, and the chunked
+    # request yields between chunks.
+    assert order == ["b1", "i", "q", "b2", "b3"]
+    lanes = {lane.lane: lane for lane in executor.snapshot().lanes}
+    assert lanes["bulk"].completed == 4
+    assert lanes["interactive"].queue_wait_ms.count == 1
+
+
+def test_expired_work_is_dropped_before_running() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=4)
+    gate = threading.Event()
+    ran = []
+
+    async def scenario() -> None:
+        blocker = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0.01)
+        late = asyncio.ensure_future(
+            executor.run(ran.append, "late", deadline=time.monotonic() + 0.01)
+        )
+        await asyncio.sleep(0.05)
+        gate.set()
+        with pytest.raises(DeadlineExceeded):
+            await late
+        with pytest.raises(DeadlineExceeded):
+            await executor.run(ran.append, "expired", deadline=time.monotonic())
+        await blocker
+
+    asyncio.run(scenario())
+    assert ran == []
+    assert executor.lanes["interactive"].expired == 2
+    assert executor.pending == 0
+
+
+def test_lanes_have_separate_queue_limits() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=1, bulk_max_queue=0)
+    gate = threading.Event()
+
+    async def scenario() -> None:
+        running = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(InferenceOverloaded):
+            await executor.run(gate.wait, lane=BULK)
+        # A full bulk lane leaves room for interactive work.
+        queued = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0.01)
+        assert executor.queue_depth == 1
+        gate.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(scenario())
+    assert executor.lanes["bulk"].rejected == 1
+    assert executor.rejected == 1
+
+
+def test_routes_honour_deadline_and_priority_headers() -> None:
+    client = TestClient(app)
+    payload = {"texts": ["Great launch", "This is terrible"]}
+
+    expired = client.post("/api/v1/sentiment/batch", json=payload, headers={"X-Deadline-Ms": "0"})
+    single = client.post(
+        "/api/v1/sentiment", json={"text": "Great launch"}, headers={"X-Deadline-Ms": "-1"}
+    )
+    bulk = client.post(
+        "/api/v1/sentiment/batch",
+        json=payload,
+        headers={"X-Priority": "bulk", "X-Deadline-Ms": "5000"},
+    )
+    invalid = client.post("/api/v1/sentiment/batch", json=payload, headers={"X-Priority": "now"})
+    metrics = client.get("/api/v1/metrics/inference").json()
+
+    assert expired.status_code == 504
+    assert single.status_code == 504
+    assert bulk.status_code == 200
+    assert len(bulk.json()["predictions"]) == 2
+    assert invalid.status_code == 422
+    assert [lane["lane"] for lane in metrics["executor"]["lanes"]] == ["interactive", "bulk"]
+    assert metrics["batching"]["expired"] >= 1
+
+
+class _SaturatedExecutor(InferenceExecutor):
+    async def run(self, fn, *args, **kwargs):
+        raise InferenceOverloaded(7)
+
+
+def test_batch_endpoint_returns_503_with_retry_after_when_saturated() -> None:
+    app.dependency_overrides[get_inference_executor] = lambda: _SaturatedExecutor()
+    try:
+        response = TestClient(app).post("/api/v1/sentiment/batch", json={"texts": ["Great launch"]})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
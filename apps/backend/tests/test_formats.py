@@ -0,0 +1,122 @@
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend_app.api import formats
+from backend_app.api.formats import COLUMNAR_JSON, JSON, MSGPACK, negotiate, render
+from backend_app.api.routes import get_sentiment_service
+from backend_app.core.config import get_settings
+from backend_app.main import app
+from backend_app.schemas import SentimentBatchResponse, SentimentResponse
+from backend_app.services.inference import SentimentService
+
+TEXTS = ["Great launch", "This is terrible", "Great launch", "an ordinary plot twist"]
+client = TestClient(app)
+
+
+@pytest.fixture()
+def fallback_service():
+    service = SentimentService(weights_path=None)
+    app.dependency_overrides[get_sentiment_service] = lambda: service
+    yield service
+    app.dependency_overrides.clear()
+
+
+def _post(body: bytes, **headers: str):
+    return client.post(
+        "/api/v1/sentiment/batch",
+        content=body,
+        headers={"Content-Type": "application/json", **headers},
+    )
+
+
+def test_negotiate_prefers_quality_then_specificity() -> None:
+    assert negotiate(None) == JSON
+    assert negotiate("*/*") == JSON
+    assert negotiate("application/*") == JSON
+    assert negotiate(f"{COLUMNAR_JSON}, application/json;q=0.9") == COLUMNAR_JSON
+    assert negotiate(f"application/json;q=0.5, {COLUMNAR_JSON};q=0.8") == COLUMNAR_JSON
+    # The specific range outranks the wildcard that would otherwise allow JSON.
+    assert negotiate(f"*/*, application/json;q=0, {COLUMNAR_JSON};q=0.1") == COLUMNAR_JSON
+    assert negotiate("text/html") is None
+    assert negotiate("application/json;q=0") is None
+
+
+def test_negotiate_offers_msgpack_only_when_installed(monkeypatch) -> None:
+    monkeypatch.setattr(formats, "msgpack", None)
+
+    assert negotiate(MSGPACK) is None
+    assert negotiate(f"{MSGPACK}, application/json;q=0.1") == JSON
+
+
+def test_render_layouts_agree(fallback_service) -> None:
+    columns = fallback_service.predict_columns(TEXTS)
+
+    rows = json.loads(render(columns, JSON).body)
+    columnar = json.loads(render(columns, COLUMNAR_JSON).body)
+
+    expected = SentimentBatchResponse(predictions=fallback_service.predict_batch(TEXTS))
+    assert rows == expected.model_dump()
+    assert SentimentResponse.from_columns(columnar) == expected.predictions
+
+
+def test_batch_endpoint_negotiates_layout(fallback_service) -> None:
+    body = json.dumps({"texts": TEXTS}).encode()
+
+    default = _post(body)
+    columnar = _post(body, Accept=COLUMNAR_JSON)
+    refused = _post(body, Accept="text/html")
+
+    assert default.headers["content-type"] == JSON
+    assert default.headers["vary"] == "Accept"
+    assert default.json() == {
+        "predictions": [item.model_dump() for item in fallback_service.predict_batch(TEXTS)]
+    }
+    assert columnar.headers["content-type"] == COLUMNAR_JSON
+    assert columnar.json() == fallback_service.predict_columns(TEXTS)
+    assert refused.status_code == 406
+
+
+def test_batch_endpoint_serves_msgpack(fallback_service) -> None:
+    msgpack = pytest.importorskip("msgpack")
+
+    response = _post(json.dumps({"texts": TEXTS}).encode(), Accept="application/x-msgpack")
+
+    assert response.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == fallback_service.predict_columns(TEXTS)
+
+
+def test_batch_endpoint_decodes_gzip_bodies(fallback_service) -> None:
+    body = json.dumps({"texts": TEXTS}).encode()
+    # Concatenated gzip members decode as one body.
+    compressed = gzip.compress(body[:10]) + gzip.compress(body[10:])
+
+    plain = _post(body)
+    decoded = _post(compressed, **{"Content-Encoding": "gzip"})
+
+    assert decoded.status_code == 200
+    assert decoded.json() == plain.json()
+    assert _post(body, **{"Content-Encoding": "br"}).status_code == 415
+    assert _post(b"not gzip", **{"Content-Encoding": "gzip"}).status_code == 400
+    assert _post(compressed[:-8], **{"Content-Encoding": "gzip"}).status_code == 400
+
+
+def test_decompressed_body_limit(fallback_service, monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "max_decompressed_body_mb", 1 / 1024)
+    # Compresses to a few bytes but expands past the 1 KiB limit.
+    body = json.dumps({"texts": ["a good film " * 200]}).encode()
+
+    response = _post(gzip.compress(body), **{"Content-Encoding": "gzip"})
+
+    assert response.status_code == 413
+
+
+def test_batch_endpoint_decodes_zstd_bodies(fallback_service) -> None:
+    zstandard = pytest.importorskip("zstandard")
+    body = json.dumps({"texts": TEXTS}).encode()
+
+    response = _post(zstandard.ZstdCompressor().compress(body), **{"Content-Encoding": "zstd"})
+
+    assert response.json() == _post(body).json()
@@ -1,6 +1,28 @@
+import time
+
+import numpy as np
 from fastapi.testclient import TestClient
 
+from backend_app.api.routes import get_model_registry
 from backend_app.main import app
+from backend_app.services.registry import ModelRegistry, ModelSpec
+
+
+class _Model:
+    def __init__(self, nbytes: int) -> None:
+        self.weights_array = np.zeros(nbytes, dtype=np.uint8)
+
+
+class _Service:
+    def __init__(self, nbytes: int = 0) -> None:
+        self.model = _Model(nbytes)
+        self.warm_ups = 0
+
+    def warm_up(self) -> None:
+        self.warm_ups += 1
+
+    def predict_batch(self, texts):
+        return list(texts)
 
 
 def test_live_health() -> None:
@@ -10,8 +32,69 @@ def test_live_health() -> None:
     assert response.json()["status"] == "ok"
 
 
-def test_ready_health() -> None:
-    client = TestClient(app)
-    response = client.get("/api/health/ready")
-    assert response.status_code == 200
+def test_ready_health_waits_for_warm_up() -> None:
+    service = _Service()
+    registry = ModelRegistry()
+    registry.register(ModelSpec("sentiment", lambda: service))
+    app.dependency_overrides[get_model_registry] = lambda: registry
+    try:
+        client = TestClient(app)
+        before = client.get("/api/health/ready")
+        assert registry.warm_all() == ["sentiment"]
+        after = client.get("/api/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert before.status_code == 503
+    assert before.json() == {"status": "warming_up", "models": {"sentiment": False}}
+    assert after.status_code == 200
+    assert after.json() == {"status": "ready", "models": {"sentiment": True}}
+    assert service.warm_ups == 1
+
+
+def test_ready_health_with_a_memory_budget(tmp_path) -> None:
+    builds: list = []
+
+    def factory(name):
+        def build():
+            builds.append(name)
+            return _Service(nbytes=2**20)
+
+        return build
+
+    registry = ModelRegistry(memory_budget_bytes=int(1.5 * 2**20))
+    for name in ("sentiment", "sarcasm"):
+        weights = tmp_path / f"{name}.npz"
+        weights.write_bytes(bytes(2**20))
+        registry.register(ModelSpec(name, factory(name), (weights,)))
+    app.dependency_overrides[get_model_registry] = lambda: registry
+    try:
+        client = TestClient(app)
+        before = client.get("/api/health/ready")
+        registry.warm_all()
+        warmed = client.get("/api/health/ready")
+        built_at_startup = list(builds)
+        # Loading the deferred model evicts the other; both still serve warm.
+        registry.get("sarcasm")
+        swapped = client.get("/api/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert before.status_code == 503
+    # Only the first model fits, so warm-up defers the second instead of evicting.
+    assert built_at_startup == ["sentiment"]
+    assert warmed.status_code == swapped.status_code == 200
+    assert swapped.json()["models"] == {"sentiment": True, "sarcasm": True}
+    assert registry.peek("sentiment") is None
+
+
+def test_startup_warms_models_until_ready() -> None:
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 60
+        response = client.get("/api/health/ready")
+        while response.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            response = client.get("/api/health/ready")
+
     assert response.json()["status"] == "ready"
+    assert set(response.json()["models"]) == {"sentiment", "sarcasm"}
@@ -0,0 +1,178 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from backend_app.services.cache import PredictionCache
+from backend_app.services.dedup import DedupStats, unique_rows
+from backend_app.services.inference import SentimentService
+
+TEXTS = [
+    "I love this great movie",
+    "The plot was terrible and the acting bad",
+    "rare words only",
+    "",
+    "good " * 100,
+]
+
+
+def test_predict_batch_matches_single_predictions(make_service) -> None:
+    service = make_service(batch_size=2)
+    assert service.use_model
+
+    batch = service.predict_batch(TEXTS)
+
+    assert batch == [service.predict(text) for text in TEXTS]
+    assert [item.tokens_analyzed for item in batch] == [5, 8, 3, 0, 100]
+
+
+@pytest.mark.parametrize("skip_padding", [False, True])
+def test_numpy_backend_matches_keras_backend(make_service, skip_padding) -> None:
+    keras_service = make_service()
+    numpy_service = make_service(backend="numpy", skip_padding=skip_padding)
+    assert numpy_service.use_model
+
+    encoded, _ = keras_service._encode_batch(TEXTS)
+
+    np.testing.assert_allclose(
+        numpy_service._run_model(encoded), keras_service._run_model(encoded), atol=1e-6
+    )
+
+
+def test_warm_up_traces_once_and_matches_keras(make_service) -> None:
+    service = make_service(batch_size=16, warmup_batch_sizes=[1, 8, 64])
+    encoded, _ = service._encode_batch(TEXTS)
+
+    service.warm_up()
+    scores = service._run_model(encoded)
+
+    expected = service.model.predict_on_batch(encoded).reshape(-1)
+    np.testing.assert_allclose(scores, expected, atol=1e-6)
+    assert service._compiled._forward.experimental_get_tracing_count() == 1
+    # Fallback services have nothing to warm.
+    SentimentService(weights_path=None).warm_up()
+
+
+def test_conv_architecture_buckets_by_length(imdb_artifacts, tmp_path) -> None:
+    from sentiment_package.imdb import models as imdb_models
+
+    _, word_index_path = imdb_artifacts
+    model = imdb_models.build_conv_model(
+        imdb_models.ConvModelConfig(vocab_size=10000, max_length=32)
+    )
+    model.build((None, 32))
+    weights_path = tmp_path / "conv.keras"
+    model.save(weights_path)
+
+    def conv_service(**options) -> SentimentService:
+        options = {"max_length": 32, "word_index_path": word_index_path, **options}
+        return SentimentService(weights_path, architecture="conv", **options)
+
+    bucketed = conv_service(length_buckets=(8, 16))
+    full = conv_service(length_buckets=())
+    encoded, _ = bucketed._encode_batch(TEXTS)
+
+    np.testing.assert_allclose(bucketed._run_model(encoded), full._run_model(encoded), atol=1e-6)
+    assert bucketed.fingerprint != SentimentService(
+        imdb_artifacts[0], max_length=32, word_index_path=word_index_path
+    ).fingerprint
+    with pytest.raises(ValueError):
+        conv_service(backend="numpy")
+
+
+def test_compiled_vocabulary_matches_json_word_index(
+    make_service, imdb_artifacts, tmp_path
+) -> None:
+    from sentiment_package.vocab import compile_vocabulary
+
+    _, word_index_path = imdb_artifacts
+    word_index = json.loads(word_index_path.read_text(encoding="utf-8"))
+    vocab_path = compile_vocabulary(word_index, tmp_path / "vocab.bin", vocab_size=10000)
+
+    compiled_service = make_service(backend="numpy", vocab_path=vocab_path)
+
+    assert len(compiled_service.word_index) == len(word_index) - 1
+    json_service = make_service(backend="numpy")
+    assert compiled_service.predict_batch(TEXTS) == json_service.predict_batch(TEXTS)
+
+
+def test_scores_round_like_single_predictions() -> None:
+    # Halfway cases, where np.round and Python's round() disagree.
+    probabilities = np.array([0.5 + k / 2000 + 0.00025 for k in range(-1000, 1000)])
+    signed = [(probability - 0.5) * 2 for probability in probabilities.tolist()]
+
+    columns = SentimentService(weights_path=None)._to_columns(probabilities, [1] * len(signed))
+
+    assert columns["score"] == [round(score, 3) for score in signed]
+    assert columns["confidence"] == [round(min(1.0, abs(score)), 3) for score in signed]
+
+
+def test_predict_batch_uses_fallback_without_weights() -> None:
+    service = SentimentService(weights_path=None)
+
+    batch = service.predict_batch(["Great launch", "This is terrible"])
+
+    assert [item.label for item in batch] == ["positive", "negative"]
+    assert service.predict_batch([]) == []
+
+
+def test_fallback_startup_does_not_import_tensorflow(tmp_path) -> None:
+    probe = (
+        "import sys, backend_app.main\n"
+        "from backend_app.api.routes import get_sentiment_service\n"
+        "assert not get_sentiment_service().use_model\n"
+        "assert 'tensorflow' not in sys.modules, 'tensorflow imported'\n"
+    )
+    env = dict(os.environ, SENTIMENT_BACKEND_IMDB_WEIGHTS_PATH=str(tmp_path / "missing"))
+
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], env=env, capture_output=True, text=True
+    )
+
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_prediction_cache_serves_repeated_texts(make_service) -> None:
+    cache = PredictionCache()
+    service = make_service(backend="numpy", cache=cache)
+    uncached = make_service(backend="numpy")
+    texts = ["great movie", "bad plot", "great movie"]
+
+    first = service.predict_batch(texts)
+    second = service.predict_batch(["Great movie!", "the acting"])
+
+    assert first == uncached.predict_batch(texts)
+    assert second == uncached.predict_batch(["Great movie!", "the acting"])
+    # The repeat inside the first batch is deduplicated before the cache lookup.
+    assert cache.hits == 1 and cache.misses == 3
+    assert service.fingerprint and service.fingerprint.startswith("numpy|")
+
+
+def test_unique_rows_keeps_first_occurrences_in_order() -> None:
+    encoded = np.array([[3, 0], [1, 2], [3, 0], [1, 2], [5, 5]], dtype=np.int32)
+
+    first, inverse = unique_rows(encoded)
+
+    assert first.tolist() == [0, 1, 4]
+    assert inverse.tolist() == [0, 1, 0, 1, 2]
+    np.testing.assert_array_equal(encoded[first][inverse], encoded)
+
+
+def test_repeated_rows_are_scored_once(make_service) -> None:
+    stats = DedupStats()
+    service = make_service(backend="numpy", dedup_stats=stats)
+    scored = []
+    run_model = service._run_model
+    service._run_model = lambda encoded: scored.append(len(encoded)) or run_model(encoded)
+    # "Great movie!" encodes to the same row as "great movie".
+    texts = ["great movie", "bad plot", "Great movie!", "great movie", "the acting"]
+
+    batch = service.predict_batch(texts)
+
+    assert scored == [3]
+    assert batch == [service.predict(text) for text in texts]
+    assert (stats.rows, stats.unique_rows) == (10, 8)
+    assert stats.snapshot().dedup_ratio == 0.2
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from backend_app.schemas import SentimentResponse
+from backend_app.services.encoding import tokenize
+from backend_app.services.inference import SentimentService
+from backend_app.services.lexicon import (
+    DEFAULT_LEXICON,
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    LexiconScorer,
+    load_lexicon,
+)
+
+
+def _keyword_heuristic(text: str) -> SentimentResponse:
+    """The fallback as it was scored one text at a time with two keyword sets."""
+
+    tokens = tokenize(text)
+    pos = sum(1 for token in tokens if token in POSITIVE_WORDS)
+    neg = sum(1 for token in tokens if token in NEGATIVE_WORDS)
+    score = (pos - neg) / max(1, pos + neg) if pos or neg else 0.0
+    label = "positive" if score > 0.15 else "negative" if score < -0.15 else "neutral"
+    confidence = min(1.0, abs(score))
+    if len(tokens) < 4:
+        confidence *= 0.6
+    return SentimentResponse(
+        label=label,
+        score=round(score, 3),
+        confidence=round(confidence, 3),
+        tokens_analyzed=len(tokens),
+    )
+
+
+def test_default_lexicon_matches_keyword_heuristic() -> None:
+    rng = random.Random(7)
+    words = sorted(DEFAULT_LEXICON) + ["the", "movie", "was", "Plot", "GOOD", "don't"]
+    texts = ["", "!!!", "good", "bad good", "love hate sad"] + [
+        " ".join(rng.choice(words) for _ in range(rng.randint(1, 40))) for _ in range(300)
+    ]
+
+    batch = SentimentService(weights_path=None).predict_batch(texts)
+
+    assert batch == [_keyword_heuristic(text) for text in texts]
+
+
+def test_weights_scale_the_net_polarity() -> None:
+    scorer = LexiconScorer({"superb": 3.0, "meh": -0.5, "dull": -1.0})
+
+    net, mass = scorer.totals([["superb", "meh", "plot"], ["meh"], [], ["dull", "superb"]])
+    responses = scorer.responses([["superb", "meh", "plot"], ["meh"]])
+
+    assert net.tolist() == [2.5, -0.5, 0.0, 2.0]
+    assert mass.tolist() == [3.5, 0.5, 0.0, 4.0]
+    # A lone weak word keeps its own weight instead of saturating to -1.
+    assert [item.score for item in responses] == [0.714, -0.5]
+    assert [item.label for item in responses] == ["positive", "negative"]
+
+
+def test_load_lexicon_reads_text_and_json(tmp_path) -> None:
+    text_path = tmp_path / "lexicon.txt"
+    text_path.write_text("# word weight [std ratings]\n\nSuperb\t3.1\t0.5\t[3, 3]\nmeh -0.4\n")
+    json_path = tmp_path / "lexicon.json"
+    json_path.write_text('{"Superb": 3.1, "meh": -0.4}')
+
+    assert load_lexicon(text_path) == {"superb": 3.1, "meh": -0.4}
+    assert load_lexicon(json_path) == {"superb": 3.1, "meh": -0.4}
+
+    text_path.write_text("superb\n")
+    with pytest.raises(ValueError, match="lexicon.txt:1"):
+        load_lexicon(text_path)
+
+
+def test_service_scores_with_configured_lexicon(tmp_path) -> None:
+    lexicon_path = tmp_path / "lexicon.txt"
+    lexicon_path.write_text("superb 2\ndreadful -2\n")
+
+    service = SentimentService(weights_path=None, lexicon_path=lexicon_path)
+    broken = SentimentService(weights_path=None, lexicon_path=tmp_path / "missing.txt")
+
+    assert len(service.lexicon) == 2
+    assert [item.label for item in service.predict_batch(["a superb film", "great"])] == [
+        "positive",
+        "neutral",
+    ]
+    assert len(broken.lexicon) == len(DEFAULT_LEXICON)
+    assert broken.predict("great").label == "positive"
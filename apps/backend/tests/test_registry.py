@@ -0,0 +1,242 @@
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend_app.api import routes
+from backend_app.api.routes import get_model_registry
+from backend_app.core.config import get_settings
+from backend_app.main import app
+from backend_app.services.registry import (
+    WARMUP_TEXTS,
+    ModelRegistry,
+    ModelSpec,
+    service_nbytes,
+)
+
+MB = 2**20
+
+
+class _Model:
+    def __init__(self, nbytes: int) -> None:
+        self.weights_array = np.zeros(nbytes, dtype=np.uint8)
+
+
+class _Service:
+    def __init__(self, tag: str, nbytes: int = MB, on_warm_up=None) -> None:
+        self.tag = tag
+        self.model = _Model(nbytes)
+        self.on_warm_up = on_warm_up
+        self.scored: list[list[str]] = []
+        self.activations = 0
+
+    def predict_batch(self, texts):
+        if self.on_warm_up is not None:
+            self.on_warm_up(self)
+        self.scored.append(list(texts))
+        return [self.tag for _ in texts]
+
+    def activate(self) -> None:
+        self.activations += 1
+
+
+def _factory(tag: str, builds: list, **options):
+    def build():
+        builds.append(tag)
+        return _Service(f"{tag}-{len(builds)}", **options)
+
+    return build
+
+
+def test_models_load_lazily_once():
+    builds: list = []
+    registry = ModelRegistry()
+    registry.register(ModelSpec("a", _factory("a", builds)))
+
+    assert builds == []
+    first = registry.get("a")
+    assert registry.get("a") is first
+    assert builds == ["a"]
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_least_recently_used_model_is_evicted_over_budget():
+    builds: list = []
+    registry = ModelRegistry(memory_budget_bytes=int(2.5 * MB))
+    for name in "abc":
+        registry.register(ModelSpec(name, _factory(name, builds)))
+
+    a = registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+
+    status = {model.name: model for model in registry.snapshot().models}
+    assert not status["b"].loaded and status["b"].evictions == 1
+    assert status["a"].loaded and status["c"].loaded
+    assert registry.snapshot().memory_mb == 2.0
+    # Evicted for the budget, "b" still counts as ready.
+    assert registry.ready() == {"a": True, "b": True, "c": True}
+    # The evicted model is rebuilt and warmed on its next use; references held
+    # elsewhere keep working.
+    assert a.predict_batch(["x"]) == ["a-1"]
+    rebuilt = registry.get("b")
+    assert builds == ["a", "b", "c", "b"]
+    assert rebuilt.scored[:2] == [list(WARMUP_TEXTS), list(WARMUP_TEXTS[:1])]
+    assert registry.ready()["b"]
+
+
+def test_reload_warms_up_before_swapping():
+    builds: list = []
+    registry = ModelRegistry()
+    seen_during_warm_up = []
+
+    def build():
+        builds.append("a")
+        if len(builds) == 1:
+            return _Service("old")
+        return _Service("new", on_warm_up=lambda _: seen_during_warm_up.append(registry.get("a")))
+
+    registry.register(ModelSpec("a", build))
+    old = registry.get("a")
+    new = registry.reload("a")
+
+    assert seen_during_warm_up and all(service is old for service in seen_during_warm_up)
+    assert registry.get("a") is new
+    assert old.predict_batch(["still served"]) == ["old"]
+    status = registry.snapshot().models[0]
+    assert (status.version, status.swaps, status.loads) == (2, 1, 2)
+
+
+def test_failed_reload_keeps_the_current_version():
+    calls = {"n": 0}
+
+    def build():
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise OSError("truncated checkpoint")
+        return _Service("old")
+
+    registry = ModelRegistry()
+    registry.register(ModelSpec("a", build))
+    old = registry.get("a")
+
+    with pytest.raises(OSError):
+        registry.reload("a")
+    assert registry.get("a") is old
+    assert old.activations == 1
+    status = registry.snapshot().models[0]
+    assert status.failures == 1 and "truncated checkpoint" in status.last_error
+
+
+def test_failed_loads_are_retried_after_a_backoff():
+    now = [0.0]
+    failures = {"a": 1, "b": 2}
+
+    def factory(name):
+        def build():
+            if failures[name]:
+                failures[name] -= 1
+                raise OSError("volume not mounted")
+            return _Service(name)
+
+        return build
+
+    registry = ModelRegistry(clock=lambda: now[0])
+    for name in "ab":
+        registry.register(ModelSpec(name, factory(name)))
+
+    assert registry.warm_all() == []
+    assert registry.ready() == {"a": False, "b": False}
+    assert registry.retry_failed() == []
+    now[0] = 5.0
+    # "b" fails again and backs off for 10 s.
+    assert registry.retry_failed() == ["a"]
+    now[0] = 14.0
+    assert registry.retry_failed() == []
+    now[0] = 15.0
+    assert registry.retry_failed() == ["b"]
+    assert registry.ready() == {"a": True, "b": True}
+
+
+def test_sighup_reload_retries_failed_loads_without_backoff():
+    failures = [1]
+
+    def build():
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError("volume not mounted")
+        return _Service("a")
+
+    registry = ModelRegistry(clock=lambda: 0.0)
+    registry.register(ModelSpec("a", build))
+
+    assert registry.warm_all() == []
+    assert registry.reload_loaded() == ["a"]
+    assert registry.ready() == {"a": True}
+
+
+def test_changed_files_reload_once_they_settle(tmp_path):
+    weights = tmp_path / "weights.bin"
+    weights.write_bytes(b"v1")
+    builds: list = []
+    registry = ModelRegistry()
+    registry.register(ModelSpec("a", _factory("a", builds), paths=(weights,)))
+    registry.get("a")
+
+    assert registry.check_for_changes() == []
+    weights.write_bytes(b"v2-longer")
+    stat = weights.stat()
+    os.utime(weights, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.check_for_changes() == []
+    assert registry.check_for_changes() == ["a"]
+    assert registry.check_for_changes() == []
+    assert builds == ["a", "a"]
+
+
+def test_service_nbytes_counts_model_weights(make_service):
+    keras_service = make_service()
+    assert service_nbytes(keras_service) == keras_service.model.count_params() * 4
+    numpy_service = make_service(backend="numpy")
+    assert service_nbytes(numpy_service) >= numpy_service.model.embedding.nbytes
+    assert service_nbytes(_Service("x", nbytes=123)) == 123
+
+
+def test_admin_reload_route(monkeypatch):
+    builds: list = []
+    registry = ModelRegistry()
+    registry.register(ModelSpec("sentiment", _factory("sentiment", builds)))
+    app.dependency_overrides[get_model_registry] = lambda: registry
+    client = TestClient(app)
+    try:
+        assert client.post("/api/admin/models/sentiment/reload").status_code == 403
+        monkeypatch.setattr(get_settings(), "admin_token", "secret")
+        response = client.post(
+            "/api/admin/models/sentiment/reload", headers={"X-Admin-Token": "wrong"}
+        )
+        assert response.status_code == 401
+
+        headers = {"X-Admin-Token": "secret"}
+        assert client.post("/api/admin/models/nope/reload", headers=headers).status_code == 404
+        response = client.post("/api/admin/models/sentiment/reload", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["version"] == 1
+        assert builds == ["sentiment"]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_request_timing_labels_never_load_models(monkeypatch):
+    builds: list = []
+    registry = ModelRegistry()
+    registry.register(ModelSpec("sentiment", _factory("sentiment", builds)))
+    registry.register(ModelSpec("sarcasm", _factory("sarcasm", builds)))
+    monkeypatch.setattr(routes, "get_model_registry", lambda: registry)
+    client = TestClient(app)
+
+    assert client.get("/api/v1/metrics/prometheus").status_code == 200
+    assert routes.sarcasm_router.routes[0].backend_label() == "unloaded"
+    assert builds == []
+    assert registry.peek("sentiment") is None and registry.peek("sarcasm") is None
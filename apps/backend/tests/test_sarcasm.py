@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend_app.api.routes import get_sarcasm_batcher, get_sarcasm_service
+from backend_app.main import app
+from backend_app.schemas import SarcasmResponse
+from backend_app.services.batching import MicroBatcher
+from backend_app.services.sarcasm import SarcasmService
+
+HEADLINES = [
+    "Area man thrilled to attend 4th meeting of the day",
+    "Scientists discover new species of frog in Brazil",
+    "Nation's dads announce plan to 'just rest their eyes' for a bit",
+    "",
+    "meeting " * 40,
+]
+
+
+@pytest.fixture(scope="module")
+def sarcasm_artifacts(tmp_path_factory):
+    """Fit a tiny tokenizer and save an untrained dense sarcasm model."""
+
+    pytest.importorskip("tensorflow")
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    from sentiment_package.sarcasm import data as sarcasm_data
+    from sentiment_package.sarcasm import models as sarcasm_models
+
+    config = sarcasm_data.SarcasmDatasetConfig(vocab_size=20)
+    tokenizer = Tokenizer(num_words=config.vocab_size, oov_token=config.oov_token)
+    tokenizer.fit_on_texts(HEADLINES[:3] + ["area man meeting meeting day day day"])
+    root = tmp_path_factory.mktemp("sarcasm")
+    vocab_path = sarcasm_data.save_tokenizer(tokenizer, root / "vocab.bin", config)
+
+    model = sarcasm_models.build_dense_model(
+        sarcasm_models.DenseSarcasmConfig(
+            vocab_size=config.vocab_size, embedding_dim=8, max_length=config.max_length
+        )
+    )
+    model.build((None, config.max_length))
+    model_path = root / "model.keras"
+    model.save(model_path)
+
+    expected_inputs = pad_sequences(
+        tokenizer.texts_to_sequences(HEADLINES),
+        maxlen=config.max_length,
+        padding=config.padding_type,
+        truncating=config.trunc_type,
+    )
+    expected = model.predict(expected_inputs, verbose=0).reshape(-1)
+    return model_path, vocab_path, expected_inputs, expected
+
+
+def test_sarcasm_service_matches_keras_tokenizer(sarcasm_artifacts) -> None:
+    model_path, vocab_path, expected_inputs, expected = sarcasm_artifacts
+    service = SarcasmService(model_path, vocab_path)
+
+    encoded, _ = service.encoder.encode(HEADLINES)
+    predictions = service.predict_batch(HEADLINES)
+
+    np.testing.assert_array_equal(encoded, expected_inputs)
+    np.testing.assert_allclose(
+        [prediction.probability for prediction in predictions], expected, atol=1e-4
+    )
+    assert predictions[0] == service.predict(HEADLINES[0])
+
+
+def test_sarcasm_routes_score_with_loaded_model(sarcasm_artifacts) -> None:
+    model_path, vocab_path, _, expected = sarcasm_artifacts
+    service = SarcasmService(model_path, vocab_path)
+
+    async def predict_batch(texts):
+        return service.predict_batch(texts)
+
+    app.dependency_overrides[get_sarcasm_service] = lambda: service
+    app.dependency_overrides[get_sarcasm_batcher] = lambda: MicroBatcher(predict_batch)
+    try:
+        client = TestClient(app)
+        single = client.post("/api/v1/sarcasm", json={"text": HEADLINES[0]})
+        batch = client.post("/api/v1/sarcasm/batch", json={"texts": HEADLINES[:3]})
+        columnar = client.post(
+            "/api/v1/sarcasm/batch",
+            json={"texts": HEADLINES[:3]},
+            headers={"Accept": "application/vnd.sentiment.columns+json"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert single.status_code == 200
+    assert single.json()["probability"] == pytest.approx(expected[0], abs=1e-4)
+    assert [item["label"] for item in batch.json()["predictions"]] == [
+        "sarcastic" if probability >= 0.5 else "not_sarcastic" for probability in expected[:3]
+    ]
+    assert SarcasmResponse.from_columns(columnar.json()) == [
+        SarcasmResponse(**item) for item in batch.json()["predictions"]
+    ]
+
+
+def test_sarcasm_routes_return_503_without_model(tmp_path) -> None:
+    service = SarcasmService(tmp_path / "missing.keras", tmp_path / "missing.bin")
+    app.dependency_overrides[get_sarcasm_service] = lambda: service
+    try:
+        client = TestClient(app)
+        single = client.post("/api/v1/sarcasm", json={"text": "Area man wins"})
+        batch = client.post("/api/v1/sarcasm/batch", json={"texts": ["Area man wins"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert single.status_code == 503
+    assert batch.status_code == 503
+
+
+@pytest.mark.parametrize(("precision", "atol"), [("float32", 1e-4), ("int8", 2e-2)])
+def test_sarcasm_numpy_backend_serves_exported_weights(
+    sarcasm_artifacts, tmp_path, precision, atol
+) -> None:
+    from tensorflow import keras
+
+    from sentiment_package.imdb import numpy_model
+
+    model_path, vocab_path, _, expected = sarcasm_artifacts
+    model = keras.models.load_model(model_path, compile=False)
+    npz_path = numpy_model.export_dense_weights(
+        model, tmp_path / "weights.npz", max_length=32, precision=precision
+    )
+    service = SarcasmService(npz_path, vocab_path, backend="numpy")
+
+    predictions = service.predict_batch(HEADLINES)
+    assert service.backend_label == "sarcasm-numpy"
+    np.testing.assert_allclose(
+        [prediction.probability for prediction in predictions], expected, atol=atol
+    )
+
+
+def test_sarcasm_conv_model_is_bucketed_by_length(sarcasm_artifacts, tmp_path) -> None:
+    from sentiment_package.sarcasm import models as sarcasm_models
+
+    _, vocab_path, expected_inputs, _ = sarcasm_artifacts
+    model = sarcasm_models.build_conv_model(
+        sarcasm_models.ConvSarcasmConfig(vocab_size=20, embedding_dim=8, conv_filters=8)
+    )
+    model.build((None, 32))
+    model_path = tmp_path / "conv.keras"
+    model.save(model_path)
+
+    service = SarcasmService(model_path, vocab_path, length_buckets=(8, 16))
+    predictions = service.predict_batch(HEADLINES)
+
+    expected = np.asarray(model.predict_on_batch(expected_inputs)).reshape(-1)
+    np.testing.assert_allclose(
+        [prediction.probability for prediction in predictions], expected, atol=1e-4
+    )
+    assert service._forward != model.predict_on_batch
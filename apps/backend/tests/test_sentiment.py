@@ -32,3 +32,17 @@ def test_sentiment_metrics_endpoint_after_calls() -> None:
     metrics = metrics_response.json()
     assert metrics["total_requests"] >= 1
     assert "positive" in metrics["label_counts"]
+
+    windowed = client.get("/api/v1/metrics/sentiment", params={"window": "5m"}).json()
+    assert windowed["window_s"] == 300
+    assert windowed["timeline"][-1]["count"] >= 1
+    assert client.get("/api/v1/metrics/sentiment", params={"window": "2d"}).status_code == 422
+
+
+def test_inference_metrics_report_batching_histograms() -> None:
+    client.post("/api/v1/sentiment", json={"text": "Great job"})
+    response = client.get("/api/v1/metrics/inference")
+    assert response.status_code == 200
+    batching = response.json()["batching"]
+    assert batching["batch_size"]["count"] >= 1
+    assert len(batching["batch_size"]["counts"]) == len(batching["batch_size"]["bounds"]) + 1
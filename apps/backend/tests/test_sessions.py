@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend_app.main import app
+from backend_app.schemas import SentimentResponse
+from backend_app.services.sessions import ScoringSession
+
+
+class FakeWebSocket:
+    """Delivers ``messages`` and disconnects once ``replies`` results were sent."""
+
+    def __init__(self, messages: list[dict], replies: int = 0) -> None:
+        self.incoming = [json.dumps(message) for message in messages]
+        self.replies = replies
+        self.received = 0
+        self.sent: list[dict] = []
+
+    async def receive_text(self) -> str:
+        if self.received == len(self.incoming):
+            while len(self.sent) < self.replies:
+                await asyncio.sleep(0)
+            raise WebSocketDisconnect()
+        self.received += 1
+        return self.incoming[self.received - 1]
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+
+def test_session_window_limits_unread_messages() -> None:
+    websocket = FakeWebSocket([{"id": idx, "text": f"text {idx}"} for idx in range(5)], replies=5)
+    release = asyncio.Event()
+
+    async def submit(text: str) -> SentimentResponse:
+        await release.wait()
+        return SentimentResponse(label="neutral", score=0.0, confidence=0.0, tokens_analyzed=2)
+
+    async def scenario() -> None:
+        session = ScoringSession(websocket, submit, max_in_flight=2)
+        running = asyncio.ensure_future(session.run())
+        await asyncio.sleep(0.01)
+        # The window is full, so the third message has not been read yet.
+        assert websocket.received == 2
+        assert session.in_flight == 2
+        release.set()
+        await asyncio.wait_for(running, 1)
+
+    asyncio.run(scenario())
+    assert websocket.received == 5
+    assert sorted(message["id"] for message in websocket.sent) == list(range(5))
+
+
+def test_session_returns_results_out_of_order() -> None:
+    messages = [{"id": "slow", "text": "slow text"}, {"id": "fast", "text": "fast"}]
+    websocket = FakeWebSocket(messages, replies=2)
+    fast_done = asyncio.Event()
+
+    async def submit(text: str) -> SentimentResponse:
+        if text == "slow text":
+            await fast_done.wait()
+        else:
+            fast_done.set()
+        return SentimentResponse(label="neutral", score=0.0, confidence=0.0, tokens_analyzed=1)
+
+    async def scenario() -> None:
+        await asyncio.wait_for(ScoringSession(websocket, submit, max_in_flight=4).run(), 1)
+
+    asyncio.run(scenario())
+    assert [message["id"] for message in websocket.sent] == ["fast", "slow"]
+
+
+def test_websocket_endpoint_scores_messages() -> None:
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/sentiment/ws") as websocket:
+        websocket.send_text(json.dumps({"id": 1, "text": "I love this great product"}))
+        websocket.send_text(json.dumps({"id": 2, "text": "x"}))
+        websocket.send_text("not json")
+        replies = [websocket.receive_json() for _ in range(3)]
+
+    by_id = {reply["id"]: reply for reply in replies}
+    assert by_id[1]["label"] == "positive"
+    assert "error" in by_id[2]
+    assert by_id[None]["error"].startswith("invalid JSON")
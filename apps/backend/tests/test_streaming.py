@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from backend_app.main import app
+from backend_app.schemas import SentimentResponse
+from backend_app.services.executor import InferenceOverloaded
+from backend_app.services.streaming import NdjsonScorer
+
+
+def _fake_score(calls: list[list[str]], overloaded: int = 0):
+    remaining = [overloaded]
+
+    async def score_batch(texts):
+        if remaining[0]:
+            remaining[0] -= 1
+            raise InferenceOverloaded(1)
+        calls.append(list(texts))
+        return [
+            SentimentResponse(label="neutral", score=0.0, confidence=0.0, tokens_analyzed=len(text))
+            for text in texts
+        ]
+
+    return score_batch
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def _collect(scorer: NdjsonScorer, body: bytes, chunk_size: int = 7) -> list[dict]:
+    async def scenario() -> list[dict]:
+        return [json.loads(line) async for line in scorer.stream(_chunks(body, chunk_size))]
+
+    return asyncio.run(scenario())
+
+
+def test_scorer_streams_results_in_order_across_batches() -> None:
+    calls: list[list[str]] = []
+    scorer = NdjsonScorer(_fake_score(calls), batch_size=3, max_in_flight=2)
+    body = "\n".join(json.dumps({"id": idx, "text": f"text {idx}"}) for idx in range(10))
+
+    results = _collect(scorer, body.encode())
+
+    assert [result["id"] for result in results] == list(range(10))
+    assert [len(call) for call in calls] == [3, 3, 3, 1]
+
+
+def test_scorer_reports_bad_lines_without_failing() -> None:
+    calls: list[list[str]] = []
+    scorer = NdjsonScorer(_fake_score(calls, overloaded=1), overload_backoff_s=0)
+    body = b'"bare string"\n\n{not json}\n{"id": "short", "text": "hi"}\n[1]\n'
+
+    results = _collect(scorer, body)
+
+    assert [result["line"] for result in results] == [1, 3, 4, 5]
+    assert results[0]["tokens_analyzed"] == len("bare string")
+    assert results[1]["error"].startswith("invalid JSON")
+    assert results[2]["id"] == "short" and "error" in results[2]
+    assert "error" in results[3]
+    assert calls == [["bare string"]]
+
+
+def test_scorer_rejects_oversized_lines() -> None:
+    scorer = NdjsonScorer(_fake_score([]), max_line_bytes=16)
+    body = b'"fine text"\n"' + b"x" * 64 + b'"\n"never read"\n'
+
+    results = _collect(scorer, body)
+
+    assert results[0]["line"] == 1 and "error" not in results[0]
+    assert results[1]["line"] == 2 and "exceeds 16 bytes" in results[1]["error"]
+    assert len(results) == 2
+
+
+def test_stream_endpoint_returns_ndjson() -> None:
+    client = TestClient(app)
+    body = "\n".join(json.dumps({"id": idx, "text": "I love this product"}) for idx in range(5))
+
+    response = client.post(
+        "/api/v1/sentiment/stream",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == list(range(5))
+    assert all(line["label"] == "positive" for line in lines)
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from backend_app.core.timing import ENDPOINT, StageTimings
+from backend_app.main import app
+
+
+def test_render_prometheus_histogram() -> None:
+    timings = StageTimings(bounds=(1, 10))
+    token = ENDPOINT.set("/api/v1/sentiment")
+    try:
+        timings.observe("model", "numpy", 0.0005)
+        timings.observe("model", "numpy", 0.005)
+        timings.observe("model", "numpy", 0.5)
+    finally:
+        ENDPOINT.reset(token)
+
+    text = timings.render_prometheus()
+    labels = 'stage="model",backend="numpy",endpoint="/api/v1/sentiment"'
+    assert "# TYPE sentiment_stage_latency_seconds histogram" in text
+    assert f'sentiment_stage_latency_seconds_bucket{{{labels},le="0.001"}} 1' in text
+    assert f'sentiment_stage_latency_seconds_bucket{{{labels},le="0.01"}} 2' in text
+    assert f'sentiment_stage_latency_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"sentiment_stage_latency_seconds_count{{{labels}}} 3" in text
+
+
+def test_prometheus_route_reports_stages_per_endpoint() -> None:
+    client = TestClient(app)
+    client.post("/api/v1/sentiment/batch", json={"texts": ["Great launch", "Awful update"]})
+    client.post("/api/v1/sentiment", json={"text": "I love it"})
+
+    response = client.get("/api/v1/metrics/prometheus")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    for stage, endpoint in [
+        ("request", "/api/v1/sentiment/batch"),
+        ("handler", "/api/v1/sentiment/batch"),
+        ("tokenize", "/api/v1/sentiment/batch"),
+        ("score", "/api/v1/sentiment/batch"),
+        ("request", "/api/v1/sentiment"),
+        ("tokenize", "micro_batch"),
+    ]:
+        assert f'stage="{stage}",backend="fallback",endpoint="{endpoint}"' in text
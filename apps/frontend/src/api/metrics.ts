@@ -7,6 +7,7 @@ export type PredictionSummary = {
 export type TimelinePoint = {
   timestamp: string;
   confidence: number;
+  count: number;
 };
 
 export type SentimentMetrics = {
@@ -15,6 +16,8 @@ export type SentimentMetrics = {
   average_confidence: number;
   recent_predictions: PredictionSummary[];
   timeline: TimelinePoint[];
+  window_s: number | null;
+  confidence_histogram: number[];
 };
 
 export async function fetchSentimentMetrics(): Promise<SentimentMetrics> {
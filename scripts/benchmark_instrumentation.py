@@ -0,0 +1,125 @@
+"""Per-request cost of the stage-latency instrumentation.
+
+Measures ``StageTimings.observe`` on its own and a request served through
+``InferenceRoute`` against the same endpoint behind a plain ``APIRoute``. The
+difference covers the handler wrapper, the body-encoding check and the
+backend label lookup. Requests go straight to the ASGI app, without an HTTP
+client, so the framework cost is all that remains around the wrapper. Example:
+
+    python scripts/benchmark_instrumentation.py --requests 5000 --repeats 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import timeit
+from time import perf_counter
+from typing import Dict
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+
+from backend_app.api import routes
+from backend_app.core.timing import ENDPOINT, StageTimings
+from backend_app.services.inference import SentimentService
+from backend_app.services.registry import ModelRegistry, ModelSpec
+
+SCOPE = {
+    "type": "http",
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [],
+    "server": ("benchmark", 80),
+}
+
+
+def _asgi_app(route_class: type) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/ping")
+    async def ping() -> dict:
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+def observe_us(observations: int, repeats: int) -> float:
+    timings = StageTimings()
+    ENDPOINT.set("/api/v1/sentiment")
+
+    def observe() -> None:
+        started = perf_counter()
+        timings.observe("model", "numpy", perf_counter() - started)
+
+    return min(timeit.repeat(observe, number=observations, repeat=repeats)) / observations * 1e6
+
+
+def request_us(requests: int, repeats: int) -> Dict[str, float]:
+    registry = ModelRegistry()
+    registry.register(ModelSpec("sentiment", lambda: SentimentService(weights_path=None)))
+    registry.get("sentiment")
+    routes.get_model_registry = lambda: registry
+
+    async def serve(app: FastAPI, count: int) -> None:
+        for _ in range(count):
+            await app(dict(SCOPE), _receive, _send)
+
+    apps = {"plain": _asgi_app(APIRoute), "timed": _asgi_app(routes.InferenceRoute)}
+    best = {name: float("inf") for name in apps}
+    loop = asyncio.new_event_loop()
+    try:
+        for app in apps.values():
+            loop.run_until_complete(serve(app, 100))
+        # Alternate the two so drift in machine load affects both alike.
+        for _ in range(repeats):
+            for name, app in apps.items():
+                started = perf_counter()
+                loop.run_until_complete(serve(app, requests))
+                best[name] = min(best[name], perf_counter() - started)
+    finally:
+        loop.close()
+    return {name: seconds / requests * 1e6 for name, seconds in best.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure stage-timing instrumentation overhead")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--observations", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results")
+    args = parser.parse_args()
+
+    per_request = request_us(args.requests, args.repeats)
+    results = {
+        "observe_us": round(observe_us(args.observations, args.repeats), 3),
+        "plain_request_us": round(per_request["plain"], 2),
+        "timed_request_us": round(per_request["timed"], 2),
+        "overhead_us": round(per_request["timed"] - per_request["plain"], 2),
+        "ratio": round(per_request["timed"] / per_request["plain"], 3),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for metric, value in results.items():
+        print(f"{metric:<18}{value:>10}")
+
+
+if __name__ == "__main__":
+    main()
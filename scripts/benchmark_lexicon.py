@@ -0,0 +1,193 @@
+"""Throughput of the lexicon fallback against the original per-token keyword loop.
+
+Scores a synthetic corpus (or ``--input``, one text per line) three ways and
+checks that they return the same responses:
+
+* ``keyword-sets``: the original fallback, its tokenizer and two set lookups
+  per token per text (unit-weight lexicons only);
+* ``token-loop``: the current tokenizer with a per-text loop over a weight dict;
+* ``lexicon``: the current tokenizer with ``LexiconScorer``.
+
+``total_us`` covers tokenizing, scoring and building responses; ``score_us``
+is the weight summation alone, on pre-tokenized texts. Example:
+
+    python scripts/benchmark_lexicon.py --texts 20000 --lexicon vader_lexicon.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
+
+from backend_app.schemas import SentimentResponse
+from backend_app.services.encoding import tokenize
+from backend_app.services.lexicon import DEFAULT_LEXICON, LexiconScorer, load_lexicon
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z']+")
+FILLER = (
+    "the movie was and it a of to but this plot acting story film scene i "
+    "really not very just so ending characters"
+).split()
+# (score texts into responses, sum weights of tokenized texts)
+Scorer = Tuple[Callable[[List[str]], list], Callable[[List[List[str]]], object]]
+
+
+def legacy_tokenize(text: str) -> List[str]:
+    return " ".join(TOKEN_PATTERN.findall(text)).lower().split()
+
+
+def _respond(score: float, tokens: Sequence[str]) -> SentimentResponse:
+    label = "neutral"
+    if score > 0.15:
+        label = "positive"
+    elif score < -0.15:
+        label = "negative"
+    confidence = min(1.0, abs(score))
+    if len(tokens) < 4:
+        confidence *= 0.6
+    return SentimentResponse(
+        label=label,
+        score=float(round(score, 3)),
+        confidence=float(round(confidence, 3)),
+        tokens_analyzed=len(tokens),
+    )
+
+
+def keyword_sets(lexicon: Mapping[str, float]) -> Scorer:
+    positive = {word for word, weight in lexicon.items() if weight > 0}
+    negative = {word for word, weight in lexicon.items() if weight < 0}
+
+    def totals(tokenized: List[List[str]]) -> list:
+        return [
+            (
+                sum(1 for token in tokens if token in positive),
+                sum(1 for token in tokens if token in negative),
+            )
+            for tokens in tokenized
+        ]
+
+    def score(texts: List[str]) -> list:
+        tokenized = [legacy_tokenize(text) for text in texts]
+        return [
+            _respond((pos - neg) / max(1, pos + neg) if pos or neg else 0.0, tokens)
+            for (pos, neg), tokens in zip(totals(tokenized), tokenized)
+        ]
+
+    return score, totals
+
+
+def token_loop(lexicon: Mapping[str, float]) -> Scorer:
+    weights = dict(lexicon)
+
+    def totals(tokenized: List[List[str]]) -> list:
+        sums = []
+        for tokens in tokenized:
+            net = mass = 0.0
+            for token in tokens:
+                weight = weights.get(token)
+                if weight is not None:
+                    net += weight
+                    mass += abs(weight)
+            sums.append((net, mass))
+        return sums
+
+    def score(texts: List[str]) -> list:
+        tokenized = [tokenize(text) for text in texts]
+        return [
+            _respond(net / max(1.0, mass), tokens)
+            for (net, mass), tokens in zip(totals(tokenized), tokenized)
+        ]
+
+    return score, totals
+
+
+def compiled(lexicon: Mapping[str, float]) -> Scorer:
+    scorer = LexiconScorer(lexicon)
+
+    def score(texts: List[str]) -> list:
+        return scorer.responses([tokenize(text) for text in texts])
+
+    return score, scorer.totals
+
+
+def synthetic_corpus(lexicon: Mapping[str, float], count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    words = sorted(lexicon)
+    texts = []
+    for _ in range(count):
+        length = rng.randint(3, 120)
+        texts.append(
+            " ".join(
+                rng.choice(words) if rng.random() < 0.1 else rng.choice(FILLER)
+                for _ in range(length)
+            )
+        )
+    return texts
+
+
+def _best_of(fn: Callable[[], object], repeats: int) -> float:
+    # Like timeit, keep collections of the previous scorer's garbage out of the timings.
+    fn()
+    gc.collect()
+    gc.disable()
+    try:
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the lexicon fallback scorer")
+    parser.add_argument("--lexicon", type=Path, default=None, help="Lexicon file to score with")
+    parser.add_argument("--texts", type=int, default=10000, help="Synthetic texts to score")
+    parser.add_argument("--input", type=Path, default=None, help="File with one text per line")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lexicon: Dict[str, float] = load_lexicon(args.lexicon) if args.lexicon else DEFAULT_LEXICON
+    if args.input:
+        texts = args.input.read_text(encoding="utf-8").splitlines()
+    else:
+        texts = synthetic_corpus(lexicon, args.texts, args.seed)
+    batches = [
+        texts[start : start + args.batch_size] for start in range(0, len(texts), args.batch_size)
+    ]
+    tokenized = [[tokenize(text) for text in batch] for batch in batches]
+    scorers: Dict[str, Scorer] = {"token-loop": token_loop(lexicon), "lexicon": compiled(lexicon)}
+    # The keyword sets only reproduce unit weights.
+    if set(lexicon.values()) <= {1.0, -1.0}:
+        scorers = {"keyword-sets": keyword_sets(lexicon), **scorers}
+
+    print(f"{len(lexicon)} lexicon entries, {len(texts)} texts, batches of {args.batch_size}")
+    print(f"{'scorer':<14}{'texts/s':>12}{'total_us':>10}{'score_us':>10}{'speedup':>10}")
+    reference = None
+    baseline = None
+    for name, (score, totals) in scorers.items():
+        outputs = [response for batch in batches for response in score(batch)]
+        if reference is None:
+            reference = outputs
+        elif outputs != reference:
+            raise SystemExit(f"{name} disagrees with {next(iter(scorers))}")
+        seconds = _best_of(lambda: [score(batch) for batch in batches], args.repeats)
+        summing = _best_of(lambda: [totals(batch) for batch in tokenized], args.repeats)
+        baseline = baseline or seconds
+        print(
+            f"{name:<14}{len(texts) / seconds:>12.0f}{seconds / len(texts) * 1e6:>10.2f}"
+            f"{summing / len(texts) * 1e6:>10.2f}{baseline / seconds:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark backend import and startup time in heuristic and model-backed modes.
+
+Each measurement runs in a fresh interpreter so module caches do not hide
+import cost. Example:
+
+    python scripts/benchmark_startup.py --repeats 5 \
+        --weights artifacts/imdb_dense/weights.npz --backend numpy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import backend_app.main
+imported = time.perf_counter()
+app = backend_app.main.create_app()
+created = time.perf_counter()
+from backend_app.api.routes import get_sentiment_service
+service = get_sentiment_service()
+loaded = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "create_app_s": created - imported,
+    "service_s": loaded - created,
+    "total_s": loaded - started,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "tensorflow_loaded": "tensorflow" in sys.modules,
+    "use_model": service.use_model,
+}))
+"""
+
+METRICS = ("import_s", "create_app_s", "service_s", "total_s", "max_rss_mb")
+
+
+def _run_probe(env: Dict[str, str]) -> Dict[str, float]:
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _mode_env(mode: str, args: argparse.Namespace) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["TF_CPP_MIN_LOG_LEVEL"] = "3"
+    missing = str(Path(args.scratch_dir) / "missing-weights")
+    if mode == "fallback":
+        env["SENTIMENT_BACKEND_IMDB_WEIGHTS_PATH"] = missing
+        env["SENTIMENT_BACKEND_IMDB_NUMPY_WEIGHTS_PATH"] = missing
+        env["SENTIMENT_BACKEND_INFERENCE_BACKEND"] = "keras"
+    else:
+        key = "IMDB_NUMPY_WEIGHTS_PATH" if args.backend == "numpy" else "IMDB_WEIGHTS_PATH"
+        env[f"SENTIMENT_BACKEND_{key}"] = str(args.weights)
+        env["SENTIMENT_BACKEND_INFERENCE_BACKEND"] = args.backend
+    if args.word_index:
+        env["SENTIMENT_BACKEND_IMDB_WORD_INDEX_PATH"] = str(args.word_index)
+    return env
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure backend import/startup cost")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--weights", type=Path, default=None, help="Weights for the model mode")
+    parser.add_argument("--backend", choices=["keras", "numpy"], default="keras")
+    parser.add_argument("--word-index", type=Path, default=None)
+    parser.add_argument("--scratch-dir", type=Path, default=Path("/tmp"))
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results")
+    args = parser.parse_args()
+
+    modes = ["fallback"] + (["model"] if args.weights else [])
+    results: Dict[str, Dict[str, object]] = {}
+    for mode in modes:
+        runs: List[Dict[str, float]] = [
+            _run_probe(_mode_env(mode, args)) for _ in range(args.repeats)
+        ]
+        summary: Dict[str, object] = {
+            metric: round(statistics.median(run[metric] for run in runs), 4) for metric in METRICS
+        }
+        summary["tensorflow_loaded"] = runs[-1]["tensorflow_loaded"]
+        summary["use_model"] = runs[-1]["use_model"]
+        results[mode] = summary
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    header = f"{'mode':<10}" + "".join(f"{metric:>14}" for metric in METRICS)
+    print(header + f"{'tensorflow':>12}")
+    for mode, summary in results.items():
+        row = f"{mode:<10}" + "".join(f"{summary[metric]:>14}" for metric in METRICS)
+        print(row + f"{str(summary['tensorflow_loaded']):>12}")
+
+
+if __name__ == "__main__":
+    main()
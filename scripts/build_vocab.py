@@ -0,0 +1,49 @@
+"""CLI for compiling the IMDB word index into a memory-mappable serving artifact."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from sentiment_package import vocab
+from sentiment_package.imdb import data as imdb_data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the IMDB vocabulary for serving")
+    parser.add_argument(
+        "--word-index",
+        type=Path,
+        default=None,
+        help="Word index JSON with PAD/START/UNK offsets applied; downloads it when omitted",
+    )
+    parser.add_argument(
+        "--keras-format",
+        action="store_true",
+        help="--word-index is Keras' raw imdb_word_index.json; apply the +3 offsets first",
+    )
+    parser.add_argument("--vocab-size", type=int, default=10000)
+    parser.add_argument("--output", type=Path, default=Path("artifacts/imdb_dense/vocab.bin"))
+    args = parser.parse_args()
+
+    if args.word_index:
+        with args.word_index.open("r", encoding="utf-8") as handle:
+            word_index = json.load(handle)
+        if args.keras_format:
+            word_index = imdb_data.offset_word_index(word_index)
+    else:
+        _, word_index = imdb_data.build_word_mappings()
+
+    output = vocab.compile_vocabulary(
+        word_index,
+        args.output,
+        vocab_size=args.vocab_size,
+        metadata={"source": "imdb", "unknown_token": word_index.get("UNK", 2)},
+    )
+    compiled = vocab.CompiledVocabulary(output)
+    print(f"Wrote {len(compiled)} of {len(word_index)} entries to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""CLI for exporting trained IMDB dense weights to a TensorFlow-free ``.npz``."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from sentiment_package.imdb import models as imdb_models
+from sentiment_package.imdb import numpy_model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export IMDB dense weights for NumPy serving")
+    parser.add_argument("--weights", type=Path, required=True, help="Keras checkpoint to export")
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Defaults to weights.npz next to --weights"
+    )
+    parser.add_argument("--max-length", type=int, default=256)
+    parser.add_argument("--vocab-size", type=int, default=10000)
+    parser.add_argument(
+        "--precision",
+        choices=numpy_model.PRECISIONS,
+        default="float32",
+        help="Storage for the embedding and kernels; float16 and int8 trade accuracy for memory",
+    )
+    args = parser.parse_args()
+
+    model_cfg = imdb_models.DenseModelConfig(vocab_size=args.vocab_size, max_length=args.max_length)
+    model = imdb_models.build_dense_model(model_cfg)
+    model.build((None, model_cfg.max_length))
+    model.load_weights(str(args.weights))
+
+    output = args.output or args.weights.with_name("weights.npz")
+    numpy_model.export_dense_weights(
+        model, output, max_length=model_cfg.max_length, precision=args.precision
+    )
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""CLI for exporting a trained dense sarcasm model to a TensorFlow-free ``.npz``."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from tensorflow import keras
+
+from sentiment_package.imdb import numpy_model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export a dense sarcasm model for NumPy serving")
+    parser.add_argument("--model", type=Path, required=True, help="Saved .keras dense model")
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Defaults to weights.npz next to --model"
+    )
+    parser.add_argument("--max-length", type=int, default=32)
+    parser.add_argument("--precision", choices=numpy_model.PRECISIONS, default="float32")
+    args = parser.parse_args()
+
+    model = keras.models.load_model(args.model, compile=False)
+    output = args.output or args.model.with_name("weights.npz")
+    numpy_model.export_dense_weights(
+        model, output, max_length=args.max_length, precision=args.precision
+    )
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Compare float32, float16 and int8 NumPy serving on a validation split.
+
+Exports the model at each precision, then scores the validation split in a
+fresh interpreter per precision so resident memory is not shared between
+runs. Reports accuracy, agreement with float32, batch latency and RSS.
+Example:
+
+    python scripts/quantization_report.py imdb --weights artifacts/imdb_dense/weights.01.keras
+    python scripts/quantization_report.py sarcasm --model artifacts/sarcasm_dense/model.keras
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from sentiment_package.imdb import numpy_model
+
+PROBE = """
+import json, os, sys, time
+import numpy as np
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+from sentiment_package.imdb.numpy_model import DenseNumpyModel
+
+weights_path, data_path, output_path, batch_size = sys.argv[1:5]
+batch_size = int(batch_size)
+with np.load(data_path) as data:
+    inputs, labels = data["inputs"], data["labels"]
+before = rss_mb()
+model = DenseNumpyModel.from_npz(weights_path, padding="post")
+loaded = rss_mb()
+latencies = []
+chunks = []
+for start in range(0, len(inputs), batch_size):
+    started = time.perf_counter()
+    chunks.append(model.predict(inputs[start : start + batch_size]).reshape(-1))
+    latencies.append(time.perf_counter() - started)
+probabilities = np.concatenate(chunks)
+np.save(output_path, probabilities)
+weights_mb = sum(
+    value.nbytes for value in vars(model).values() if isinstance(value, np.ndarray)
+) / 2**20
+print(json.dumps({
+    "accuracy": float(np.mean((probabilities >= 0.5) == (labels == 1))),
+    "weights_mb": weights_mb,
+    "rss_load_mb": None if before is None else loaded - before,
+    "rss_total_mb": rss_mb(),
+    "p50_ms": float(np.percentile(latencies[1:] or latencies, 50) * 1000),
+    "p95_ms": float(np.percentile(latencies[1:] or latencies, 95) * 1000),
+    "rows_per_s": float(len(inputs) / sum(latencies)),
+}))
+"""
+
+COLUMNS = (
+    ("accuracy", "{:.4f}"),
+    ("agreement", "{:.4f}"),
+    ("max_abs_diff", "{:.4f}"),
+    ("file_mb", "{:.2f}"),
+    ("weights_mb", "{:.2f}"),
+    ("rss_load_mb", "{:.1f}"),
+    ("rss_total_mb", "{:.1f}"),
+    ("p50_ms", "{:.2f}"),
+    ("p95_ms", "{:.2f}"),
+    ("rows_per_s", "{:.0f}"),
+)
+
+
+def _imdb(args: argparse.Namespace) -> Tuple[object, np.ndarray, np.ndarray, int]:
+    from sentiment_package.imdb import data as imdb_data
+    from sentiment_package.imdb import models as imdb_models
+
+    dataset_cfg = imdb_data.ImdbDatasetConfig(
+        vocab_size=args.vocab_size, max_length=args.max_length
+    )
+    _, _, x_valid, y_valid = imdb_data.load_dataset(dataset_cfg)
+    model = imdb_models.build_dense_model(
+        imdb_models.DenseModelConfig(vocab_size=args.vocab_size, max_length=args.max_length)
+    )
+    model.build((None, args.max_length))
+    model.load_weights(str(args.weights))
+    return model, x_valid, y_valid, args.max_length
+
+
+def _sarcasm(args: argparse.Namespace) -> Tuple[object, np.ndarray, np.ndarray, int]:
+    from tensorflow import keras
+
+    from sentiment_package.sarcasm import data as sarcasm_data
+    from sentiment_package.sarcasm import train as sarcasm_train
+
+    # The split and tokenizer are deterministic, so refitting reproduces training inputs.
+    config = sarcasm_data.SarcasmDatasetConfig(max_length=args.max_length)
+    _, x_valid, _, y_valid, _, _ = sarcasm_train.prepare_dataset(config)
+    model = keras.models.load_model(args.model, compile=False)
+    return model, x_valid, y_valid, config.max_length
+
+
+def _run_probe(
+    weights_path: Path, data_path: Path, output_path: Path, batch_size: int
+) -> Dict[str, float]:
+    env = dict(os.environ)
+    env["TF_CPP_MIN_LOG_LEVEL"] = "3"
+    completed = subprocess.run(
+        [
+            sys.executable, "-c", PROBE,
+            str(weights_path), str(data_path), str(output_path), str(batch_size),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def build_report(
+    model: object,
+    inputs: np.ndarray,
+    labels: np.ndarray,
+    max_length: int,
+    batch_size: int,
+    scratch_dir: Path,
+) -> Dict[str, Dict[str, float]]:
+    data_path = scratch_dir / "validation.npz"
+    np.savez(data_path, inputs=inputs, labels=labels)
+    results: Dict[str, Dict[str, float]] = {}
+    reference = None
+    for precision in numpy_model.PRECISIONS:
+        weights_path = numpy_model.export_dense_weights(
+            model, scratch_dir / f"{precision}.npz", max_length=max_length, precision=precision
+        )
+        output_path = scratch_dir / f"{precision}.npy"
+        result = _run_probe(weights_path, data_path, output_path, batch_size)
+        probabilities = np.load(output_path)
+        if reference is None:
+            reference = probabilities
+        result["agreement"] = float(np.mean((probabilities >= 0.5) == (reference >= 0.5)))
+        result["max_abs_diff"] = float(np.max(np.abs(probabilities - reference)))
+        result["file_mb"] = weights_path.stat().st_size / 2**20
+        results[precision] = result
+    return results
+
+
+def _format(value: object, spec: str) -> str:
+    return "n/a" if value is None else spec.format(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Accuracy/latency/RSS of quantized weights")
+    subparsers = parser.add_subparsers(dest="dataset", required=True)
+    imdb = subparsers.add_parser("imdb", help="Dense IMDB checkpoint on the IMDB test split")
+    imdb.add_argument("--weights", type=Path, required=True)
+    imdb.add_argument("--max-length", type=int, default=256)
+    imdb.add_argument("--vocab-size", type=int, default=10000)
+    sarcasm = subparsers.add_parser("sarcasm", help="Saved dense sarcasm model on its split")
+    sarcasm.add_argument("--model", type=Path, required=True)
+    sarcasm.add_argument("--max-length", type=int, default=32)
+    for subparser in (imdb, sarcasm):
+        subparser.add_argument("--batch-size", type=int, default=256)
+        subparser.add_argument("--limit", type=int, default=None, help="Score the first N rows")
+        subparser.add_argument("--json", action="store_true", help="Emit machine-readable results")
+    args = parser.parse_args()
+
+    model, inputs, labels, max_length = (_imdb if args.dataset == "imdb" else _sarcasm)(args)
+    if args.limit:
+        inputs, labels = inputs[: args.limit], labels[: args.limit]
+    with tempfile.TemporaryDirectory() as scratch:
+        results = build_report(
+            model, np.asarray(inputs), np.asarray(labels), max_length, args.batch_size,
+            Path(scratch),
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    names: List[str] = [name for name, _ in COLUMNS]
+    print(f"{'precision':<10}" + "".join(f"{name:>14}" for name in names))
+    for precision, result in results.items():
+        cells = "".join(f"{_format(result.get(name), spec):>14}" for name, spec in COLUMNS)
+        print(f"{precision:<10}" + cells)
+
+
+if __name__ == "__main__":
+    main()
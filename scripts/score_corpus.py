@@ -0,0 +1,101 @@
+"""Score JSONL/CSV corpora offline with a pool of model-loading worker processes.
+
+Writes ordered ``part-NNNNNN.jsonl`` shards plus ``stats.json`` to ``--output``;
+rerunning the same command after an interruption resumes from the shards
+already written. Model settings default to the ``SENTIMENT_BACKEND_*``
+environment used by the API. Example:
+
+    python scripts/score_corpus.py reviews-*.jsonl.gz --output scored/ --workers 8 \
+        --backend numpy --weights artifacts/imdb_dense/weights.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import logging
+import os
+from pathlib import Path
+
+from backend_app.core.config import get_settings
+from backend_app.services.bulk import score_corpus
+from backend_app.services.inference import SentimentService
+
+THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+    "TF_NUM_INTEROP_THREADS",
+)
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Bulk-score a corpus with the sentiment model")
+    parser.add_argument("inputs", type=Path, nargs="+", help="JSONL or CSV files, optionally .gz")
+    parser.add_argument("--output", type=Path, required=True, help="Directory for output shards")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per output shard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=1,
+        help="BLAS/TensorFlow threads per worker; workers x threads should not exceed cores",
+    )
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--restart", action="store_true", help="Discard previous progress")
+    parser.add_argument("--backend", choices=["keras", "numpy"], default=settings.inference_backend)
+    parser.add_argument("--weights", type=Path, default=None)
+    parser.add_argument("--vocab", type=Path, default=Path(settings.imdb_vocab_path))
+    parser.add_argument("--word-index", type=Path, default=settings.imdb_word_index_path)
+    parser.add_argument("--max-length", type=int, default=settings.imdb_max_length)
+    parser.add_argument("--batch-size", type=int, default=settings.inference_batch_size)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    # Spawned workers read these at import time, so they must be set before the pool starts.
+    for variable in THREAD_VARIABLES:
+        os.environ.setdefault(variable, str(args.threads_per_worker))
+    weights = args.weights or Path(
+        settings.imdb_numpy_weights_path if args.backend == "numpy" else settings.imdb_weights_path
+    )
+    if not weights.exists():
+        parser.error(f"weights not found at {weights}; refusing to score with the fallback")
+    factory = functools.partial(
+        SentimentService,
+        weights_path=weights,
+        max_length=args.max_length,
+        word_index_path=Path(args.word_index) if args.word_index else None,
+        batch_size=args.batch_size,
+        backend=args.backend,
+        skip_padding=settings.inference_skip_padding,
+        vocab_path=args.vocab,
+        architecture=settings.imdb_architecture,
+        length_buckets=settings.inference_length_buckets,
+    )
+    report = score_corpus(
+        args.inputs,
+        args.output,
+        factory,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        text_field=args.text_field,
+        id_field=args.id_field,
+        restart=args.restart,
+    )
+
+    print(f"{'worker':>10}{'chunks':>10}{'rows':>12}{'busy_s':>10}{'rows/s':>12}")
+    for stats in sorted(report.workers.values(), key=lambda stats: stats.pid):
+        print(
+            f"{stats.pid:>10}{stats.chunks:>10}{stats.rows:>12}"
+            f"{stats.seconds:>10.1f}{stats.rows_per_s:>12.0f}"
+        )
+    summary = {key: value for key, value in report.to_dict().items() if key != "workers"}
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
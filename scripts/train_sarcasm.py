@@ -25,11 +25,12 @@ def main() -> None:
         vocab_size=args.vocab_size,
     )
 
-    train_cfg = sarcasm_train.TrainingConfig()
+    # Defaults to the directory the backend serves the dense model from.
+    train_cfg = sarcasm_train.TrainingConfig(
+        checkpoint_dir=args.checkpoint_dir or f"artifacts/sarcasm_{args.model}"
+    )
     if args.epochs:
         train_cfg.epochs = args.epochs
-    if args.checkpoint_dir:
-        train_cfg.checkpoint_dir = args.checkpoint_dir
 
     model_cfg = None
     if args.model == "dense":
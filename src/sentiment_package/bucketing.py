@@ -0,0 +1,120 @@
+"""Length-bucketed inference for convolutional models that end in global max pooling.
+
+``Embedding -> Conv1D -> GlobalMaxPooling1D`` accepts any sequence width, so a
+row with ``L`` real tokens padded to ``max_length`` ``T`` can be scored at a
+narrower width ``W``. With valid, stride-1 convolutions of receptive field
+``R`` (``kernel_size`` for one layer), the pooled features at width ``W`` are
+the maximum over a subset of the full-width windows:
+
+* windows containing real tokens all start before ``L`` and end before
+  ``L + R - 1``, so they are kept when ``W >= L + R - 1``;
+* the remaining full-width windows cover padding only and are all identical,
+  so one of them must be kept when the full width has one (``T >= L + R``).
+
+The model therefore produces the same scores as at full width whenever
+``W >= min(T, L + R)``. Padding is not masked in these models, so the all
+padding window is part of the prediction and is deliberately kept.
+Models that mask padding (``mask_zero=True``), or that pool, stride or pad
+their convolutions, are not bucketed.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_BUCKETS = (16, 32, 64, 128, 256)
+# Layers that neither mix positions nor change the sequence length at inference.
+_POSITIONWISE_LAYERS = {"InputLayer", "Dropout", "SpatialDropout1D", "GaussianNoise", "Activation"}
+
+
+def conv_receptive_field(model: Any) -> Optional[int]:
+    """Receptive field ``R`` of a bucketable Keras model, or ``None`` if it is not one."""
+
+    layers = list(getattr(model, "layers", []))
+    if not layers or type(layers[0]).__name__ != "Embedding" or layers[0].mask_zero:
+        return None
+    receptive_field = 1
+    convolutions = 0
+    for layer in layers[1:]:
+        kind = type(layer).__name__
+        if kind == "Conv1D":
+            if layer.padding != "valid" or tuple(layer.strides) != (1,):
+                return None
+            receptive_field += (layer.kernel_size[0] - 1) * layer.dilation_rate[0]
+            convolutions += 1
+        elif kind == "GlobalMaxPooling1D":
+            if getattr(layer, "data_format", "channels_last") != "channels_last":
+                return None
+            return receptive_field if convolutions else None
+        elif kind not in _POSITIONWISE_LAYERS:
+            return None
+    return None
+
+
+def row_lengths(inputs: np.ndarray, padding: str) -> np.ndarray:
+    """Tokens before the padding of each row; padding is id ``0``."""
+
+    nonzero = inputs != 0
+    width = inputs.shape[1]
+    if padding == "post":
+        lengths = width - np.argmax(nonzero[:, ::-1], axis=1)
+    else:
+        lengths = width - np.argmax(nonzero, axis=1)
+    return np.where(nonzero.any(axis=1), lengths, 0)
+
+
+class BucketedPredictor:
+    """Runs ``forward`` once per length bucket instead of once at ``max_length``.
+
+    Each row is scored at the smallest bucket width that keeps its result
+    exact (see the module docstring); ``max_length`` is always a bucket.
+    Rows keep their input order in the output.
+    """
+
+    def __init__(
+        self,
+        forward: Callable[[np.ndarray], Any],
+        max_length: int,
+        receptive_field: int,
+        padding: str = "post",
+        buckets: Sequence[int] = DEFAULT_BUCKETS,
+    ) -> None:
+        if padding not in ("post", "pre"):
+            raise ValueError(f"padding must be 'post' or 'pre', got {padding!r}")
+        self.forward = forward
+        self.max_length = int(max_length)
+        self.receptive_field = int(receptive_field)
+        self.padding = padding
+        widths = {int(width) for width in buckets if 0 < int(width) < self.max_length}
+        self.buckets = np.array(sorted(widths | {self.max_length}))
+
+    def widths_for(self, inputs: np.ndarray) -> np.ndarray:
+        needed = row_lengths(inputs, self.padding) + self.receptive_field
+        needed = np.minimum(needed, self.max_length)
+        return self.buckets[np.searchsorted(self.buckets, needed)]
+
+    def _window(self, inputs: np.ndarray, width: int) -> np.ndarray:
+        if self.padding == "post":
+            return inputs[:, :width]
+        return inputs[:, self.max_length - width :]
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        inputs = np.asarray(inputs)
+        if inputs.ndim != 2 or inputs.shape[1] != self.max_length:
+            raise ValueError(f"Expected inputs of shape (N, {self.max_length}), got {inputs.shape}")
+        if not len(inputs):
+            return np.asarray(self.forward(inputs))
+        widths = self.widths_for(inputs)
+        unique_widths = np.unique(widths)
+        if len(unique_widths) == 1:
+            return np.asarray(self.forward(self._window(inputs, int(unique_widths[0]))))
+        outputs = None
+        for width in unique_widths:
+            rows = np.flatnonzero(widths == width)
+            scores = np.asarray(self.forward(self._window(inputs[rows], int(width))))
+            if outputs is None:
+                outputs = np.empty((len(inputs),) + scores.shape[1:], dtype=scores.dtype)
+            outputs[rows] = scores
+        return outputs
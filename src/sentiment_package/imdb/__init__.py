@@ -1,5 +1,13 @@
 """IMDB sentiment dataset utilities."""
 
-from . import data, models, train
+from importlib import import_module
 
-__all__ = ["data", "models", "train"]
+__all__ = ["data", "models", "numpy_model", "train"]
+
+
+def __getattr__(name: str):
+    # Submodules load on first access so TensorFlow-free consumers (the NumPy
+    # serving path, the heuristic fallback) never pay for importing Keras.
+    if name in __all__:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
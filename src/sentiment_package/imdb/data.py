@@ -6,8 +6,6 @@ from dataclasses import dataclass
 from typing import Dict, Tuple
 
 import numpy as np
-from tensorflow import keras
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 
 
 @dataclass
@@ -24,6 +22,9 @@ class ImdbDatasetConfig:
 def load_dataset(config: ImdbDatasetConfig) -> Tuple[np.ndarray, ...]:
     """Load IMDB data and return padded train/validation splits."""
 
+    from tensorflow import keras
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
     (x_train, y_train), (x_valid, y_valid) = keras.datasets.imdb.load_data(
         num_words=config.vocab_size,
         skip_top=config.skip_top,
@@ -48,13 +49,21 @@ def load_dataset(config: ImdbDatasetConfig) -> Tuple[np.ndarray, ...]:
 def build_word_mappings() -> Tuple[Dict[int, str], Dict[str, int]]:
     """Return token-to-word and word-to-token mappings identical to the notebook."""
 
-    word_index = keras.datasets.imdb.get_word_index()
-    word_index = {k: (v + 3) for k, v in word_index.items()}
+    from tensorflow import keras
+
+    word_index = offset_word_index(keras.datasets.imdb.get_word_index())
+    index_word = {v: k for k, v in word_index.items()}
+    return index_word, word_index
+
+
+def offset_word_index(raw_word_index: Dict[str, int]) -> Dict[str, int]:
+    """Shift Keras' raw IMDB ranks by 3 and add the PAD/START/UNK entries."""
+
+    word_index = {k: (v + 3) for k, v in raw_word_index.items()}
     word_index["PAD"] = 0
     word_index["START"] = 1
     word_index["UNK"] = 2
-    index_word = {v: k for k, v in word_index.items()}
-    return index_word, word_index
+    return word_index
 
 
 def decode_review(tokens: np.ndarray, index_word: Dict[int, str]) -> str:
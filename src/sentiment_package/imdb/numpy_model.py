@@ -0,0 +1,261 @@
+"""TensorFlow-free inference for the dense IMDB classifier.
+
+The sarcasm dense model (``sarcasm.models.build_dense_model``) has the same
+layer layout, so it is exported and served by the same code.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+DENSE_WEIGHT_KEYS = (
+    "embedding",
+    "dense_1_kernel",
+    "dense_1_bias",
+    "dense_2_kernel",
+    "dense_2_bias",
+    "output_kernel",
+    "output_bias",
+)
+# Matrices that are stored reduced; biases always stay float32.
+QUANTIZED_KEYS = ("embedding", "dense_1_kernel", "dense_2_kernel", "output_kernel")
+PRECISIONS = ("float32", "float16", "int8")
+# Rows of a stored kernel converted to float32 at a time by dequantized_matmul.
+DEQUANT_BLOCK_ROWS = 4096
+
+
+def quantize_dense_weights(
+    weights: Dict[str, np.ndarray], precision: str = "float32"
+) -> Dict[str, np.ndarray]:
+    """Reduce the embedding and kernels to ``float16`` or symmetric ``int8``.
+
+    ``int8`` scales each embedding row and each kernel output column by its
+    largest magnitude / 127 and stores the scales as ``<key>_scale``.
+    """
+
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}, got {precision!r}")
+    quantized = {key: np.asarray(value, dtype=np.float32) for key, value in weights.items()}
+    if precision == "float32":
+        return quantized
+    for key in QUANTIZED_KEYS:
+        matrix = quantized[key]
+        if precision == "float16":
+            quantized[key] = matrix.astype(np.float16)
+            continue
+        # Embedding rows are looked up, kernel columns are output units.
+        axis = 1 if key == "embedding" else 0
+        scale = np.max(np.abs(matrix), axis=axis) / 127.0
+        scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+        scaled = matrix / (scale[:, None] if axis == 1 else scale)
+        quantized[key] = np.clip(np.rint(scaled), -127, 127).astype(np.int8)
+        quantized[f"{key}_scale"] = scale
+    return quantized
+
+
+def dequantized_matmul(
+    inputs: np.ndarray,
+    kernel: np.ndarray,
+    scale: Optional[np.ndarray] = None,
+    block_rows: int = DEQUANT_BLOCK_ROWS,
+) -> np.ndarray:
+    """``inputs @ (kernel * scale)`` without materializing a float32 kernel.
+
+    Reduced kernels are converted ``block_rows`` rows at a time, so the extra
+    memory per call is one block rather than the whole matrix. Per-column
+    scales are applied once to the product.
+    """
+
+    if kernel.dtype == np.float32:
+        product = inputs @ kernel
+    elif kernel.shape[0] <= block_rows:
+        product = inputs @ kernel.astype(np.float32)
+    else:
+        product = np.zeros((len(inputs), kernel.shape[1]), dtype=np.float32)
+        for start in range(0, kernel.shape[0], block_rows):
+            stop = start + block_rows
+            product += inputs[:, start:stop] @ kernel[start:stop].astype(np.float32)
+    if scale is not None:
+        product *= scale
+    return product
+
+
+def export_dense_weights(
+    model: Any, output_path: Path | str, max_length: int, precision: str = "float32"
+) -> Path:
+    """Write the weights of a ``build_dense_model`` network to a compact ``.npz`` file.
+
+    ``precision`` selects ``float32``, ``float16`` or ``int8`` storage (see
+    :func:`quantize_dense_weights`); :class:`DenseNumpyModel` loads any of them.
+    """
+
+    weights = [np.asarray(array, dtype=np.float32) for array in model.get_weights()]
+    if len(weights) != len(DENSE_WEIGHT_KEYS):
+        raise ValueError(
+            f"Expected {len(DENSE_WEIGHT_KEYS)} weight arrays from the dense model, "
+            f"got {len(weights)}"
+        )
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = quantize_dense_weights(dict(zip(DENSE_WEIGHT_KEYS, weights)), precision)
+    with output_path.open("wb") as handle:
+        np.savez(handle, max_length=np.int64(max_length), **arrays)
+    return output_path
+
+
+def _stored(array: np.ndarray) -> np.ndarray:
+    # float16 and int8 arrays are kept as stored; anything else is served as float32.
+    array = np.asarray(array)
+    if array.dtype in (np.float16, np.int8):
+        return np.ascontiguousarray(array)
+    return np.ascontiguousarray(array, dtype=np.float32)
+
+
+def _scale(weights: Dict[str, np.ndarray], key: str) -> Optional[np.ndarray]:
+    scale = weights.get(f"{key}_scale")
+    if weights[key].dtype == np.int8 and scale is None:
+        raise ValueError(f"int8 array {key!r} has no {key}_scale")
+    return None if scale is None else np.asarray(scale, dtype=np.float32)
+
+
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    # tanh form avoids overflow warnings from exp() on large negative logits.
+    return 0.5 * (1.0 + np.tanh(0.5 * logits))
+
+
+class DenseNumpyModel:
+    """Embedding -> Flatten -> Dense(ReLU) x2 -> Dense(sigmoid), evaluated with NumPy.
+
+    When ``padding`` is ``"post"`` or ``"pre"`` the first layer skips padded
+    positions. Padding always embeds row 0, so the contribution of every padded
+    slot to the first dense layer is a constant that is summed once at load
+    time into a per-width bias; only the real tokens are multiplied per request.
+    Rows are grouped into power-of-two widths so short texts in a mixed batch
+    are not widened to the longest one.
+
+    Weights reduced by :func:`quantize_dense_weights` stay reduced in memory
+    and are dequantized per request: embedding rows as they are gathered,
+    kernels block by block in :func:`dequantized_matmul`.
+    """
+
+    def __init__(
+        self,
+        weights: Dict[str, np.ndarray],
+        max_length: int,
+        padding: Optional[str] = None,
+    ) -> None:
+        if padding not in (None, "post", "pre"):
+            raise ValueError(f"padding must be None, 'post' or 'pre', got {padding!r}")
+        missing = [key for key in DENSE_WEIGHT_KEYS if key not in weights]
+        if missing:
+            raise ValueError(f"Dense weights are missing arrays: {', '.join(missing)}")
+        self.max_length = int(max_length)
+        self.embedding = _stored(weights["embedding"])
+        self.dense_1_kernel = _stored(weights["dense_1_kernel"])
+        self.dense_1_bias = np.asarray(weights["dense_1_bias"], dtype=np.float32)
+        self.dense_2_kernel = _stored(weights["dense_2_kernel"])
+        self.dense_2_bias = np.asarray(weights["dense_2_bias"], dtype=np.float32)
+        self.output_kernel = _stored(weights["output_kernel"])
+        self.output_bias = np.asarray(weights["output_bias"], dtype=np.float32)
+        self.embedding_scale = _scale(weights, "embedding")
+        self.dense_1_scale = _scale(weights, "dense_1_kernel")
+        self.dense_2_scale = _scale(weights, "dense_2_kernel")
+        self.output_scale = _scale(weights, "output_kernel")
+        self.vocab_size, self.embedding_dim = self.embedding.shape
+        expected_inputs = self.max_length * self.embedding_dim
+        if self.dense_1_kernel.shape[0] != expected_inputs:
+            raise ValueError(
+                f"First dense layer expects {self.dense_1_kernel.shape[0]} inputs but "
+                f"max_length * embedding_dim is {expected_inputs}"
+            )
+        self.padding = padding
+        if padding is not None:
+            self._init_padding_tables()
+
+    @classmethod
+    def from_npz(cls, path: Path | str, padding: Optional[str] = None) -> "DenseNumpyModel":
+        with np.load(Path(path)) as archive:
+            weights = {key: archive[key] for key in archive.files if key != "max_length"}
+            max_length = int(archive["max_length"])
+        return cls(weights, max_length, padding=padding)
+
+    @property
+    def precision(self) -> str:
+        if self.dense_1_kernel.dtype == np.int8:
+            return "int8"
+        return str(self.dense_1_kernel.dtype)
+
+    def _init_padding_tables(self) -> None:
+        units = self.dense_1_kernel.shape[1]
+        kernel = self.dense_1_kernel.astype(np.float64)
+        if self.dense_1_scale is not None:
+            kernel *= self.dense_1_scale
+        per_position = kernel.reshape(self.max_length, self.embedding_dim, units)
+        pad_embedding = self._embed(np.zeros((1, 1), dtype=np.int64))[0, 0].astype(np.float64)
+        # pad_rows[t] is what a padded slot at position t adds to the first layer.
+        pad_rows = np.einsum("d,tdu->tu", pad_embedding, per_position)
+        cumulative = np.zeros((self.max_length + 1, units), dtype=np.float64)
+        np.cumsum(pad_rows, axis=0, out=cumulative[1:])
+        if self.padding == "post":
+            # Width w keeps positions [0, w); slots [w, max_length) are padding.
+            pad_bias = cumulative[-1] - cumulative
+        else:
+            # Width w keeps positions [max_length - w, max_length).
+            pad_bias = cumulative[::-1]
+        self._pad_bias = (pad_bias + self.dense_1_bias).astype(np.float32)
+        widths = {1 << exponent for exponent in range(self.max_length.bit_length())}
+        widths = {width for width in widths if width < self.max_length} | {self.max_length}
+        self._widths = np.array(sorted(widths))
+
+    def _embed(self, inputs: np.ndarray) -> np.ndarray:
+        embedded = self.embedding[inputs]
+        if self.embedding_scale is not None:
+            return embedded * self.embedding_scale[inputs][..., None]
+        return embedded.astype(np.float32, copy=False)
+
+    def _row_lengths(self, inputs: np.ndarray) -> np.ndarray:
+        nonzero = inputs != 0
+        if self.padding == "post":
+            lengths = self.max_length - np.argmax(nonzero[:, ::-1], axis=1)
+        else:
+            lengths = self.max_length - np.argmax(nonzero, axis=1)
+        return np.where(nonzero.any(axis=1), lengths, 0)
+
+    def _first_layer_window(self, inputs: np.ndarray, width: int) -> np.ndarray:
+        span = width * self.embedding_dim
+        if self.padding == "post":
+            window, kernel = inputs[:, :width], self.dense_1_kernel[:span]
+        else:
+            window, kernel = inputs[:, self.max_length - width :], self.dense_1_kernel[-span:]
+        embedded = self._embed(window).reshape(len(inputs), span)
+        return dequantized_matmul(embedded, kernel, self.dense_1_scale) + self._pad_bias[width]
+
+    def _first_layer(self, inputs: np.ndarray) -> np.ndarray:
+        if self.padding is None:
+            embedded = self._embed(inputs).reshape(len(inputs), -1)
+            hidden = dequantized_matmul(embedded, self.dense_1_kernel, self.dense_1_scale)
+            return hidden + self.dense_1_bias
+        widths = self._widths[np.searchsorted(self._widths, self._row_lengths(inputs))]
+        unique_widths = np.unique(widths)
+        if len(unique_widths) == 1:
+            return self._first_layer_window(inputs, int(unique_widths[0]))
+        hidden = np.empty((len(inputs), self.dense_1_kernel.shape[1]), dtype=np.float32)
+        for width in unique_widths:
+            rows = np.flatnonzero(widths == width)
+            hidden[rows] = self._first_layer_window(inputs[rows], int(width))
+        return hidden
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        """Return sigmoid probabilities of shape ``(N, 1)`` for ``(N, max_length)`` token ids."""
+
+        inputs = np.asarray(inputs)
+        if inputs.ndim != 2 or inputs.shape[1] != self.max_length:
+            raise ValueError(f"Expected inputs of shape (N, {self.max_length}), got {inputs.shape}")
+        hidden = np.maximum(self._first_layer(inputs), 0.0)
+        hidden = dequantized_matmul(hidden, self.dense_2_kernel, self.dense_2_scale)
+        hidden = np.maximum(hidden + self.dense_2_bias, 0.0)
+        logits = dequantized_matmul(hidden, self.output_kernel, self.output_scale)
+        return _sigmoid(logits + self.output_bias)
@@ -1,5 +1,13 @@
 """Sarcasm headline dataset utilities."""
 
-from . import data, glove, models, train
+from importlib import import_module
 
 __all__ = ["data", "glove", "models", "train"]
+
+
+def __getattr__(name: str):
+    # Submodules load on first access so TensorFlow-free consumers (the NumPy
+    # serving path, the heuristic fallback) never pay for importing Keras.
+    if name in __all__:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Tuple
 
 import numpy as np
@@ -11,6 +12,8 @@ from sklearn.model_selection import train_test_split
 from tensorflow.keras.preprocessing.sequence import pad_sequences
 from tensorflow.keras.preprocessing.text import Tokenizer
 
+from .. import vocab as vocab_utils
+
 
 DEFAULT_DATASET_URL = (
     "https://raw.githubusercontent.com/rishabhmisra/News-Headlines-Dataset-For-Sarcasm-Detection/"
@@ -73,3 +76,29 @@ def tokenize_texts(
         truncating=config.trunc_type,
     )
     return train_padded, test_padded, tokenizer
+
+
+def save_tokenizer(tokenizer: Tokenizer, path: Path | str, config: SarcasmDatasetConfig) -> Path:
+    """Persist a fitted tokenizer as a compiled vocabulary for serving.
+
+    Only ids below ``num_words`` are kept, since ``texts_to_sequences`` maps the
+    rest to the OOV id. The metadata records the text normalization and padding
+    settings the serving tokenizer must reproduce.
+    """
+
+    return vocab_utils.compile_vocabulary(
+        tokenizer.word_index,
+        path,
+        vocab_size=tokenizer.num_words,
+        metadata={
+            "source": "sarcasm",
+            "oov_token": tokenizer.oov_token,
+            "unknown_token": tokenizer.word_index.get(tokenizer.oov_token),
+            "filters": tokenizer.filters,
+            "lower": tokenizer.lower,
+            "split": tokenizer.split,
+            "max_length": config.max_length,
+            "padding": config.padding_type,
+            "truncating": config.trunc_type,
+        },
+    )
@@ -23,6 +23,8 @@ class TrainingConfig:
     learning_rate: float = 1e-3
     checkpoint_dir: Path | str = Path("artifacts/sarcasm")
     checkpoint_pattern: str = "weights.{epoch:02d}.keras"
+    vocab_filename: str = "vocab.bin"
+    model_filename: str = "model.keras"
     patience: int = 5
 
 
@@ -50,16 +52,26 @@ def _embedding_matrix_from_path(
 def prepare_dataset(
     config: sarcasm_data.SarcasmDatasetConfig,
     glove_path: Optional[Path] = None,
+    vocab_path: Optional[Path] = None,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict, Optional[np.ndarray]]:
-    """Load data, tokenize, and optionally derive an embedding matrix."""
+    """Load data, tokenize, and optionally derive an embedding matrix.
+
+    When ``vocab_path`` is given the fitted tokenizer is saved there for serving.
+    """
 
     df = sarcasm_data.load_dataframe(config)
     x_train, x_test, y_train, y_test = sarcasm_data.train_test_split_texts(df, config)
     train_padded, test_padded, tokenizer = sarcasm_data.tokenize_texts(x_train, x_test, config)
+    if vocab_path is not None:
+        sarcasm_data.save_tokenizer(tokenizer, vocab_path, config)
     embedding_matrix = _embedding_matrix_from_path(glove_path, tokenizer.word_index, config)
     return train_padded, test_padded, y_train, y_test, tokenizer.word_index, embedding_matrix
 
 
+def _vocab_path(train_cfg: TrainingConfig) -> Path:
+    return Path(train_cfg.checkpoint_dir) / train_cfg.vocab_filename
+
+
 def train_model(
     model: Sequential,
     train_inputs: np.ndarray,
@@ -68,7 +80,11 @@ def train_model(
     val_labels: np.ndarray,
     train_cfg: TrainingConfig,
 ) -> Sequential:
-    """Generic fit function with checkpointing + early stopping."""
+    """Generic fit function with checkpointing + early stopping.
+
+    The best model is also saved as ``model_filename`` next to the vocabulary,
+    where the backend loads it from.
+    """
 
     checkpoint_dir = Path(train_cfg.checkpoint_dir)
     checkpoint_dir.mkdir(parents=True, exist_ok=True)
@@ -86,6 +102,7 @@ def train_model(
         callbacks=callbacks,
         verbose=1,
     )
+    model.save(checkpoint_dir / train_cfg.model_filename)
     return model
 
 
@@ -97,7 +114,9 @@ def train_dense_classifier(
 ) -> Sequential:
     dataset_cfg = dataset_cfg or sarcasm_data.SarcasmDatasetConfig()
     train_cfg = train_cfg or TrainingConfig(epochs=100, checkpoint_dir="artifacts/sarcasm_dense")
-    train_inputs, val_inputs, train_labels, val_labels, _, embedding_matrix = prepare_dataset(dataset_cfg, glove_path)
+    train_inputs, val_inputs, train_labels, val_labels, _, embedding_matrix = prepare_dataset(
+        dataset_cfg, glove_path, vocab_path=_vocab_path(train_cfg)
+    )
     model_cfg = model_cfg or sarcasm_models.DenseSarcasmConfig(
         vocab_size=dataset_cfg.vocab_size,
         embedding_dim=dataset_cfg.embedding_dim,
@@ -116,7 +135,9 @@ def train_conv_classifier(
 ) -> Sequential:
     dataset_cfg = dataset_cfg or sarcasm_data.SarcasmDatasetConfig()
     train_cfg = train_cfg or TrainingConfig(checkpoint_dir="artifacts/sarcasm_conv")
-    train_inputs, val_inputs, train_labels, val_labels, _, embedding_matrix = prepare_dataset(dataset_cfg, glove_path)
+    train_inputs, val_inputs, train_labels, val_labels, _, embedding_matrix = prepare_dataset(
+        dataset_cfg, glove_path, vocab_path=_vocab_path(train_cfg)
+    )
     model_cfg = model_cfg or sarcasm_models.ConvSarcasmConfig(
         vocab_size=dataset_cfg.vocab_size,
         embedding_dim=dataset_cfg.embedding_dim,
@@ -135,7 +156,9 @@ def train_bilstm_classifier(
 ) -> Sequential:
     dataset_cfg = dataset_cfg or sarcasm_data.SarcasmDatasetConfig()
     train_cfg = train_cfg or TrainingConfig(checkpoint_dir="artifacts/sarcasm_bilstm")
-    train_inputs, val_inputs, train_labels, val_labels, _, embedding_matrix = prepare_dataset(dataset_cfg, glove_path)
+    train_inputs, val_inputs, train_labels, val_labels, _, embedding_matrix = prepare_dataset(
+        dataset_cfg, glove_path, vocab_path=_vocab_path(train_cfg)
+    )
     model_cfg = model_cfg or sarcasm_models.BiLSTMSarcasmConfig(
         vocab_size=dataset_cfg.vocab_size,
         embedding_dim=dataset_cfg.embedding_dim,
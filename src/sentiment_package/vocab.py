@@ -0,0 +1,155 @@
+"""Compact, memory-mappable vocabulary artifacts for serving.
+
+A compiled vocabulary stores a ``word -> id`` mapping in one read-only binary
+file so serving processes can ``mmap`` it instead of parsing JSON or
+downloading the word index, and so every worker on a host shares the same
+pages through the OS page cache.
+
+Layout (little-endian)::
+
+    header   magic "SVOC", version, entry count, table size, key bytes, metadata bytes
+    metadata UTF-8 JSON, zero-padded to 8 bytes
+    ids      int32[count]             token id of each entry (keys sorted)
+    offsets  uint32[count + 1]        start of each key in the key blob
+    table    uint32[table size]       open-addressing slots holding entry + 1 (0 = empty)
+    keys     UTF-8 key blob
+
+Slots are addressed with ``zlib.crc32`` of the UTF-8 key and probed linearly.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+MAGIC = b"SVOC"
+VERSION = 1
+_HEADER = struct.Struct("<4sIIIII")
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _table_size(count: int) -> int:
+    # Keep the load factor at or below 0.5 so probes stay short.
+    size = 8
+    while size < count * 2:
+        size <<= 1
+    return size
+
+
+def compile_vocabulary(
+    word_index: Mapping[str, int],
+    output_path: Path | str,
+    vocab_size: Optional[int] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Write ``word_index`` (optionally truncated to ids below ``vocab_size``) to disk."""
+
+    entries = sorted(
+        (word.encode("utf-8"), int(idx))
+        for word, idx in word_index.items()
+        if vocab_size is None or int(idx) < vocab_size
+    )
+    count = len(entries)
+    table_size = _table_size(count)
+    mask = table_size - 1
+
+    offsets = [0]
+    for key, _ in entries:
+        offsets.append(offsets[-1] + len(key))
+    table = [0] * table_size
+    for entry, (key, _) in enumerate(entries):
+        slot = zlib.crc32(key) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = entry + 1
+
+    meta = dict(metadata or {})
+    meta.setdefault("vocab_size", vocab_size)
+    meta_bytes = json.dumps(meta, sort_keys=True).encode("utf-8")
+    key_blob = b"".join(key for key, _ in entries)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with tmp_path.open("wb") as handle:
+        header = _HEADER.pack(MAGIC, VERSION, count, table_size, len(key_blob), len(meta_bytes))
+        handle.write(header)
+        handle.write(meta_bytes.ljust(_align(len(meta_bytes)), b"\0"))
+        handle.write(struct.pack(f"<{count}i", *(idx for _, idx in entries)))
+        handle.write(struct.pack(f"<{count + 1}I", *offsets))
+        handle.write(struct.pack(f"<{table_size}I", *table))
+        handle.write(key_blob)
+    # Atomic replace so a process reloading the artifact never sees a partial file.
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+class CompiledVocabulary(Mapping[str, int]):
+    """Read-only ``word -> id`` mapping backed by a memory-mapped artifact."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, table_size, key_bytes, meta_len = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a compiled vocabulary (version {VERSION})")
+        offset = _HEADER.size
+        self.metadata: Dict[str, Any] = json.loads(self._mmap[offset : offset + meta_len])
+        offset += _align(meta_len)
+        view = memoryview(self._mmap)
+        self._ids = view[offset : offset + 4 * count].cast("i")
+        offset += 4 * count
+        self._offsets = view[offset : offset + 4 * (count + 1)].cast("I")
+        offset += 4 * (count + 1)
+        self._table = view[offset : offset + 4 * table_size].cast("I")
+        offset += 4 * table_size
+        self._keys_start = offset
+        self._count = count
+        self._mask = table_size - 1
+        if offset + key_bytes > len(self._mmap):
+            raise ValueError(f"{self.path} is truncated")
+
+    def _key(self, entry: int) -> bytes:
+        start = self._keys_start
+        return self._mmap[start + self._offsets[entry] : start + self._offsets[entry + 1]]
+
+    def get(self, word: str, default: Any = None) -> Any:
+        key = word.encode("utf-8")
+        mask = self._mask
+        slot = zlib.crc32(key) & mask
+        entry = self._table[slot]
+        while entry:
+            entry -= 1
+            start = self._keys_start + self._offsets[entry]
+            if self._mmap[start : start + len(key)] == key and (
+                self._offsets[entry + 1] - self._offsets[entry] == len(key)
+            ):
+                return self._ids[entry]
+            slot = (slot + 1) & mask
+            entry = self._table[slot]
+        return default
+
+    def __getitem__(self, word: str) -> int:
+        value = self.get(word)
+        if value is None:
+            raise KeyError(word)
+        return value
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.get(word) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for entry in range(self._count):
+            yield self._key(entry).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from sentiment_package.bucketing import BucketedPredictor, conv_receptive_field
+from sentiment_package.imdb import models as imdb_models
+
+
+def _conv_model(max_length: int, kernel_size: int = 3):
+    cfg = imdb_models.ConvModelConfig(
+        vocab_size=200,
+        embedding_dim=8,
+        conv_filters=16,
+        conv_kernel_size=kernel_size,
+        dense_units=8,
+        max_length=max_length,
+    )
+    model = imdb_models.build_conv_model(cfg)
+    model.build((None, max_length))
+    rng = np.random.default_rng(0)
+    model.set_weights([rng.normal(0, 0.3, w.shape).astype("float32") for w in model.get_weights()])
+    return model
+
+
+def _padded(lengths, max_length: int, padding: str) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    inputs = np.zeros((len(lengths), max_length), dtype=np.int32)
+    for row, length in enumerate(lengths):
+        tokens = rng.integers(1, 200, size=length)
+        if padding == "post":
+            inputs[row, :length] = tokens
+        else:
+            inputs[row, max_length - length :] = tokens
+    return inputs
+
+
+def test_receptive_field_only_for_pooled_convolutions() -> None:
+    assert conv_receptive_field(_conv_model(32, kernel_size=5)) == 5
+    dense = imdb_models.build_dense_model(imdb_models.DenseModelConfig(vocab_size=50))
+    dense.build((None, 256))
+    assert conv_receptive_field(dense) is None
+
+
+@pytest.mark.parametrize("padding", ["post", "pre"])
+def test_bucketed_scores_match_full_width(padding) -> None:
+    max_length = 64
+    model = _conv_model(max_length)
+    lengths = [0, 1, 2, 13, 14, 15, 29, 30, 31, 61, 62, 63, 64]
+    inputs = _padded(lengths, max_length, padding)
+    predictor = BucketedPredictor(
+        model.predict_on_batch, max_length, receptive_field=3, padding=padding, buckets=(16, 32)
+    )
+
+    assert predictor.widths_for(inputs).tolist() == [16] * 4 + [32] * 3 + [64] * 6
+    expected = np.asarray(model.predict_on_batch(inputs))
+    np.testing.assert_allclose(predictor.predict(inputs), expected, rtol=1e-6, atol=1e-7)
+
+
+def test_buckets_narrower_than_the_rule_change_scores() -> None:
+    # Dropping the all-padding window is what masking would do; it changes the result.
+    max_length = 64
+    model = _conv_model(max_length)
+    inputs = _padded([3], max_length, "post")
+    full = np.asarray(model.predict_on_batch(inputs))
+    truncated = np.asarray(model.predict_on_batch(inputs[:, :3]))
+    assert not np.allclose(full, truncated)
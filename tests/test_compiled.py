@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from sentiment_package.bucketing import BucketedPredictor, conv_receptive_field
+from sentiment_package.compiled import CompiledForward
+from sentiment_package.imdb import models as imdb_models
+
+
+def _inputs(rows: int, width: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 50, size=(rows, width)).astype(np.int32)
+
+
+def test_compiled_forward_matches_predict_on_batch() -> None:
+    cfg = imdb_models.DenseModelConfig(vocab_size=50, embedding_dim=8, dense_units=8)
+    model = imdb_models.build_dense_model(cfg)
+    model.build((None, 256))
+    compiled = CompiledForward(model, width=256)
+
+    compiled.warm_up([1, 3])
+    for rows in (1, 5, 17):
+        inputs = _inputs(rows, 256)
+        np.testing.assert_allclose(
+            compiled.predict(inputs), model.predict_on_batch(inputs), rtol=1e-6, atol=1e-7
+        )
+    # Every batch size reuses the one trace of the fixed signature.
+    assert compiled._forward.experimental_get_tracing_count() == 1
+    with pytest.raises(TypeError):
+        compiled.predict(_inputs(2, 64))
+
+
+def test_dynamic_width_serves_length_buckets() -> None:
+    cfg = imdb_models.ConvModelConfig(
+        vocab_size=50, embedding_dim=8, conv_filters=8, dense_units=8, max_length=64
+    )
+    model = imdb_models.build_conv_model(cfg)
+    model.build((None, 64))
+    compiled = CompiledForward(model)
+    predictor = BucketedPredictor(
+        compiled.predict, 64, receptive_field=conv_receptive_field(model), buckets=(16, 32)
+    )
+    inputs = _inputs(6, 64)
+    inputs[:3, 10:] = 0
+
+    compiled.warm_up([1, 4], widths=(16, 32, 64))
+
+    np.testing.assert_allclose(
+        predictor.predict(inputs), model.predict_on_batch(inputs), rtol=1e-5, atol=1e-6
+    )
+    assert compiled._forward.experimental_get_tracing_count() == 1
+    with pytest.raises(ValueError):
+        compiled.warm_up([1])
@@ -1,3 +1,5 @@
+import numpy as np
+
 from sentiment_package.imdb import models as imdb_models
 from sentiment_package.sarcasm import models as sarcasm_models
 
@@ -18,3 +20,21 @@ def test_sarcasm_conv_model_layers() -> None:
     assert "Embedding" in layer_types[0]
     assert "Conv1D" in layer_types[2]
     assert model.output_shape == (None, 1)
+
+
+def test_sarcasm_training_saves_the_serving_model(tmp_path) -> None:
+    from tensorflow.keras.models import load_model
+
+    from sentiment_package.sarcasm import train as sarcasm_train
+
+    cfg = sarcasm_models.DenseSarcasmConfig(vocab_size=50, embedding_dim=4, max_length=8)
+    model = sarcasm_models.build_dense_model(cfg)
+    rng = np.random.default_rng(0)
+    inputs = rng.integers(0, 50, size=(16, 8))
+    labels = rng.integers(0, 2, size=16)
+    train_cfg = sarcasm_train.TrainingConfig(epochs=1, batch_size=8, checkpoint_dir=tmp_path)
+
+    trained = sarcasm_train.train_model(model, inputs, labels, inputs, labels, train_cfg)
+
+    saved = load_model(tmp_path / "model.keras")
+    np.testing.assert_allclose(saved.predict_on_batch(inputs), trained.predict_on_batch(inputs))
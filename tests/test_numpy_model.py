@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from sentiment_package.imdb import models as imdb_models
+from sentiment_package.imdb import numpy_model
+
+
+def _trained_like_model(cfg: imdb_models.DenseModelConfig):
+    model = imdb_models.build_dense_model(cfg)
+    model.build((None, cfg.max_length))
+    rng = np.random.default_rng(0)
+    model.set_weights([rng.normal(0, 0.2, w.shape).astype("float32") for w in model.get_weights()])
+    return model
+
+
+def test_dense_numpy_model_matches_keras(tmp_path) -> None:
+    cfg = imdb_models.DenseModelConfig(vocab_size=500, max_length=32)
+    model = _trained_like_model(cfg)
+    path = numpy_model.export_dense_weights(model, tmp_path / "w.npz", max_length=cfg.max_length)
+
+    engine = numpy_model.DenseNumpyModel.from_npz(path)
+    inputs = np.random.default_rng(1).integers(0, cfg.vocab_size, size=(16, cfg.max_length))
+    inputs[:, 20:] = 0
+
+    expected = model.predict(inputs, verbose=0)
+    np.testing.assert_allclose(engine.predict(inputs), expected, rtol=1e-5, atol=1e-6)
+
+
+def test_dense_numpy_model_rejects_wrong_width(tmp_path) -> None:
+    cfg = imdb_models.DenseModelConfig(vocab_size=100, max_length=8)
+    model = _trained_like_model(cfg)
+    path = numpy_model.export_dense_weights(model, tmp_path / "w.npz", max_length=8)
+    engine = numpy_model.DenseNumpyModel.from_npz(path)
+
+    with pytest.raises(ValueError):
+        engine.predict(np.zeros((1, 16), dtype=np.int32))
+
+
+@pytest.mark.parametrize("padding", ["post", "pre"])
+def test_padding_aware_first_layer_matches_full_model(tmp_path, padding) -> None:
+    cfg = imdb_models.DenseModelConfig(vocab_size=300, max_length=40)
+    path = numpy_model.export_dense_weights(_trained_like_model(cfg), tmp_path / "w.npz", 40)
+    full = numpy_model.DenseNumpyModel.from_npz(path)
+    skipping = numpy_model.DenseNumpyModel.from_npz(path, padding=padding)
+
+    rng = np.random.default_rng(2)
+    lengths = [0, 1, 3, 8, 9, 17, 33, 40]
+    inputs = np.zeros((len(lengths), cfg.max_length), dtype=np.int32)
+    for row, length in enumerate(lengths):
+        tokens = rng.integers(1, cfg.vocab_size, size=length)
+        if padding == "post":
+            inputs[row, :length] = tokens
+        else:
+            inputs[row, cfg.max_length - length :] = tokens
+
+    np.testing.assert_allclose(skipping.predict(inputs), full.predict(inputs), rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(
+        skipping.predict(inputs[1:2]), full.predict(inputs[1:2]), rtol=1e-5, atol=1e-6
+    )
+
+
+@pytest.mark.parametrize(
+    ("precision", "atol", "ratio"), [("float16", 1e-3, 2), ("int8", 2e-2, 3.5)]
+)
+@pytest.mark.parametrize("padding", [None, "post"])
+def test_quantized_weights_stay_close_to_float32(tmp_path, precision, atol, ratio, padding) -> None:
+    cfg = imdb_models.DenseModelConfig(vocab_size=300, max_length=40)
+    model = _trained_like_model(cfg)
+    full_path = numpy_model.export_dense_weights(model, tmp_path / "full.npz", 40)
+    reduced_path = numpy_model.export_dense_weights(
+        model, tmp_path / f"{precision}.npz", 40, precision=precision
+    )
+    full = numpy_model.DenseNumpyModel.from_npz(full_path, padding=padding)
+    reduced = numpy_model.DenseNumpyModel.from_npz(reduced_path, padding=padding)
+
+    inputs = np.random.default_rng(3).integers(1, cfg.vocab_size, size=(12, cfg.max_length))
+    inputs[:, 25:] = 0
+    assert reduced.precision == precision
+    assert full.dense_1_kernel.nbytes / reduced.dense_1_kernel.nbytes >= ratio
+    np.testing.assert_allclose(reduced.predict(inputs), full.predict(inputs), atol=atol)
+
+
+def test_dequantized_matmul_blocks_match_a_single_product() -> None:
+    rng = np.random.default_rng(4)
+    kernel = rng.integers(-127, 128, size=(50, 6)).astype(np.int8)
+    scale = rng.uniform(0.01, 0.1, size=6).astype(np.float32)
+    inputs = rng.normal(size=(3, 50)).astype(np.float32)
+
+    expected = inputs @ (kernel.astype(np.float32) * scale)
+    blocked = numpy_model.dequantized_matmul(inputs, kernel, scale, block_rows=16)
+    np.testing.assert_allclose(blocked, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_unknown_precision_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        numpy_model.quantize_dense_weights({}, precision="int4")
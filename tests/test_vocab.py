@@ -0,0 +1,34 @@
+import pytest
+
+from sentiment_package import vocab
+
+
+def test_compiled_vocabulary_round_trip(tmp_path) -> None:
+    word_index = {"PAD": 0, "START": 1, "UNK": 2, "good": 10, "bad": 11, "café": 12, "rare": 50000}
+    path = vocab.compile_vocabulary(word_index, tmp_path / "vocab.bin", vocab_size=10000)
+
+    compiled = vocab.CompiledVocabulary(path)
+
+    assert len(compiled) == 6
+    assert compiled["good"] == 10
+    assert compiled.get("café") == 12
+    assert compiled.get("rare", 2) == 2
+    assert "missing" not in compiled
+    assert sorted(compiled) == sorted(word for word in word_index if word != "rare")
+    assert compiled.metadata["vocab_size"] == 10000
+
+
+def test_compiled_vocabulary_handles_probe_collisions(tmp_path) -> None:
+    word_index = {f"word{idx}": idx for idx in range(5000)}
+    compiled = vocab.CompiledVocabulary(vocab.compile_vocabulary(word_index, tmp_path / "v.bin"))
+
+    assert all(compiled.get(word) == idx for word, idx in word_index.items())
+    assert compiled.get("word5000") is None
+
+
+def test_compiled_vocabulary_rejects_other_files(tmp_path) -> None:
+    path = tmp_path / "not-a-vocab.bin"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        vocab.CompiledVocabulary(path)